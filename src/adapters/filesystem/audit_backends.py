@@ -0,0 +1,491 @@
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import shutil
+import socket
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# prev_hash of the very first record in a chained audit log
+GENESIS_HASH = "0" * 64
+
+# Segment timestamps sort lexicographically in creation order
+_SEGMENT_TIME_FORMAT = "%Y%m%dT%H%M%S%fZ"
+_COMPRESSED_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def _zstd_available() -> bool:
+    try:
+        import zstandard  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class AuditBackend(ABC):
+    """
+    Destination for serialized audit batches.
+
+    Backends are only called from one thread at a time (the sink's writer thread,
+    or the caller under the sink lock when unbuffered), so they need no locking.
+    """
+
+    # Short label for thread names and log messages
+    name: str = "audit"
+
+    def encode(self, entries: List[Dict[str, Any]], encoder: Optional[type] = None) -> List[str]:
+        """Serialize a batch to one JSON line per entry (no newlines)."""
+        return [json.dumps(entry, cls=encoder) for entry in entries]
+
+    @abstractmethod
+    def write_batch(self, entries: List[Dict[str, Any]], lines: List[str]) -> None:
+        """Persist one batch; `lines` are the JSON encodings of `entries` (no newlines)."""
+
+    def close(self) -> None:
+        pass
+
+
+def hash_line(line: str) -> str:
+    """Chain hash of one serialized record (its exact bytes, without the newline)."""
+    return hashlib.sha256(line.encode("utf-8")).hexdigest()
+
+
+class JSONLFileBackend(AuditBackend):
+    """
+    Appends to a single JSONL file through a long-lived handle.
+
+    With `hash_chain`, every record gets a `prev_hash` field holding the SHA-256
+    of the previous record's line, so any edit, removal or reordering breaks the
+    chain (see `audit_verifier`). The chain continues across restarts and rotation.
+    """
+
+    def __init__(self, path: Path, fsync: bool = False, hash_chain: bool = False):
+        self.path = path
+        self.name = path.name
+        self.fsync = fsync
+        self.hash_chain = hash_chain
+        self._file = None
+        self._last_hash: Optional[str] = None
+        # (prev_hash, hash) per line of the batch most recently encoded
+        self._encoded_hashes: List[Tuple[str, str]] = []
+
+    def encode(self, entries: List[Dict[str, Any]], encoder: Optional[type] = None) -> List[str]:
+        if not self.hash_chain:
+            return super().encode(entries, encoder)
+        if self._last_hash is None:
+            self._last_hash = self._resume_chain()
+
+        lines, hashes = [], []
+        for entry in entries:
+            prev = self._last_hash
+            line = json.dumps({**entry, "prev_hash": prev}, cls=encoder)
+            self._last_hash = hash_line(line)
+            lines.append(line)
+            hashes.append((prev, self._last_hash))
+        self._encoded_hashes = hashes
+        return lines
+
+    def _resume_chain(self) -> str:
+        """Hash of the last record already on disk, so a restart extends the same chain."""
+        from src.adapters.filesystem.audit_reader import iter_lines_reverse
+        if self.path.exists():
+            for _, line in iter_lines_reverse(self.path):
+                return hashlib.sha256(line).hexdigest()
+        return GENESIS_HASH
+
+    def _open_file(self):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _append(self, data: str) -> None:
+        f = self._open_file()
+        f.write(data)
+        f.flush()
+        if self.fsync:
+            os.fsync(f.fileno())
+
+    def write_batch(self, entries: List[Dict[str, Any]], lines: List[str]) -> None:
+        self._append("".join(line + "\n" for line in lines))
+
+    def close(self) -> None:
+        self._close_file()
+
+
+@dataclass(frozen=True)
+class RotationPolicy:
+    """
+    When to close the active audit file and what to do with closed segments.
+
+    A zero limit disables that trigger. Closed segments are renamed to
+    `<stem>.<UTC start time><suffix>`, get a `.manifest.json` sidecar, and are
+    compressed and pruned on a background thread.
+    """
+    max_bytes: int = 0
+    interval_seconds: float = 0
+    compression: Optional[str] = "gzip"  # "gzip", "zstd" or None
+    retention_days: float = 0
+    retention_segments: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 or self.interval_seconds > 0
+
+
+class RotatingFileBackend(JSONLFileBackend):
+    """JSONL file that is closed into time-named, compressed segments per `RotationPolicy`."""
+
+    def __init__(
+        self,
+        path: Path,
+        rotation: RotationPolicy,
+        fsync: bool = False,
+        hash_chain: bool = False,
+        checkpoint_interval: int = 10000,
+    ):
+        super().__init__(path, fsync=fsync, hash_chain=hash_chain)
+        self.checkpoint_interval = checkpoint_interval
+        if rotation.compression == "zstd" and not _zstd_available():
+            logger.warning("zstd audit compression requested but 'zstandard' is not installed; using gzip")
+            rotation = RotationPolicy(**{**rotation.__dict__, "compression": "gzip"})
+        self.rotation = rotation
+
+        # Active segment bookkeeping
+        self._segment: Optional[Dict[str, Any]] = None
+        self._maintenance: Optional[ThreadPoolExecutor] = None
+
+    def _open_file(self):
+        opened = self._file is None
+        f = super()._open_file()
+        if opened and self._segment is None:
+            self._segment = self._scan_active_segment()
+        return f
+
+    def write_batch(self, entries: List[Dict[str, Any]], lines: List[str]) -> None:
+        self._open_file()
+        if self._should_rotate():
+            self.rotate()
+
+        data = "".join(line + "\n" for line in lines)
+        self._append(data)
+
+        segment = self._segment
+        if self.hash_chain and len(self._encoded_hashes) == len(lines):
+            offset = segment["bytes"]
+            for i, (line, (prev, current)) in enumerate(zip(lines, self._encoded_hashes)):
+                self._track_chain(segment, segment["count"] + i, offset, prev, current)
+                offset += len(line.encode("utf-8")) + 1
+        segment["count"] += len(entries)
+        segment["bytes"] += len(data.encode("utf-8"))
+        if segment["first"] is None:
+            segment["first"] = entries[0].get("timestamp")
+        segment["last"] = entries[-1].get("timestamp")
+
+    def _track_chain(self, segment: Dict[str, Any], index: int, offset: int, prev: Optional[str], current: str) -> None:
+        """Record chain endpoints and a checkpoint every `checkpoint_interval` records."""
+        if index == 0:
+            segment["first_prev_hash"] = prev
+        if self.checkpoint_interval and index % self.checkpoint_interval == 0:
+            segment["checkpoints"].append({"record": index, "offset": offset, "prev_hash": prev})
+        segment["last_hash"] = current
+
+    def _new_segment(self) -> Dict[str, Any]:
+        return {
+            "started": time.time(), "first": None, "last": None, "count": 0, "bytes": 0,
+            "first_prev_hash": None, "last_hash": None, "checkpoints": [],
+        }
+
+    def _resume_chain(self) -> str:
+        self._open_file()
+        if self._segment["last_hash"]:
+            return self._segment["last_hash"]
+        if not self._segment["count"]:
+            # Fresh active file: continue from the newest closed segment
+            segments = list_segments(self.path)
+            if segments:
+                last_hash = (read_manifest(segments[-1]) or {}).get("last_hash")
+                if last_hash:
+                    return last_hash
+        return super()._resume_chain()
+
+    def close(self) -> None:
+        self._close_file()
+        maintenance = self._maintenance
+        self._maintenance = None
+        if maintenance is not None:
+            maintenance.shutdown(wait=True)
+
+    def _scan_active_segment(self) -> Dict[str, Any]:
+        """Rebuild segment stats (and chain checkpoints) for an active file left over from a previous run."""
+        segment = self._new_segment()
+        try:
+            segment["bytes"] = self.path.stat().st_size
+            if segment["bytes"]:
+                segment["started"] = self.path.stat().st_mtime
+                offset = 0
+                with open(self.path, "rb") as f:
+                    for raw in f:
+                        line_offset, offset = offset, offset + len(raw)
+                        line = raw.rstrip(b"\n")
+                        if not line.strip():
+                            continue
+                        index = segment["count"]
+                        segment["count"] += 1
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            continue
+                        if self.hash_chain:
+                            self._track_chain(
+                                segment, index, line_offset, record.get("prev_hash"), hashlib.sha256(line).hexdigest()
+                            )
+                        timestamp = record.get("timestamp")
+                        if segment["first"] is None:
+                            segment["first"] = timestamp
+                        segment["last"] = timestamp
+                if segment["first"]:
+                    segment["started"] = parse_timestamp(segment["first"]) or segment["started"]
+        except OSError:
+            pass
+        return segment
+
+    def _should_rotate(self) -> bool:
+        segment = self._segment
+        if segment is None or not segment["count"]:
+            return False
+        if self.rotation.max_bytes and segment["bytes"] >= self.rotation.max_bytes:
+            return True
+        return bool(self.rotation.interval_seconds) and time.time() - segment["started"] >= self.rotation.interval_seconds
+
+    def rotate(self) -> Optional[Path]:
+        """Close the active file as a segment. Returns the segment path, if anything was written."""
+        self._open_file()
+        segment = self._segment
+        if segment is None or not segment["count"]:
+            return None
+        self._close_file()
+
+        started = datetime.fromtimestamp(segment["started"], timezone.utc).strftime(_SEGMENT_TIME_FORMAT)
+        closed = self.path.with_name(f"{self.path.stem}.{started}{self.path.suffix}")
+        while closed.exists():
+            # Same-microsecond rotation: nudge the name forward, keeping order
+            segment["started"] += 0.000001
+            started = datetime.fromtimestamp(segment["started"], timezone.utc).strftime(_SEGMENT_TIME_FORMAT)
+            closed = self.path.with_name(f"{self.path.stem}.{started}{self.path.suffix}")
+        os.replace(self.path, closed)
+
+        manifest = {
+            "segment": closed.name,
+            "first_timestamp": segment["first"],
+            "last_timestamp": segment["last"],
+            "event_count": segment["count"],
+            "bytes": segment["bytes"],
+            "compression": None,
+        }
+        if self.hash_chain:
+            # Chain footer: endpoints plus checkpoints for parallel verification
+            manifest.update({
+                "first_prev_hash": segment["first_prev_hash"],
+                "last_hash": segment["last_hash"],
+                "checkpoint_interval": self.checkpoint_interval,
+                "checkpoints": segment["checkpoints"],
+            })
+        _write_manifest(closed, manifest)
+        self._segment = self._new_segment()
+
+        # Compression and retention can take seconds; keep them off the writer thread
+        if self._maintenance is None:
+            self._maintenance = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"audit-maint:{self.name}")
+        self._maintenance.submit(self._finish_segment, closed, manifest)
+        return closed
+
+    def _finish_segment(self, segment: Path, manifest: Dict[str, Any]) -> None:
+        try:
+            if self.rotation.compression:
+                compressed = _compress(segment, self.rotation.compression)
+                _write_manifest(compressed, {**manifest, "segment": compressed.name, "compression": self.rotation.compression})
+            self._apply_retention()
+        except Exception as e:
+            logger.error(f"Audit segment maintenance failed for {segment}: {str(e)}")
+
+    def _apply_retention(self) -> None:
+        segments = list_segments(self.path)
+        expired = set()
+        if self.rotation.retention_segments and len(segments) > self.rotation.retention_segments:
+            expired.update(segments[: len(segments) - self.rotation.retention_segments])
+        if self.rotation.retention_days:
+            cutoff = datetime.now(timezone.utc) - timedelta(days=self.rotation.retention_days)
+            for segment in segments:
+                manifest = read_manifest(segment) or {}
+                last = parse_timestamp(manifest.get("last_timestamp"))
+                if last is None:
+                    last = segment.stat().st_mtime
+                if last < cutoff.timestamp():
+                    expired.add(segment)
+        for segment in expired:
+            logger.info(f"Removing expired audit segment {segment.name}")
+            segment.unlink(missing_ok=True)
+            manifest_path(segment).unlink(missing_ok=True)
+
+
+class SocketBackend(AuditBackend):
+    """
+    Streams newline-delimited JSON to a local collector.
+
+    `address` is `unix:///path/to/socket` or `tcp://host:port`. The connection is
+    kept open and re-established on failure; a batch that still cannot be sent
+    after `retries` reconnects raises, and the sink reports it.
+    """
+
+    def __init__(self, address: str, connect_timeout: float = 5.0, retries: int = 3):
+        parsed = urlparse(address)
+        if parsed.scheme == "unix" and parsed.path:
+            self._family, self._target = socket.AF_UNIX, parsed.path
+        elif parsed.scheme == "tcp" and parsed.hostname and parsed.port:
+            self._family, self._target = socket.AF_INET, (parsed.hostname, parsed.port)
+        else:
+            raise ValueError(f"Unsupported audit socket address: {address!r} (use unix:///path or tcp://host:port)")
+        self.address = address
+        self.name = address.rsplit("/", 1)[-1] or address
+        self.connect_timeout = connect_timeout
+        self.retries = retries
+        self._sock: Optional[socket.socket] = None
+
+    def _connect(self) -> socket.socket:
+        if self._sock is None:
+            sock = socket.socket(self._family, socket.SOCK_STREAM)
+            sock.settimeout(self.connect_timeout)
+            try:
+                sock.connect(self._target)
+            except OSError:
+                sock.close()
+                raise
+            self._sock = sock
+        return self._sock
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
+
+    def write_batch(self, entries: List[Dict[str, Any]], lines: List[str]) -> None:
+        data = "".join(line + "\n" for line in lines).encode("utf-8")
+        for attempt in range(self.retries + 1):
+            try:
+                self._connect().sendall(data)
+                return
+            except OSError as e:
+                self._disconnect()
+                if attempt == self.retries:
+                    raise
+                logger.warning(f"Audit collector {self.address} unavailable ({str(e)}); reconnecting")
+                time.sleep(min(0.1 * (2 ** attempt), 1.0))
+
+    def close(self) -> None:
+        self._disconnect()
+
+
+def segment_pattern(path: Path) -> "re.Pattern[str]":
+    """Match closed segment file names (compressed or not) for the audit file `path`."""
+    return re.compile(
+        rf"^{re.escape(path.stem)}\.(?P<started>\d{{8}}T\d{{12}}Z){re.escape(path.suffix)}(?:\.gz|\.zst)?$"
+    )
+
+
+def list_segments(path: Path) -> List[Path]:
+    """Closed segments of the audit file `path`, oldest first (the active file is not included)."""
+    if not path.parent.exists():
+        return []
+    pattern = segment_pattern(path)
+    segments: Dict[str, Path] = {}
+    for candidate in path.parent.iterdir():
+        match = pattern.match(candidate.name)
+        if not match:
+            continue
+        # Mid-compression both copies exist briefly; the compressed one is complete
+        started = match.group("started")
+        if started not in segments or candidate.suffix in (".gz", ".zst"):
+            segments[started] = candidate
+    return [segments[started] for started in sorted(segments)]
+
+
+def manifest_path(segment: Path) -> Path:
+    name = segment.name
+    for suffix in _COMPRESSED_SUFFIXES.values():
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+    return segment.with_name(f"{Path(name).stem}.manifest.json")
+
+
+def read_manifest(segment: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(manifest_path(segment), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def open_segment(segment: Path) -> IO[str]:
+    """Open a closed segment for reading as text, whatever its compression."""
+    if segment.name.endswith(".gz"):
+        return gzip.open(segment, "rt", encoding="utf-8")
+    if segment.name.endswith(".zst"):
+        import zstandard
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(segment, "rb")), encoding="utf-8")
+    return open(segment, "r", encoding="utf-8")
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _write_manifest(segment: Path, manifest: Dict[str, Any]) -> None:
+    target = manifest_path(segment)
+    tmp = target.with_name(target.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, target)
+
+
+def _compress(segment: Path, compression: str) -> Path:
+    compressed = segment.with_name(segment.name + _COMPRESSED_SUFFIXES[compression])
+    tmp = compressed.with_name(compressed.name + ".tmp")
+    with open(segment, "rb") as src:
+        if compression == "zstd":
+            import zstandard
+            with open(tmp, "wb") as dst:
+                zstandard.ZstdCompressor().copy_stream(src, dst)
+        else:
+            with gzip.open(tmp, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+    os.replace(tmp, compressed)
+    segment.unlink()
+    return compressed
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.adapters.filesystem.audit_backends import list_segments, open_segment, parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL,
+    event_type TEXT,
+    actor TEXT,
+    employee_id TEXT,
+    token_id TEXT,
+    event_hash TEXT NOT NULL UNIQUE,
+    event TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_audit_ts ON audit_events (ts, id);
+CREATE INDEX IF NOT EXISTS ix_audit_actor_ts ON audit_events (actor, ts, id);
+CREATE INDEX IF NOT EXISTS ix_audit_event_type_ts ON audit_events (event_type, ts, id);
+CREATE INDEX IF NOT EXISTS ix_audit_employee_ts ON audit_events (employee_id, ts, id);
+CREATE INDEX IF NOT EXISTS ix_audit_token ON audit_events (token_id);
+CREATE TABLE IF NOT EXISTS audit_index_meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+_INSERT = (
+    "INSERT OR IGNORE INTO audit_events "
+    "(ts, event_type, actor, employee_id, token_id, event_hash, event) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+# Rows per transaction when indexing existing files
+_REBUILD_CHUNK = 5000
+
+
+def _row(entry: Dict[str, Any], line: str) -> Tuple[Any, ...]:
+    payload = entry.get("payload") if isinstance(entry.get("payload"), dict) else {}
+    employee_id = payload.get("employee_id")
+    return (
+        parse_timestamp(entry.get("timestamp")),
+        entry.get("event_type"),
+        # MCP audit entries name the caller principal_id
+        entry.get("actor") or entry.get("principal_id"),
+        employee_id if isinstance(employee_id, str) else None,
+        entry.get("token_id"),
+        # Same line indexed twice (live append + rebuild) collapses to one row
+        hashlib.sha256(line.encode("utf-8")).hexdigest(),
+        line,
+    )
+
+
+def encode_cursor(ts: Optional[float], row_id: int) -> str:
+    return f"{'' if ts is None else repr(ts)}:{row_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[float], int]:
+    """Raises ValueError for malformed cursors."""
+    ts, _, row_id = cursor.rpartition(":")
+    return (float(ts) if ts else None), int(row_id)
+
+
+class AuditIndex:
+    """
+    SQLite sidecar index over a JSONL audit log.
+
+    Rows hold the (already redacted) event plus the columns compliance queries
+    filter on: timestamp, actor, event_type, payload employee_id and token_id.
+    It is fed incrementally by the audit writer thread and can be rebuilt from
+    the active file and its rotated segments.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def add_events(self, entries: List[Dict[str, Any]], lines: List[str]) -> None:
+        """`AuditFileWriter` listener: index a batch that was just appended."""
+        rows = [_row(entry, line) for entry, line in zip(entries, lines)]
+        with self._lock, self._conn:
+            self._conn.executemany(_INSERT, rows)
+
+    def is_built(self, log_path: Path) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM audit_index_meta WHERE key = ?", (f"built:{log_path}",)
+            ).fetchone()
+        return row is not None
+
+    def rebuild(self, log_path: Path) -> int:
+        """Index every rotated segment and the active file. Returns the number of lines read."""
+        sources: List[Path] = list_segments(log_path)
+        if log_path.exists():
+            sources.append(log_path)
+
+        total = 0
+        for source in sources:
+            with open_segment(source) as f:
+                total += self._index_lines(line.rstrip("\n") for line in f)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO audit_index_meta (key, value) VALUES (?, ?)",
+                (f"built:{log_path}", str(total)),
+            )
+        logger.info(f"Audit index rebuilt from {len(sources)} file(s), {total} lines")
+        return total
+
+    def ensure_built(self, log_path: Path) -> None:
+        if not self.is_built(log_path):
+            self.rebuild(log_path)
+
+    def _index_lines(self, lines: Iterable[str]) -> int:
+        count = 0
+        rows = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            rows.append(_row(entry, line))
+            count += 1
+            if len(rows) >= _REBUILD_CHUNK:
+                with self._lock, self._conn:
+                    self._conn.executemany(_INSERT, rows)
+                rows = []
+        if rows:
+            with self._lock, self._conn:
+                self._conn.executemany(_INSERT, rows)
+        return count
+
+    def search(
+        self,
+        actor: Optional[str] = None,
+        event_type: Optional[str] = None,
+        employee_id: Optional[str] = None,
+        token_id: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Newest-first events matching every given filter (`start`/`end` are epoch
+        seconds, inclusive). Returns the page and the cursor for the next one.
+        """
+        clauses, params = [], []
+        for column, value in (
+            ("actor", actor), ("event_type", event_type),
+            ("employee_id", employee_id), ("token_id", token_id),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("ts <= ?")
+            params.append(end)
+        if cursor is not None:
+            cursor_ts, cursor_id = decode_cursor(cursor)
+            if cursor_ts is None:
+                clauses.append("(ts IS NULL AND id < ?)")
+                params.append(cursor_id)
+            else:
+                clauses.append("(ts < ? OR (ts = ? AND id < ?) OR ts IS NULL)")
+                params.extend([cursor_ts, cursor_ts, cursor_id])
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = (
+            f"SELECT id, ts, event FROM audit_events {where} "
+            "ORDER BY ts IS NULL, ts DESC, id DESC LIMIT ?"
+        )
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        next_cursor = encode_cursor(rows[limit - 1][1], rows[limit - 1][0]) if len(rows) > limit else None
+        return [json.loads(event) for _, _, event in rows[:limit]], next_cursor
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_indexes: Dict[Path, AuditIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_audit_index(db_path: Path) -> AuditIndex:
+    """Return the shared index for `db_path`, opening it on first use."""
+    with _indexes_lock:
+        index = _indexes.get(db_path)
+        if index is None:
+            index = AuditIndex(db_path)
+            _indexes[db_path] = index
+        return index
@@ -0,0 +1,83 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Bytes read per backwards step; a line longer than this just spans several reads
+TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def iter_lines_reverse(path: Path, before: Optional[int] = None, block_size: int = TAIL_BLOCK_SIZE) -> Iterator[Tuple[int, bytes]]:
+    """
+    Yield `(offset, line)` pairs from the end of `path` backwards, newest first.
+
+    `offset` is the byte position where the line starts; pass it back as `before`
+    to continue with the lines preceding it. Only the blocks actually consumed
+    are read from disk.
+    """
+    with open(path, "rb") as f:
+        end = os.fstat(f.fileno()).st_size
+        if before is not None:
+            end = max(0, min(before, end))
+
+        position = end
+        # Bytes after the last newline seen so far (a partial line, read back to front)
+        remainder = b""
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            chunk = f.read(read_size) + remainder
+
+            lines = chunk.split(b"\n")
+            # The first piece may continue in the previous block
+            remainder = lines[0]
+            offset = position + len(chunk)
+            for line in reversed(lines[1:]):
+                offset -= len(line) + 1
+                if line.strip():
+                    yield offset + 1, line
+
+        if remainder.strip():
+            yield 0, remainder
+
+
+def _matches(event: Dict[str, Any], filters: Dict[str, str]) -> bool:
+    return all(event.get(key) == value for key, value in filters.items())
+
+
+def tail_events(
+    path: Path,
+    limit: int,
+    before: Optional[int] = None,
+    event_type: Optional[str] = None,
+    actor: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    Return up to `limit` of the newest audit events before byte offset `before`.
+
+    Events come back oldest first. The second value is the cursor for the next
+    (older) page, or None once the start of the file is reached.
+    """
+    filters = {k: v for k, v in (("event_type", event_type), ("actor", actor)) if v is not None}
+    # Cheap byte-level prefilter so non-matching lines are never parsed
+    needles = [json.dumps(v).encode("utf-8") for v in filters.values()]
+
+    events: List[Dict[str, Any]] = []
+    for offset, line in iter_lines_reverse(path, before):
+        if any(needle not in line for needle in needles):
+            continue
+        try:
+            event = json.loads(line)
+        except ValueError:
+            # A line still being written, or a corrupt one; skip it
+            continue
+        if not _matches(event, filters):
+            continue
+        events.append(event)
+        if len(events) >= limit:
+            events.reverse()
+            return events, offset if offset > 0 else None
+
+    events.reverse()
+    return events, None
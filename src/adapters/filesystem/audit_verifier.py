@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from src.adapters.filesystem.audit_backends import GENESIS_HASH, list_segments, open_segment, read_manifest
+
+# Errors reported per unit before the rest are summarized; a broken file should not flood the report
+MAX_ERRORS_PER_UNIT = 20
+
+
+@dataclass
+class VerificationUnit:
+    """A contiguous run of records: a whole file, or a checkpointed byte range of an uncompressed segment."""
+    path: str
+    start_offset: int = 0
+    end_offset: Optional[int] = None
+    first_record: int = 0
+    # prev_hash the checkpoint says the first record must carry
+    expected_prev: Optional[str] = None
+
+
+@dataclass
+class UnitResult:
+    path: str
+    first_record: int
+    first_prev: Optional[str] = None
+    last_hash: Optional[str] = None
+    records: int = 0
+    unchained: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+@dataclass
+class VerificationReport:
+    files: List[Dict[str, Any]] = field(default_factory=list)
+    records: int = 0
+    unchained: int = 0
+    # True when the oldest retained record chains from the genesis hash (nothing pruned before it)
+    anchored: bool = False
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "records": self.records,
+            "unchained": self.unchained,
+            "anchored": self.anchored,
+            "files": self.files,
+            "errors": self.errors,
+        }
+
+
+def verify_unit(unit: VerificationUnit) -> UnitResult:
+    """Walk one unit's records, checking each prev_hash against the hash of the line before it."""
+    result = UnitResult(path=unit.path, first_record=unit.first_record)
+    name = Path(unit.path).name
+    previous: Optional[str] = None
+
+    def error(index: int, message: str) -> None:
+        if len(result.errors) < MAX_ERRORS_PER_UNIT:
+            result.errors.append(f"{name} record {index}: {message}")
+        elif len(result.errors) == MAX_ERRORS_PER_UNIT:
+            result.errors.append(f"{name}: further errors suppressed")
+
+    with _open_range(unit) as lines:
+        for raw in lines:
+            line = raw.rstrip(b"\n")
+            if not line.strip():
+                continue
+            index = unit.first_record + result.records
+            result.records += 1
+            current = hashlib.sha256(line).hexdigest()
+            try:
+                prev = json.loads(line).get("prev_hash")
+            except (ValueError, AttributeError):
+                error(index, "not valid JSON")
+                previous = current
+                continue
+
+            if prev is None:
+                # Written before chaining was enabled; nothing to check
+                result.unchained += 1
+            elif previous is None:
+                result.first_prev = prev
+                if unit.expected_prev is not None and prev != unit.expected_prev:
+                    error(index, "prev_hash does not match the segment checkpoint")
+            elif prev != previous:
+                error(index, "prev_hash does not match the preceding record")
+            previous = current
+    result.last_hash = previous
+    return result
+
+
+@contextmanager
+def _open_range(unit: VerificationUnit) -> Iterator[Iterator[bytes]]:
+    """Binary lines of `unit`'s byte range (the whole file for compressed segments)."""
+    path = Path(unit.path)
+    if path.name.endswith((".gz", ".zst")):
+        with open_segment(path) as f:
+            yield (line.encode("utf-8") for line in f)
+        return
+
+    def bounded(f) -> Iterator[bytes]:
+        position = unit.start_offset
+        for raw in f:
+            if unit.end_offset is not None and position >= unit.end_offset:
+                return
+            position += len(raw)
+            yield raw
+
+    with open(path, "rb") as f:
+        f.seek(unit.start_offset)
+        yield bounded(f)
+
+
+def plan_units(path: Path, chunk_records: int = 0) -> List[Tuple[Path, Optional[Dict[str, Any]], List[VerificationUnit]]]:
+    """
+    Split the audit stream `path` (closed segments oldest first, then the active file) into units.
+
+    Uncompressed segments with manifest checkpoints are split at checkpoints so
+    workers can verify them in parallel; `chunk_records` merges checkpoints into
+    larger chunks (0 keeps one chunk per checkpoint).
+    """
+    plan = []
+    for segment in list_segments(path):
+        manifest = read_manifest(segment)
+        checkpoints = (manifest or {}).get("checkpoints") or []
+        if segment.name.endswith((".gz", ".zst")) or len(checkpoints) < 2:
+            plan.append((segment, manifest, [VerificationUnit(str(segment))]))
+            continue
+
+        if chunk_records:
+            step = max(1, chunk_records // max(1, manifest.get("checkpoint_interval") or 1))
+            checkpoints = checkpoints[::step]
+        units = []
+        for i, checkpoint in enumerate(checkpoints):
+            end = checkpoints[i + 1]["offset"] if i + 1 < len(checkpoints) else None
+            units.append(VerificationUnit(
+                str(segment),
+                start_offset=checkpoint["offset"],
+                end_offset=end,
+                first_record=checkpoint["record"],
+                expected_prev=checkpoint.get("prev_hash"),
+            ))
+        plan.append((segment, manifest, units))
+
+    if path.exists():
+        plan.append((path, None, [VerificationUnit(str(path))]))
+    return plan
+
+
+def verify_audit_log(path: Path, workers: Optional[int] = None, chunk_records: int = 0) -> VerificationReport:
+    """
+    Verify the hash chain of an audit stream across all retained segments.
+
+    Units are hashed in a process pool (`workers`, default CPU count; 1 runs
+    inline), then stitched in order: each unit must start from the previous
+    unit's last hash, and segment totals must match their manifests.
+    """
+    plan = plan_units(Path(path), chunk_records)
+    units = [unit for _, _, file_units in plan for unit in file_units]
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(units) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(units))) as pool:
+            results = iter(list(pool.map(verify_unit, units)))
+    else:
+        results = iter([verify_unit(unit) for unit in units])
+
+    report = VerificationReport()
+    chain_tip: Optional[str] = None
+    first_prev_seen = False
+    for file_path, manifest, file_units in plan:
+        file_results = [next(results) for _ in file_units]
+        file_errors: List[str] = []
+        for result in file_results:
+            file_errors.extend(result.errors)
+            if result.first_prev is not None:
+                if not first_prev_seen:
+                    report.anchored = result.first_prev == GENESIS_HASH
+                elif chain_tip is not None and result.first_prev != chain_tip:
+                    file_errors.append(
+                        f"{file_path.name} record {result.first_record}: chain break (records missing or reordered)"
+                    )
+                first_prev_seen = True
+            if result.last_hash is not None:
+                chain_tip = result.last_hash
+
+        records = sum(r.records for r in file_results)
+        if manifest is not None:
+            if manifest.get("event_count") is not None and manifest["event_count"] != records:
+                file_errors.append(
+                    f"{file_path.name}: {records} records, manifest says {manifest['event_count']}"
+                )
+            if manifest.get("last_hash") and file_results and file_results[-1].last_hash != manifest["last_hash"]:
+                file_errors.append(f"{file_path.name}: last record does not match the manifest hash")
+
+        report.records += records
+        report.unchained += sum(r.unchained for r in file_results)
+        report.errors.extend(file_errors)
+        report.files.append({
+            "file": file_path.name,
+            "records": records,
+            "chunks": len(file_units),
+            "ok": not file_errors,
+        })
+    return report
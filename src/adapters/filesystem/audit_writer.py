@@ -0,0 +1,290 @@
+import atexit
+import json
+import logging
+import queue
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from src.adapters.filesystem.audit_backends import (
+    AuditBackend,
+    JSONLFileBackend,
+    RotatingFileBackend,
+    RotationPolicy,
+    SocketBackend,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _Flush:
+    """Queue marker: signals `done` once everything queued before it is on disk."""
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+# Called on the writing thread after each batch is persisted: (entries, serialized lines)
+BatchListener = Callable[[List[Dict[str, Any]], List[str]], None]
+
+AUDIT_BACKENDS = ("jsonl", "rotating", "socket")
+
+
+class AuditSink:
+    """
+    Hands audit entries to a pluggable `AuditBackend` from a dedicated background thread.
+
+    Callers only enqueue entries, so a slow or stalled audit destination never
+    blocks the event loop. The thread serializes and writes in batches, at least
+    every `flush_interval` seconds. When the bounded queue is full, callers block
+    (back-pressure) rather than drop events.
+    """
+
+    def __init__(
+        self,
+        backend: AuditBackend,
+        buffered: bool = True,
+        flush_interval: float = 0.2,
+        batch_size: int = 256,
+        queue_size: int = 10000,
+        encoder: Optional[type] = None,
+    ):
+        self.backend = backend
+        self.buffered = buffered
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.encoder = encoder
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[BatchListener] = []
+
+    # --- Public API ---
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        """Queue an entry (or write it immediately when unbuffered)."""
+        if not self.buffered:
+            with self._lock:
+                self._write_batch([entry])
+            return
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            # Audit events must not be dropped: apply back-pressure instead
+            logger.warning(f"Audit queue full for {self.backend.name}; blocking until the writer catches up")
+            self._queue.put(entry)
+
+    def add_listener(self, listener: BatchListener) -> None:
+        """Register a callback for written batches (e.g. a search index). Idempotent."""
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every entry queued so far has been written."""
+        if not self.buffered or self._thread is None or not self._thread.is_alive():
+            return True
+        marker = _Flush()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def close(self) -> None:
+        """Drain the queue, stop the writer thread and close the backend."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join()
+        with self._lock:
+            self.backend.close()
+
+    # --- Writer thread ---
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"audit-writer:{self.backend.name}", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch: List[Dict[str, Any]] = []
+            markers: List[_Flush] = []
+            stop = False
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, _Flush):
+                    markers.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    with self._lock:
+                        self._write_batch(batch)
+                except Exception as e:
+                    logger.error(f"Failed to write {len(batch)} audit events to {self.backend.name}: {str(e)}")
+            for marker in markers:
+                marker.done.set()
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        lines = self.backend.encode(batch, self.encoder)
+        self.backend.write_batch(batch, lines)
+
+        for listener in self._listeners:
+            try:
+                listener(batch, lines)
+            except Exception as e:
+                logger.error(f"Audit batch listener failed for {self.backend.name}: {str(e)}")
+
+
+class AuditFileWriter(AuditSink):
+    """
+    `AuditSink` over a local JSONL file, rotated when `rotation` is enabled.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        buffered: bool = True,
+        flush_interval: float = 0.2,
+        batch_size: int = 256,
+        fsync: bool = False,
+        queue_size: int = 10000,
+        encoder: Optional[type] = None,
+        rotation: Optional[RotationPolicy] = None,
+        hash_chain: bool = False,
+        checkpoint_interval: int = 10000,
+    ):
+        if rotation is not None and rotation.enabled:
+            backend: JSONLFileBackend = RotatingFileBackend(
+                path, rotation, fsync=fsync, hash_chain=hash_chain, checkpoint_interval=checkpoint_interval
+            )
+        else:
+            backend = JSONLFileBackend(path, fsync=fsync, hash_chain=hash_chain)
+        super().__init__(
+            backend,
+            buffered=buffered,
+            flush_interval=flush_interval,
+            batch_size=batch_size,
+            queue_size=queue_size,
+            encoder=encoder,
+        )
+        self.path = path
+
+    @property
+    def rotation(self) -> Optional[RotationPolicy]:
+        return getattr(self.backend, "rotation", None)
+
+    def rotate(self) -> Optional[Path]:
+        """Close the active file as a segment now. Returns the segment path, if anything was written."""
+        if not isinstance(self.backend, RotatingFileBackend):
+            return None
+        self.flush()
+        with self._lock:
+            return self.backend.rotate()
+
+
+def create_audit_sink(
+    path: Path,
+    backend: str = "rotating",
+    rotation: Optional[RotationPolicy] = None,
+    socket_address: Optional[str] = None,
+    fsync: bool = False,
+    hash_chain: bool = False,
+    checkpoint_interval: int = 10000,
+    **options: Any,
+) -> AuditSink:
+    """
+    Build a sink for the audit stream `path`.
+
+    `backend` is "jsonl" (plain file), "rotating" (file with `rotation`) or
+    "socket" (local collector at `socket_address`; `path` only names the stream).
+    `hash_chain` applies to the file backends; a collector keeps its own integrity.
+    """
+    if backend == "socket":
+        if not socket_address:
+            raise ValueError("The socket audit backend requires a socket address")
+        return AuditSink(SocketBackend(socket_address), **options)
+    if backend == "jsonl":
+        rotation = None
+    elif backend != "rotating":
+        raise ValueError(f"Unknown audit backend {backend!r}; expected one of {AUDIT_BACKENDS}")
+    return AuditFileWriter(
+        path, fsync=fsync, rotation=rotation, hash_chain=hash_chain, checkpoint_interval=checkpoint_interval, **options
+    )
+
+
+def sink_options_from_settings(settings: Any) -> Dict[str, Any]:
+    """`create_audit_sink` options from an API or MCP settings object (shared AUDIT_* names)."""
+    return {
+        "backend": settings.AUDIT_SINK_BACKEND,
+        "socket_address": settings.AUDIT_SINK_SOCKET_ADDRESS,
+        "buffered": settings.AUDIT_LOG_BUFFERED,
+        "flush_interval": settings.AUDIT_LOG_FLUSH_INTERVAL_MS / 1000,
+        "batch_size": settings.AUDIT_LOG_BATCH_SIZE,
+        "fsync": settings.AUDIT_LOG_FSYNC,
+        "queue_size": settings.AUDIT_LOG_QUEUE_SIZE,
+        "hash_chain": settings.AUDIT_LOG_HASH_CHAIN,
+        "checkpoint_interval": settings.AUDIT_LOG_CHECKPOINT_INTERVAL,
+        "rotation": RotationPolicy(
+            max_bytes=settings.AUDIT_LOG_ROTATE_MAX_BYTES,
+            interval_seconds=settings.AUDIT_LOG_ROTATE_INTERVAL_SECONDS,
+            compression=None if settings.AUDIT_LOG_COMPRESSION == "none" else settings.AUDIT_LOG_COMPRESSION,
+            retention_days=settings.AUDIT_LOG_RETENTION_DAYS,
+            retention_segments=settings.AUDIT_LOG_RETENTION_SEGMENTS,
+        ),
+    }
+
+
+# One sink per audit stream, so every logger pointing at the same path shares ordering and batching.
+_sinks: Dict[Path, AuditSink] = {}
+_sinks_lock = threading.Lock()
+
+
+def get_audit_sink(path: Path, **options: Any) -> AuditSink:
+    """Return the shared sink for `path`, creating it with `create_audit_sink(**options)` on first use."""
+    with _sinks_lock:
+        sink = _sinks.get(path)
+        if sink is None:
+            sink = create_audit_sink(path, **options)
+            _sinks[path] = sink
+        return sink
+
+
+def flush_all_audit_sinks(timeout: Optional[float] = None) -> None:
+    with _sinks_lock:
+        sinks = list(_sinks.values())
+    for sink in sinks:
+        sink.flush(timeout)
+
+
+@atexit.register
+def close_all_audit_sinks() -> None:
+    with _sinks_lock:
+        sinks = list(_sinks.values())
+        _sinks.clear()
+    for sink in sinks:
+        sink.close()
@@ -0,0 +1,118 @@
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from src.adapters.filesystem.flow_listing import Position, principal_query
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS flow_archive (
+    flow_id TEXT PRIMARY KEY,
+    principal_id TEXT,
+    status TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    archived_at REAL NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_flow_archive_archived_at ON flow_archive (archived_at);
+CREATE INDEX IF NOT EXISTS ix_flow_archive_principal ON flow_archive (principal_id, start_time, flow_id);
+"""
+
+
+class FlowArchive:
+    """
+    Compressed archive of finished flows, read by flow ID or by principal.
+
+    Each record is stored as zlib-compressed JSON in a SQLite (WAL) row; the
+    few fields needed to find a record (principal, status, times) stay
+    uncompressed. Flow runners spill finished flows here once they leave
+    their retention window, and status reads fall through to it.
+    """
+
+    def __init__(self, db_path: Path, compression_level: int = 6):
+        self.db_path = db_path
+        self.compression_level = compression_level
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def put_many(self, records: List[Dict[str, Any]]) -> None:
+        if not records:
+            return
+        now = time.time()
+        rows = [
+            (
+                record["flow_id"],
+                record.get("principal_id"),
+                record.get("status"),
+                record.get("start_time"),
+                record.get("end_time"),
+                now,
+                zlib.compress(json.dumps(record, default=str).encode(), self.compression_level),
+            )
+            for record in records
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO flow_archive "
+                "(flow_id, principal_id, status, start_time, end_time, archived_at, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def get_many(self, flow_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        if not flow_ids:
+            return {}
+        placeholders = ", ".join("?" * len(flow_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT flow_id, data FROM flow_archive WHERE flow_id IN ({placeholders})", flow_ids
+            ).fetchall()
+        return {row["flow_id"]: json.loads(zlib.decompress(row["data"])) for row in rows}
+
+    def list_for_principal(
+        self,
+        principal_id: str,
+        status: Optional[str] = None,
+        since: Optional[str] = None,
+        before: Optional[Position] = None,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        sql, params = principal_query("flow_archive", "data", principal_id, status, since, before, limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(zlib.decompress(row["data"])) for row in rows]
+
+    def prune(self, older_than_seconds: float) -> int:
+        """Delete records archived more than `older_than_seconds` ago. Returns how many."""
+        cutoff = time.time() - older_than_seconds
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM flow_archive WHERE archived_at < ?", (cutoff,)).rowcount
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM flow_archive").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_archives: Dict[Path, FlowArchive] = {}
+_archives_lock = threading.Lock()
+
+
+def get_flow_archive(db_path: Path) -> FlowArchive:
+    """Return the shared archive for `db_path`, opening it on first use."""
+    with _archives_lock:
+        archive = _archives.get(db_path)
+        if archive is None:
+            archive = FlowArchive(db_path)
+            _archives[db_path] = archive
+        return archive
@@ -0,0 +1,80 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Keyset position in a principal's flow list: (start_time, flow_id) of the last row seen
+Position = Tuple[str, str]
+
+
+def encode_flow_cursor(record: Dict[str, Any]) -> str:
+    return f"{record.get('start_time') or ''}|{record['flow_id']}"
+
+
+def decode_flow_cursor(cursor: str) -> Position:
+    """Raises ValueError for malformed cursors."""
+    start_time, separator, flow_id = cursor.rpartition("|")
+    if not separator or not flow_id:
+        raise ValueError(f"Invalid flow cursor: {cursor}")
+    return start_time, flow_id
+
+
+def _sort_key(record: Dict[str, Any]) -> Position:
+    return record.get("start_time") or "", record["flow_id"]
+
+
+def principal_query(
+    table: str,
+    columns: str,
+    principal_id: str,
+    status: Optional[str],
+    since: Optional[str],
+    before: Optional[Position],
+    limit: int,
+) -> Tuple[str, List[Any]]:
+    """
+    SELECT for one page of a principal's flows, newest first. Served by an
+    index on (principal_id, start_time, flow_id) in both the store and the archive.
+    """
+    conditions, params = ["principal_id = ?"], [principal_id]
+    if status is not None:
+        conditions.append("status = ?")
+        params.append(status)
+    if since is not None:
+        conditions.append("start_time >= ?")
+        params.append(since)
+    if before is not None:
+        conditions.append("(start_time < ? OR (start_time = ? AND flow_id < ?))")
+        params.extend([before[0], before[0], before[1]])
+    sql = (
+        f"SELECT {columns} FROM {table} WHERE {' AND '.join(conditions)} "
+        "ORDER BY start_time DESC, flow_id DESC LIMIT ?"
+    )
+    return sql, [*params, limit]
+
+
+def filter_flows(
+    records: Iterable[Dict[str, Any]],
+    status: Optional[str],
+    since: Optional[str],
+    before: Optional[Position],
+) -> List[Dict[str, Any]]:
+    """The in-memory equivalent of `principal_query` (without the limit)."""
+    return [
+        record for record in records
+        if (status is None or record.get("status") == status)
+        and (since is None or (record.get("start_time") or "") >= since)
+        and (before is None or _sort_key(record) < before)
+    ]
+
+
+def merge_pages(*sources: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+    """Newest-first union of pages from several sources; earlier sources win duplicates."""
+    seen: Dict[str, Dict[str, Any]] = {}
+    for records in sources:
+        for record in records:
+            seen.setdefault(record["flow_id"], record)
+    return sorted(seen.values(), key=_sort_key, reverse=True)[:limit]
+
+
+def paginate(records: List[Dict[str, Any]], limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Split `limit + 1` fetched records into a page and the cursor for the next one."""
+    page = records[:limit]
+    return page, encode_flow_cursor(page[-1]) if len(records) > limit else None
@@ -0,0 +1,625 @@
+import asyncio
+import json
+import logging
+import os
+import queue
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+from src.adapters.filesystem.flow_archive import FlowArchive
+from src.adapters.filesystem.flow_listing import (
+    Position, decode_flow_cursor, merge_pages, paginate, principal_query,
+)
+from src.adapters.webhooks.callbacks import CallbackDispatcher, flow_callback_payload
+from src.domain.ports.flow_runner import FlowRunnerPort
+from src.domain.services.flow_events import FlowNotifier
+
+if TYPE_CHECKING:
+    from src.domain.services.flow_engine import FlowEngine
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS flows (
+    flow_id TEXT PRIMARY KEY,
+    domain TEXT NOT NULL,
+    flow TEXT NOT NULL,
+    status TEXT NOT NULL,
+    principal_id TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    current_step TEXT,
+    params TEXT,
+    context TEXT,
+    result TEXT,
+    error TEXT,
+    owner TEXT,
+    callback_url TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_flows_status_owner ON flows (status, owner);
+CREATE INDEX IF NOT EXISTS ix_flows_principal ON flows (principal_id, start_time, flow_id);
+CREATE TABLE IF NOT EXISTS flow_journal (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    flow_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    event TEXT NOT NULL,
+    step TEXT,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_flow_journal_flow ON flow_journal (flow_id, id);
+CREATE TABLE IF NOT EXISTS flow_workers (owner TEXT PRIMARY KEY, heartbeat REAL NOT NULL);
+"""
+
+_COLUMNS = (
+    "flow_id", "domain", "flow", "status", "principal_id", "start_time", "end_time",
+    "current_step", "params", "context", "result", "error", "owner", "callback_url",
+)
+_JSON_COLUMNS = {"params", "context", "result"}
+_TERMINAL = {"COMPLETED", "FAILED"}
+
+# Called on the writer thread once an operation is committed
+OnCommit = Callable[[], None]
+
+
+def _encode(column: str, value: Any) -> Any:
+    return json.dumps(value) if column in _JSON_COLUMNS and value is not None else value
+
+
+def _decode(row: sqlite3.Row) -> Dict[str, Any]:
+    record = {}
+    for column in row.keys():
+        value = row[column]
+        record[column] = json.loads(value) if column in _JSON_COLUMNS and value is not None else value
+    return record
+
+
+class FlowStore:
+    """
+    SQLite (WAL) storage for flow executions: one row per flow plus an
+    append-only `flow_journal` of step events.
+
+    Writes are queued to a background thread and committed in batches, at least
+    every `flush_interval` seconds; `on_commit` callbacks fire once an operation
+    is durable. Reads go straight to SQLite (WAL readers never block the writer).
+    """
+
+    def __init__(self, db_path: Path, flush_interval: float = 0.05, batch_size: int = 500):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def _migrate(self) -> None:
+        """Add columns introduced after a store file was created."""
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(flows)")}
+        with self._conn:
+            for column in _COLUMNS:
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE flows ADD COLUMN {column} TEXT")
+
+    # --- Writes (batched on the writer thread) ---
+
+    def insert(self, record: Dict[str, Any], on_commit: Optional[OnCommit] = None) -> None:
+        row = tuple(_encode(column, record.get(column)) for column in _COLUMNS)
+        journal = (record["flow_id"], "started", None, None)
+        self._enqueue(("insert", row, journal, on_commit))
+
+    def update(
+        self,
+        flow_id: str,
+        changes: Dict[str, Any],
+        journal: Optional[Tuple[str, Optional[str], Any]] = None,
+        on_commit: Optional[OnCommit] = None,
+    ) -> None:
+        """Apply `changes` to the flow row and append `(event, step, data)` to its journal."""
+        assignments = [(column, _encode(column, value)) for column, value in changes.items() if column in _COLUMNS]
+        entry = (flow_id, journal[0], journal[1], journal[2]) if journal else None
+        self._enqueue(("update", flow_id, assignments, entry, on_commit))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued write is committed."""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(("marker", done.set))
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join()
+        with self._lock:
+            self._conn.close()
+
+    def _enqueue(self, op: Tuple[Any, ...]) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name=f"flow-store:{self.db_path.name}", daemon=True)
+                    self._thread.start()
+        self._queue.put(op)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                op = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch, stop = [], False
+            while True:
+                if op is None:
+                    stop = True
+                else:
+                    batch.append(op)
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    op = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._commit(batch)
+            if stop:
+                return
+
+    def _commit(self, batch: List[Tuple[Any, ...]]) -> None:
+        now = time.time()
+        callbacks: List[OnCommit] = []
+        try:
+            with self._lock, self._conn:
+                for op in batch:
+                    kind = op[0]
+                    if kind == "insert":
+                        _, row, journal, on_commit = op
+                        self._conn.execute(
+                            f"INSERT OR REPLACE INTO flows ({', '.join(_COLUMNS)}, updated_at) "
+                            f"VALUES ({', '.join('?' * len(_COLUMNS))}, ?)",
+                            (*row, now),
+                        )
+                        self._append_journal(journal, now)
+                    elif kind == "update":
+                        _, flow_id, assignments, journal, on_commit = op
+                        if assignments:
+                            sets = ", ".join(f"{column} = ?" for column, _ in assignments)
+                            self._conn.execute(
+                                f"UPDATE flows SET {sets}, updated_at = ? WHERE flow_id = ?",
+                                (*[value for _, value in assignments], now, flow_id),
+                            )
+                        if journal:
+                            self._append_journal(journal, now)
+                    else:
+                        on_commit = op[1]
+                    if on_commit is not None:
+                        callbacks.append(on_commit)
+        except Exception as e:
+            logger.error(f"Failed to persist {len(batch)} flow store writes: {str(e)}")
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Flow store commit callback failed: {str(e)}")
+
+    def _append_journal(self, entry: Tuple[str, str, Optional[str], Any], now: float) -> None:
+        flow_id, event, step, data = entry
+        self._conn.execute(
+            "INSERT INTO flow_journal (flow_id, ts, event, step, data) VALUES (?, ?, ?, ?, ?)",
+            (flow_id, now, event, step, None if data is None else json.dumps(data)),
+        )
+
+    # --- Reads ---
+
+    def get_many(self, flow_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Flow records by ID; one query for the whole batch."""
+        if not flow_ids:
+            return {}
+        placeholders = ", ".join("?" * len(flow_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM flows WHERE flow_id IN ({placeholders})", flow_ids
+            ).fetchall()
+        return {row["flow_id"]: _decode(row) for row in rows}
+
+    def list_for_principal(
+        self,
+        principal_id: str,
+        status: Optional[str] = None,
+        since: Optional[str] = None,
+        before: Optional[Position] = None,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """A principal's flows, newest first, via the (principal_id, start_time) index."""
+        sql, params = principal_query("flows", ", ".join(_COLUMNS), principal_id, status, since, before, limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [_decode(row) for row in rows]
+
+    def journal(self, flow_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ts, event, step, data FROM flow_journal WHERE flow_id = ? ORDER BY id", (flow_id,)
+            ).fetchall()
+        return [
+            {"ts": row["ts"], "event": row["event"], "step": row["step"],
+             "data": json.loads(row["data"]) if row["data"] is not None else None}
+            for row in rows
+        ]
+
+    def completed_steps(self, flow_id: str) -> Dict[str, Any]:
+        """Results of the steps a flow's journal records as completed, in order."""
+        return {
+            entry["step"]: entry["data"]
+            for entry in self.journal(flow_id)
+            if entry["event"] == "step_completed"
+        }
+
+    # --- Retention ---
+
+    def expired(self, ttl_seconds: Optional[float], max_finished: Optional[int], limit: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Finished flows (with their journal) that left the retention window: last
+        updated more than `ttl_seconds` ago, or beyond the newest `max_finished`.
+        """
+        terminal = ", ".join(f"'{status}'" for status in sorted(_TERMINAL))
+        conditions, params = [], []
+        if ttl_seconds is not None:
+            conditions.append("updated_at < ?")
+            params.append(time.time() - ttl_seconds)
+        if max_finished is not None:
+            conditions.append(
+                f"flow_id IN (SELECT flow_id FROM flows WHERE status IN ({terminal}) "
+                "ORDER BY updated_at DESC LIMIT -1 OFFSET ?)"
+            )
+            params.append(max_finished)
+        if not conditions:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM flows WHERE status IN ({terminal}) "
+                f"AND ({' OR '.join(conditions)}) ORDER BY updated_at LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        records = [_decode(row) for row in rows]
+        for record in records:
+            record["journal"] = self.journal(record["flow_id"])
+        return records
+
+    def delete(self, flow_ids: List[str]) -> None:
+        """Remove flows and their journals (after they were archived)."""
+        if not flow_ids:
+            return
+        placeholders = ", ".join("?" * len(flow_ids))
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM flows WHERE flow_id IN ({placeholders})", flow_ids)
+            self._conn.execute(f"DELETE FROM flow_journal WHERE flow_id IN ({placeholders})", flow_ids)
+
+    # --- Ownership (crash recovery across processes) ---
+
+    def heartbeat(self, owner: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO flow_workers (owner, heartbeat) VALUES (?, ?)", (owner, time.time())
+            )
+
+    def claim_orphans(self, owner: str, lease_seconds: float) -> List[Dict[str, Any]]:
+        """
+        Take over RUNNING flows whose owner stopped heartbeating for `lease_seconds`.
+
+        The claim is one UPDATE, so concurrent workers never resume the same flow.
+        """
+        cutoff = time.time() - lease_seconds
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE flows SET owner = ? WHERE status = 'RUNNING' AND owner IS NOT ? AND ("
+                "owner IS NULL OR owner NOT IN (SELECT owner FROM flow_workers WHERE heartbeat >= ?))",
+                (owner, owner, cutoff),
+            )
+            self._conn.execute("DELETE FROM flow_workers WHERE heartbeat < ?", (cutoff,))
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM flows WHERE status = 'RUNNING' AND owner = ?", (owner,)
+            ).fetchall()
+        return [_decode(row) for row in rows]
+
+
+class SQLiteFlowRunnerAdapter(FlowRunnerPort):
+    """
+    Durable `FlowRunnerPort`: executions live in a `FlowStore` shared by every
+    worker process, so status reads work wherever the request lands.
+
+    Flows running in this process are also kept in memory until their final
+    state is committed, so their status reads never wait on the writer. Other
+    reads are coalesced: concurrent lookups on the event loop share one query.
+    A heartbeat task lets surviving workers claim and resume the RUNNING flows
+    of a crashed one from their last completed step.
+
+    Change notifications only cover flows executing in this process; watchers
+    of a flow running elsewhere re-read the store every `remote_poll_interval`.
+    A flow's `callback_url` is queued on `callbacks` once it finishes.
+
+    The maintenance task also moves finished flows older than `ttl_seconds`, or
+    beyond the newest `max_finished`, to `archive` (journal included), which
+    status reads fall through to; without an archive they are deleted.
+    """
+
+    def __init__(
+        self,
+        store: FlowStore,
+        engine: Optional["FlowEngine"] = None,
+        lease_seconds: float = 30.0,
+        remote_poll_interval: float = 1.0,
+        callbacks: Optional[CallbackDispatcher] = None,
+        ttl_seconds: Optional[float] = None,
+        max_finished: Optional[int] = None,
+        archive: Optional[FlowArchive] = None,
+        archive_retention_seconds: Optional[float] = None,
+    ):
+        self.store = store
+        self.engine = engine
+        self.lease_seconds = lease_seconds
+        self.remote_poll_interval = remote_poll_interval
+        self.notifier = FlowNotifier()
+        self.callbacks = callbacks
+        self.ttl_seconds = ttl_seconds
+        self.max_finished = max_finished
+        self.archive = archive
+        self.archive_retention_seconds = archive_retention_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        # Flows executing here, until their terminal state is committed
+        self._live: Dict[str, Dict[str, Any]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._maintenance: Optional[asyncio.Task] = None
+        self._pending_reads: Dict[str, asyncio.Future] = {}
+
+    async def start_flow(
+        self,
+        domain: str,
+        flow: str,
+        params: Dict[str, Any],
+        principal_id: str,
+        context: Optional[Dict[str, Any]] = None,
+        callback_url: Optional[str] = None,
+    ) -> str:
+        self._ensure_maintenance()
+        if self.engine is not None:
+            # Raises FlowAdmissionError when the scheduler is saturated
+            self.engine.admit(principal_id)
+        flow_id = str(uuid.uuid4())
+        record = {
+            "flow_id": flow_id,
+            "domain": domain,
+            "flow": flow,
+            "status": "RUNNING",
+            "start_time": datetime.now(timezone.utc).isoformat(),
+            "current_step": "init",
+            "params": params,
+            "context": context or {},
+            "principal_id": principal_id,
+            "result": None,
+            "error": None,
+            "owner": self.owner,
+            "callback_url": callback_url,
+        }
+        self._live[flow_id] = record
+
+        # Accepting a flow means it survives a crash: wait for the insert to commit
+        try:
+            committed = self._loop.create_future()
+            self.store.insert(record, on_commit=self._resolver(committed))
+            await committed
+        except BaseException:
+            self._live.pop(flow_id, None)
+            if self.engine is not None:
+                self.engine.release(principal_id)
+            raise
+
+        await self._submit(record, {}, admitted=True)
+        return flow_id
+
+    async def get_flow_status(self, flow_id: str) -> Optional[Dict[str, Any]]:
+        self._ensure_maintenance()
+        record = self._live.get(flow_id)
+        if record is not None:
+            return dict(record)
+
+        future = self._pending_reads.get(flow_id)
+        if future is None:
+            future = self._loop.create_future()
+            if not self._pending_reads:
+                self._loop.call_soon(lambda: self._loop.create_task(self._flush_reads()))
+            self._pending_reads[flow_id] = future
+        return await asyncio.shield(future)
+
+    async def list_flows(
+        self,
+        principal_id: str,
+        status: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        before = decode_flow_cursor(cursor) if cursor else None
+        records = await asyncio.to_thread(self._list, principal_id, status, since, before, limit + 1)
+        # Flows running here may be ahead of their committed rows
+        records = [dict(self._live.get(record["flow_id"], record)) for record in records]
+        return paginate(records, limit)
+
+    def change_version(self, flow_id: str) -> int:
+        return self.notifier.version(flow_id)
+
+    async def wait_for_change(self, flow_id: str, version: int, timeout: float) -> bool:
+        if flow_id in self._live:
+            return await self.notifier.wait(flow_id, version, timeout)
+        # Not executing here (finished, or owned by another worker): only the store knows
+        if await self.notifier.wait(flow_id, version, min(timeout, self.remote_poll_interval)):
+            return True
+        return self.remote_poll_interval < timeout
+
+    async def recover(self) -> int:
+        """Heartbeat, then resume flows orphaned by dead workers. Returns how many were resumed."""
+        await asyncio.to_thread(self.store.heartbeat, self.owner)
+        orphans = await asyncio.to_thread(self.store.claim_orphans, self.owner, self.lease_seconds)
+        resumed = 0
+        for record in orphans:
+            if record["flow_id"] in self._live:
+                continue
+            completed = await asyncio.to_thread(self.store.completed_steps, record["flow_id"])
+            logger.info(f"Resuming flow {record['flow_id']} after {len(completed)} completed step(s)")
+            self._live[record["flow_id"]] = record
+            await self._submit(record, completed)
+            resumed += 1
+        return resumed
+
+    async def archive_finished(self) -> int:
+        """Apply the retention window once. Returns how many flows left the store."""
+        return await asyncio.to_thread(self._archive_finished)
+
+    def _archive_finished(self) -> int:
+        moved = 0
+        while True:
+            records = self.store.expired(self.ttl_seconds, self.max_finished)
+            if not records:
+                break
+            if self.archive is not None:
+                # Archive first: a crash in between leaves a duplicate, never a gap
+                self.archive.put_many(records)
+            self.store.delete([record["flow_id"] for record in records])
+            moved += len(records)
+        if self.archive is not None and self.archive_retention_seconds:
+            self.archive.prune(self.archive_retention_seconds)
+        return moved
+
+    # --- Internals ---
+
+    async def _submit(self, record: Dict[str, Any], completed_steps: Dict[str, Any], admitted: bool = False) -> None:
+        if self.engine is None:
+            return
+        await self.engine.submit(
+            record["flow_id"],
+            {
+                "domain": record["domain"],
+                "flow": record["flow"],
+                "params": record.get("params") or {},
+                "principal_id": record["principal_id"],
+                "context": record.get("context") or {},
+                "completed_steps": completed_steps,
+            },
+            self._update,
+            admitted=admitted,
+        )
+
+    def _update(self, flow_id: str, changes: Dict[str, Any]) -> None:
+        """`FlowEngine` callback: update the live record and journal the step event."""
+        record = self._live.get(flow_id)
+        if record is None:
+            return
+        previous = record.get("result") or {}
+        record.update(changes)
+
+        journal = None
+        on_commit = None
+        if changes.get("status") in _TERMINAL:
+            error = changes.get("error")
+            journal = (changes["status"].lower(), record.get("current_step"), {"error": error} if error else None)
+            # Reads fall through to the store once the final state is durable
+            on_commit = lambda: self._live.pop(flow_id, None)
+            if record.get("callback_url") and self.callbacks is not None:
+                self.callbacks.submit(flow_id, record["callback_url"], flow_callback_payload(record))
+        elif "result" in changes:
+            done = [step for step in (changes["result"] or {}).get("steps", {}) if step not in previous.get("steps", {})]
+            if done:
+                journal = ("step_completed", done[-1], changes["result"]["steps"][done[-1]])
+        elif "current_step" in changes:
+            journal = ("step_started", changes["current_step"], None)
+        self.store.update(flow_id, changes, journal, on_commit)
+        self.notifier.notify(flow_id)
+
+    def _resolver(self, future: asyncio.Future) -> OnCommit:
+        loop = self._loop
+
+        def resolve() -> None:
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+        return resolve
+
+    async def _flush_reads(self) -> None:
+        pending, self._pending_reads = self._pending_reads, {}
+        try:
+            records = await asyncio.to_thread(self._read_many, list(pending))
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for flow_id, future in pending.items():
+            if not future.done():
+                future.set_result(records.get(flow_id))
+
+    def _list(
+        self, principal_id: str, status: Optional[str], since: Optional[str], before: Optional[Position], limit: int
+    ) -> List[Dict[str, Any]]:
+        records = self.store.list_for_principal(principal_id, status, since, before, limit)
+        if self.archive is None:
+            return records
+        archived = self.archive.list_for_principal(principal_id, status, since, before, limit)
+        return merge_pages(records, archived, limit=limit)
+
+    def _read_many(self, flow_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        records = self.store.get_many(flow_ids)
+        missing = [flow_id for flow_id in flow_ids if flow_id not in records]
+        if missing and self.archive is not None:
+            records.update(self.archive.get_many(missing))
+        return records
+
+    def _ensure_maintenance(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._pending_reads = {}
+        self._maintenance = loop.create_task(self._maintain(), name="flow-store-maintenance")
+
+    async def _maintain(self) -> None:
+        if self.callbacks is not None:
+            # Deliveries queued before a restart resume with the flows
+            self.callbacks.start()
+        while True:
+            try:
+                await self.recover()
+            except Exception as e:
+                logger.error(f"Flow recovery failed: {str(e)}")
+            try:
+                await self.archive_finished()
+            except Exception as e:
+                logger.error(f"Flow archiving failed: {str(e)}")
+            await asyncio.sleep(self.lease_seconds / 3)
+
+
+_stores: Dict[Path, FlowStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_flow_store(db_path: Path, **options: Any) -> FlowStore:
+    """Return the shared store for `db_path`, opening it on first use."""
+    with _stores_lock:
+        store = _stores.get(db_path)
+        if store is None:
+            store = FlowStore(db_path, **options)
+            _stores[db_path] = store
+        return store
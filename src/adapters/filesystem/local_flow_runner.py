@@ -1,12 +1,58 @@
+import asyncio
+import logging
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+from src.adapters.filesystem.flow_archive import FlowArchive
+from src.adapters.filesystem.flow_listing import decode_flow_cursor, filter_flows, merge_pages, paginate
+from src.adapters.webhooks.callbacks import CallbackDispatcher, flow_callback_payload
 from src.domain.ports.flow_runner import FlowRunnerPort
+from src.domain.services.flow_events import FlowNotifier
+
+if TYPE_CHECKING:
+    from src.domain.services.flow_engine import FlowEngine
+
+logger = logging.getLogger(__name__)
+
+_TERMINAL = {"COMPLETED", "FAILED"}
 
 class LocalFlowRunnerAdapter(FlowRunnerPort):
-    def __init__(self):
-        # In-memory store for MVP. For persistence, this should write to a file/DB.
+    """
+    In-process `FlowRunnerPort` (`FLOW_STORE_BACKEND=memory`).
+
+    Finished flows stay in memory for `ttl_seconds`, and at most `max_finished`
+    of them are kept; older ones are spilled to `archive` (or dropped without
+    one), where status reads still find them. Running flows are never evicted.
+    Archived flows older than `archive_retention_seconds` are pruned.
+    """
+
+    def __init__(
+        self,
+        engine: Optional["FlowEngine"] = None,
+        callbacks: Optional[CallbackDispatcher] = None,
+        ttl_seconds: Optional[float] = None,
+        max_finished: Optional[int] = None,
+        archive: Optional[FlowArchive] = None,
+        archive_retention_seconds: Optional[float] = None,
+    ):
         self._executions: Dict[str, Dict[str, Any]] = {}
+        # Without an engine, flows are only recorded (never executed)
+        self.engine = engine
+        self.notifier = FlowNotifier()
+        self.callbacks = callbacks
+        self.ttl_seconds = ttl_seconds
+        self.max_finished = max_finished
+        self.archive = archive
+        self.archive_retention_seconds = archive_retention_seconds
+
+        # Finished flow IDs in completion order (monotonic finish time)
+        self._finished: "OrderedDict[str, float]" = OrderedDict()
+        # Evicted records whose archive write has not completed yet
+        self._spilling: Dict[str, Dict[str, Any]] = {}
+        # principal_id -> IDs of its flows held in memory, in start order
+        self._by_principal: Dict[str, Dict[str, None]] = {}
 
     async def start_flow(
         self,
@@ -14,7 +60,13 @@ class LocalFlowRunnerAdapter(FlowRunnerPort):
         flow: str,
         params: Dict[str, Any],
         principal_id: str,
+        context: Optional[Dict[str, Any]] = None,
+        callback_url: Optional[str] = None,
     ) -> str:
+        self._evict()
+        if self.engine is not None:
+            # Raises FlowAdmissionError when the scheduler is saturated
+            self.engine.admit(principal_id)
         flow_id = str(uuid.uuid4())
         self._executions[flow_id] = {
             "flow_id": flow_id,
@@ -26,9 +78,101 @@ class LocalFlowRunnerAdapter(FlowRunnerPort):
             "params": params,
             "principal_id": principal_id,
             "result": None,
-            "error": None
+            "error": None,
+            "callback_url": callback_url,
         }
+        self._by_principal.setdefault(principal_id, {})[flow_id] = None
+        if self.engine is not None:
+            await self.engine.submit(
+                flow_id,
+                {"domain": domain, "flow": flow, "params": params, "principal_id": principal_id, "context": context or {}},
+                self._update,
+                admitted=True,
+            )
         return flow_id
 
+    def _update(self, flow_id: str, changes: Dict[str, Any]) -> None:
+        execution = self._executions.get(flow_id)
+        if execution is not None:
+            execution.update(changes)
+            self.notifier.notify(flow_id)
+            if changes.get("status") in _TERMINAL:
+                if execution.get("callback_url") and self.callbacks is not None:
+                    self.callbacks.submit(flow_id, execution["callback_url"], flow_callback_payload(execution))
+                self._finished[flow_id] = time.monotonic()
+                self._evict()
+
     async def get_flow_status(self, flow_id: str) -> Optional[Dict[str, Any]]:
-        return self._executions.get(flow_id)
+        execution = self._executions.get(flow_id) or self._spilling.get(flow_id)
+        if execution is not None or self.archive is None:
+            return execution
+        return (await asyncio.to_thread(self.archive.get_many, [flow_id])).get(flow_id)
+
+    async def list_flows(
+        self,
+        principal_id: str,
+        status: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        before = decode_flow_cursor(cursor) if cursor else None
+        held = [self._executions[flow_id] for flow_id in self._by_principal.get(principal_id, ())]
+        held += [record for record in self._spilling.values() if record["principal_id"] == principal_id]
+        records = merge_pages(filter_flows(held, status, since, before), limit=limit + 1)
+        if self.archive is not None:
+            archived = await asyncio.to_thread(
+                self.archive.list_for_principal, principal_id, status, since, before, limit + 1
+            )
+            records = merge_pages(records, archived, limit=limit + 1)
+        return paginate(records, limit)
+
+    def change_version(self, flow_id: str) -> int:
+        return self.notifier.version(flow_id)
+
+    async def wait_for_change(self, flow_id: str, version: int, timeout: float) -> bool:
+        return await self.notifier.wait(flow_id, version, timeout)
+
+    # --- Retention ---
+
+    def _evict(self) -> None:
+        """Evict finished flows past the TTL or the count limit, oldest first."""
+        now = time.monotonic()
+        evicted: List[Dict[str, Any]] = []
+        while self._finished:
+            flow_id, finished_at = next(iter(self._finished.items()))
+            over_limit = self.max_finished is not None and len(self._finished) > self.max_finished
+            expired = self.ttl_seconds is not None and now - finished_at >= self.ttl_seconds
+            if not (over_limit or expired):
+                break
+            self._finished.popitem(last=False)
+            record = self._executions.pop(flow_id, None)
+            if record is not None:
+                evicted.append(record)
+                self._unindex(record)
+        if evicted and self.archive is not None:
+            self._spill(evicted)
+
+    def _unindex(self, record: Dict[str, Any]) -> None:
+        flows = self._by_principal.get(record["principal_id"])
+        if flows is not None:
+            flows.pop(record["flow_id"], None)
+            if not flows:
+                del self._by_principal[record["principal_id"]]
+
+    def _spill(self, records: List[Dict[str, Any]]) -> None:
+        for record in records:
+            self._spilling[record["flow_id"]] = record
+        future = asyncio.get_running_loop().run_in_executor(None, self._write_archive, records)
+
+        def done(_: "asyncio.Future[None]") -> None:
+            if not future.cancelled() and future.exception() is not None:
+                logger.error(f"Failed to archive {len(records)} finished flow(s): {str(future.exception())}")
+            for record in records:
+                self._spilling.pop(record["flow_id"], None)
+        future.add_done_callback(done)
+
+    def _write_archive(self, records: List[Dict[str, Any]]) -> None:
+        self.archive.put_many(records)
+        if self.archive_retention_seconds:
+            self.archive.prune(self.archive_retention_seconds)
@@ -1,11 +1,34 @@
+import hashlib
 import json
 import logging
-import re
 import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional
 from src.lib.config_validator import settings
+from src.adapters.filesystem.audit_index import get_audit_index
+from src.adapters.filesystem.audit_writer import get_audit_sink, sink_options_from_settings
+from src.lib.redaction import RedactionEngine
+
+# Audit redaction: PII patterns are masked inline, sensitive fields are replaced wholesale
+_redactor = RedactionEngine(
+    replacements={
+        "email": "[REDACTED_EMAIL]",
+        "phone": "[REDACTED_PHONE]",
+        "ssn": "[REDACTED_SSN]",
+        "salary": "[REDACTED_SALARY]",
+    },
+    sensitive_keys=[
+        "personal_email", "phone", "mobile", "ssn", "base_salary", "bonus_target",
+        "total_compensation", "password", "secret", "token",
+    ],
+)
+
+# BASIC audit records keep only these identifier parameters (no free text, no principal context)
+BASIC_PAYLOAD_FIELDS = (
+    "employee_id", "manager_id", "approver_id", "root_id",
+    "request_id", "statement_id", "idempotency_key",
+)
 
 class JSONDateTimeEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -14,9 +37,17 @@ class JSONDateTimeEncoder(json.JSONEncoder):
         return super().default(obj)
 
 class JSONLLogger:
-    def __init__(self, log_path: Optional[str] = None):
+    def __init__(
+        self,
+        log_path: Optional[str] = None,
+        buffered: Optional[bool] = None,
+        index_path: Optional[str] = None,
+    ):
+        # The configured audit log feeds the configured search index; custom paths opt in
         if log_path is None:
             log_path = settings.AUDIT_LOG_PATH
+            if index_path is None and settings.AUDIT_INDEX_ENABLED:
+                index_path = settings.AUDIT_INDEX_PATH
             
         target_path = Path(log_path).resolve()
         
@@ -45,49 +76,59 @@ class JSONLLogger:
 
         self.log_path = target_path
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # PII Patterns to redact
-        self.pii_patterns = {
-            "email": r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+',
-            # Phone: Matches international +1-555... or local 555-555-5555 or (555) 555-5555
-            "phone": r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-            # SSN: Matches 000-00-0000 or 000000000
-            "ssn": r'\b\d{3}[-]?\d{2}[-]?\d{4}\b',
-            "salary": r'"amount"\s*:\s*\d+(\.\d+)?' 
-        }
 
-    def _redact(self, data: Any, key_name: Optional[str] = None) -> Any:
+        # Writes go through the shared audit sink for this path (background thread when buffered)
+        options = sink_options_from_settings(settings)
+        if buffered is not None:
+            options["buffered"] = buffered
+        self._sink = get_audit_sink(self.log_path, encoder=JSONDateTimeEncoder, **options)
+
+        # Keep the search index current from the writer thread
+        if index_path is not None:
+            self._sink.add_listener(get_audit_index(Path(index_path).resolve()).add_events)
+
+
+    def _redact(self, data: Any) -> Any:
         """
         Recursively redact PII from dictionaries, lists, and strings.
-        Combines field-name heuristics with pattern matching.
+        Combines field-name heuristics with pattern matching (see src/lib/redaction.py).
         """
-        # 1. Field Name Heuristic (Redact value completely if key matches)
-        sensitive_fields = ["personal_email", "phone", "mobile", "ssn", "base_salary", "bonus_target", "total_compensation", "password", "secret", "token"]
-        if key_name and key_name.lower() in sensitive_fields:
-            return "[REDACTED]"
+        return _redactor.redact(data)
 
-        # 2. Recursion
-        if isinstance(data, dict):
-            return {k: self._redact(v, key_name=k) for k, v in data.items()}
-        elif isinstance(data, list):
-            return [self._redact(item) for item in data]
-        
-        # 3. Pattern Matching (Fallback for strings in non-sensitive fields)
-        elif isinstance(data, str):
-            redacted = data
-            for name, pattern in self.pii_patterns.items():
-                replacement = f"[REDACTED_{name.upper()}]"
-                redacted = re.sub(pattern, replacement, redacted)
-            return redacted
-            
-        return data
+    def _basic_payload(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Fixed-schema identifiers only; no recursive redaction pass over the payload."""
+        return {
+            key: _redactor.redact_text(value) if isinstance(value, str) else value
+            for key in BASIC_PAYLOAD_FIELDS
+            if isinstance(value := payload.get(key), (str, int))
+        }
+
+    @staticmethod
+    def _digest(result: Any) -> str:
+        canonical = json.dumps(result, sort_keys=True, separators=(",", ":"), default=str)
+        return "sha256:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
 
-    def log_event(self, event_type: str, payload: Dict[str, Any], actor: str = "system", token_claims: Optional[Dict[str, Any]] = None):
+    def log_event(
+        self,
+        event_type: str,
+        payload: Dict[str, Any],
+        actor: str = "system",
+        token_claims: Optional[Dict[str, Any]] = None,
+        audit_level: Optional[str] = None,
+        result: Any = None,
+    ):
         """
         Log an event to the JSONL file with robust PII redaction.
+
+        `audit_level` comes from the matching policy rule. BASIC records carry only
+        identifier parameters; VERBOSE records carry the full redacted payload and a
+        digest of `result`. Without a level the full redacted payload is logged.
         """
-        # 1. Redact Payload
-        safe_payload = self._redact(payload)
+        # 1. Capture payload according to the audit level
+        if audit_level == "BASIC":
+            safe_payload = self._basic_payload(payload)
+        else:
+            safe_payload = self._redact(payload)
         
         entry = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -95,6 +136,10 @@ class JSONLLogger:
             "actor": actor,
             "payload": safe_payload
         }
+        if audit_level is not None:
+            entry["audit_level"] = audit_level
+        if audit_level == "VERBOSE" and result is not None:
+            entry["response_digest"] = self._digest(result)
         
         # 2. Enrich with Token Provenance (FR-004)
         if token_claims:
@@ -119,6 +164,12 @@ class JSONLLogger:
                 import time
                 entry["auth_age_seconds"] = int(time.time()) - token_claims["auth_time"]
         
-        # 3. Append to file
-        with open(self.log_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, cls=JSONDateTimeEncoder) + "\n")
\ No newline at end of file
+        # 3. Hand off to the sink (serialization and I/O happen off the event loop)
+        self._sink.write(entry)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until all events logged so far are written to disk."""
+        return self._sink.flush(timeout)
+
+    def close(self) -> None:
+        self._sink.close()
\ No newline at end of file
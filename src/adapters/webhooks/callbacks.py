@@ -0,0 +1,349 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Set
+from urllib.parse import urlsplit
+import httpx
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-Callback-Signature"
+TIMESTAMP_HEADER = "X-Callback-Timestamp"
+DELIVERY_ID_HEADER = "X-Callback-Id"
+
+# Receiver responses worth retrying; any other non-2xx status is final
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS callback_deliveries (
+    id TEXT PRIMARY KEY,
+    flow_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    body BLOB NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    delivered_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_callback_due ON callback_deliveries (status, next_attempt);
+"""
+
+
+def sign_payload(secret: str, timestamp: str, body: bytes) -> str:
+    """HMAC-SHA256 over `<timestamp>.<body>`, as sent in `X-Callback-Signature`."""
+    digest = hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def verify_signature(
+    secret: str,
+    headers: Mapping[str, str],
+    body: bytes,
+    tolerance_seconds: float = 300.0,
+) -> bool:
+    """Receiver-side check: valid signature and a timestamp within `tolerance_seconds`."""
+    lowered = {name.lower(): value for name, value in headers.items()}
+    timestamp = lowered.get(TIMESTAMP_HEADER.lower())
+    signature = lowered.get(SIGNATURE_HEADER.lower())
+    if not timestamp or not signature:
+        return False
+    try:
+        if abs(time.time() - int(timestamp)) > tolerance_seconds:
+            return False
+    except ValueError:
+        return False
+    return hmac.compare_digest(sign_payload(secret, timestamp, body), signature)
+
+
+def flow_callback_payload(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Callback body for a flow that reached a terminal state."""
+    return {
+        "event": f"flow.{record['status'].lower()}",
+        "flow_id": record["flow_id"],
+        "capability": f"{record['domain']}.{record['flow']}",
+        "status": record["status"],
+        "end_time": record.get("end_time"),
+        "result": record.get("result"),
+        "error": record.get("error"),
+    }
+
+
+class CallbackQueue:
+    """
+    Persistent delivery queue (SQLite, WAL) shared by every worker process.
+
+    Claiming a delivery pushes its `next_attempt` out by a lease, so a worker
+    that dies mid-delivery only delays it; deliveries are at-least-once.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def put(self, flow_id: str, url: str, body: bytes) -> str:
+        delivery_id = str(uuid.uuid4())
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO callback_deliveries (id, flow_id, url, body, status, next_attempt, created_at) "
+                "VALUES (?, ?, ?, ?, 'pending', ?, ?)",
+                (delivery_id, flow_id, url, body, now, now),
+            )
+        return delivery_id
+
+    def claim_due(self, limit: int, lease_seconds: float) -> List[Dict[str, Any]]:
+        """Take up to `limit` due deliveries, hiding them from other workers for `lease_seconds`."""
+        now = time.time()
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT id, flow_id, url, body, attempts FROM callback_deliveries "
+                "WHERE status = 'pending' AND next_attempt <= ? ORDER BY next_attempt LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            if rows:
+                self._conn.executemany(
+                    "UPDATE callback_deliveries SET next_attempt = ? WHERE id = ?",
+                    [(now + lease_seconds, row["id"]) for row in rows],
+                )
+        return [dict(row) for row in rows]
+
+    def next_due(self) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_attempt) FROM callback_deliveries WHERE status = 'pending'"
+            ).fetchone()
+        return row[0]
+
+    def mark_delivered(self, delivery_id: str, attempts: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE callback_deliveries SET status = 'delivered', attempts = ?, delivered_at = ?, last_error = NULL "
+                "WHERE id = ?",
+                (attempts, time.time(), delivery_id),
+            )
+
+    def reschedule(self, delivery_id: str, attempts: int, next_attempt: float, error: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE callback_deliveries SET attempts = ?, next_attempt = ?, last_error = ? WHERE id = ?",
+                (attempts, next_attempt, error, delivery_id),
+            )
+
+    def mark_dead(self, delivery_id: str, attempts: int, error: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE callback_deliveries SET status = 'dead', attempts = ?, last_error = ? WHERE id = ?",
+                (attempts, error, delivery_id),
+            )
+
+    def get(self, delivery_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, flow_id, url, status, attempts, last_error, created_at, delivered_at "
+                "FROM callback_deliveries WHERE id = ?",
+                (delivery_id,),
+            ).fetchone()
+        return dict(row) if row is not None else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CallbackDispatcher:
+    """
+    Delivers signed flow callbacks from a `CallbackQueue`.
+
+    One pooled `httpx.AsyncClient` (keep-alive, no redirects) posts each body
+    with `X-Callback-Id`, `X-Callback-Timestamp` and `X-Callback-Signature`.
+    Transport errors and retryable statuses are retried with exponential
+    backoff and full jitter until `max_attempts`, then the delivery is marked
+    dead. At most `max_per_host` deliveries to one host run at once.
+
+    Loop-bound state (client, dispatch task) is created on first use, like
+    `FlowEngine`.
+    """
+
+    def __init__(
+        self,
+        queue: CallbackQueue,
+        secret: str,
+        max_attempts: int = 8,
+        base_delay: float = 1.0,
+        max_delay: float = 300.0,
+        max_per_host: int = 4,
+        timeout: float = 10.0,
+        max_connections: int = 100,
+        poll_interval: float = 1.0,
+        lease_seconds: float = 60.0,
+    ):
+        self.queue = queue
+        self.secret = secret
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._inflight: Set[asyncio.Task] = set()
+        self._enqueues: Set[asyncio.Task] = set()
+
+    async def enqueue(self, flow_id: str, url: str, payload: Dict[str, Any]) -> str:
+        """Persist a delivery and wake the dispatcher. Returns the delivery ID."""
+        body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode()
+        delivery_id = await asyncio.to_thread(self.queue.put, flow_id, url, body)
+        self.start()
+        self._wake.set()
+        return delivery_id
+
+    def submit(self, flow_id: str, url: str, payload: Dict[str, Any]) -> None:
+        """`enqueue` from synchronous code running on the event loop (flow runner callbacks)."""
+        task = asyncio.get_running_loop().create_task(self.enqueue(flow_id, url, payload))
+        self._enqueues.add(task)
+        task.add_done_callback(self._enqueue_done)
+
+    def start(self) -> None:
+        """Start dispatching on the running loop (idempotent); picks up deliveries left from earlier runs."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._task is not None and not self._task.done():
+            return
+        self._loop = loop
+        self._wake = asyncio.Event()
+        self._host_slots = {}
+        self._inflight = set()
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout),
+            limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+            follow_redirects=False,
+        )
+        self._task = loop.create_task(self._run(), name="callback-dispatcher")
+
+    async def close(self) -> None:
+        tasks = [task for task in (self._task, *self._inflight) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # --- Dispatch loop ---
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            free = self.max_connections - len(self._inflight)
+            claimed: List[Dict[str, Any]] = []
+            if free > 0:
+                try:
+                    claimed = await asyncio.to_thread(self.queue.claim_due, free, self.lease_seconds)
+                except Exception as e:
+                    logger.error(f"Failed to claim callback deliveries: {str(e)}")
+            for delivery in claimed:
+                task = asyncio.get_running_loop().create_task(self._deliver(delivery))
+                self._inflight.add(task)
+                task.add_done_callback(self._delivery_done)
+            if claimed and len(claimed) == free:
+                continue
+
+            delay = self.poll_interval
+            try:
+                next_due = await asyncio.to_thread(self.queue.next_due)
+                if next_due is not None:
+                    delay = min(delay, max(0.0, next_due - time.time()))
+            except Exception as e:
+                logger.error(f"Failed to read the callback queue: {str(e)}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _deliver(self, delivery: Dict[str, Any]) -> None:
+        url, body = delivery["url"], delivery["body"]
+        attempts = delivery["attempts"] + 1
+        async with self._host_slot(urlsplit(url).netloc):
+            timestamp = str(int(time.time()))
+            headers = {
+                "Content-Type": "application/json",
+                DELIVERY_ID_HEADER: delivery["id"],
+                TIMESTAMP_HEADER: timestamp,
+                SIGNATURE_HEADER: sign_payload(self.secret, timestamp, body),
+            }
+            try:
+                response = await self._client.post(url, content=body, headers=headers)
+            except httpx.HTTPError as e:
+                error, retryable = f"{type(e).__name__}: {str(e)}", True
+            else:
+                if response.is_success:
+                    await asyncio.to_thread(self.queue.mark_delivered, delivery["id"], attempts)
+                    return
+                error, retryable = f"HTTP {response.status_code}", response.status_code in RETRYABLE_STATUS_CODES
+
+        if retryable and attempts < self.max_attempts:
+            next_attempt = time.time() + self._retry_delay(attempts)
+            await asyncio.to_thread(self.queue.reschedule, delivery["id"], attempts, next_attempt, error)
+        else:
+            logger.warning(f"Callback for flow {delivery['flow_id']} abandoned after {attempts} attempt(s): {error}")
+            await asyncio.to_thread(self.queue.mark_dead, delivery["id"], attempts, error)
+
+    def _retry_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    def _host_slot(self, host: str) -> asyncio.Semaphore:
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(self.max_per_host)
+            self._host_slots[host] = slot
+        return slot
+
+    def _delivery_done(self, task: asyncio.Task) -> None:
+        self._inflight.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Callback delivery crashed: {str(task.exception())}")
+        if self._wake is not None:
+            self._wake.set()
+
+    def _enqueue_done(self, task: asyncio.Task) -> None:
+        self._enqueues.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Failed to queue flow callback: {str(task.exception())}")
+
+
+_dispatchers: Dict[Path, CallbackDispatcher] = {}
+_dispatchers_lock = threading.Lock()
+
+
+def get_callback_dispatcher(db_path: Path, secret: str, **options: Any) -> CallbackDispatcher:
+    """Return the shared dispatcher for the queue at `db_path`, opening it on first use."""
+    with _dispatchers_lock:
+        dispatcher = _dispatchers.get(db_path)
+        if dispatcher is None:
+            dispatcher = CallbackDispatcher(CallbackQueue(db_path), secret, **options)
+            _dispatchers[db_path] = dispatcher
+        return dispatcher
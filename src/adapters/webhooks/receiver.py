@@ -0,0 +1,136 @@
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from src.adapters.webhooks.callbacks import verify_signature
+
+_REASONS = {200: "OK", 204: "No Content", 400: "Bad Request", 404: "Not Found", 503: "Service Unavailable"}
+
+
+@dataclass
+class ReceivedCallback:
+    path: str
+    headers: Dict[str, str]
+    body: bytes
+    verified: bool
+
+    @property
+    def payload(self) -> Dict[str, Any]:
+        return json.loads(self.body)
+
+
+class CallbackReceiver:
+    """
+    Local stand-in for a client's callback endpoint, for tests and local runs.
+
+    A minimal HTTP/1.1 server (keep-alive, Content-Length bodies) on
+    127.0.0.1 that records every POST and checks its signature when given the
+    `secret`. The first `fail_first` requests get a 503, and each response can
+    be held for `delay` seconds to observe concurrency (`max_concurrent`).
+
+        async with CallbackReceiver(secret) as receiver:
+            ...start a flow with callback_url=receiver.url...
+            [callback] = await receiver.wait_for(1)
+    """
+
+    def __init__(
+        self,
+        secret: Optional[str] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        fail_first: int = 0,
+        status: int = 204,
+        delay: float = 0.0,
+    ):
+        self.secret = secret
+        self.host = host
+        self.port = port
+        self.fail_first = fail_first
+        self.status = status
+        self.delay = delay
+
+        self.requests = 0
+        self.received: List[ReceivedCallback] = []
+        self.max_concurrent = 0
+        self._active = 0
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/callbacks"
+
+    async def start(self) -> "CallbackReceiver":
+        self._changed = asyncio.Event()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "CallbackReceiver":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    async def wait_for(self, count: int, timeout: float = 5.0) -> List[ReceivedCallback]:
+        """Wait until `count` callbacks were accepted (2xx); returns them."""
+        async def poll() -> None:
+            while len(self.received) < count:
+                self._changed.clear()
+                await self._changed.wait()
+        await asyncio.wait_for(poll(), timeout)
+        return self.received[:count]
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: Dict[str, str] = {}
+                while True:
+                    line = (await reader.readline()).decode("latin-1").rstrip("\r\n")
+                    if not line:
+                        break
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                await self._respond(writer, method, path, headers, body)
+                if headers.get("connection", "").lower() == "close":
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            return
+        finally:
+            writer.close()
+
+    async def _respond(
+        self, writer: asyncio.StreamWriter, method: str, path: str, headers: Dict[str, str], body: bytes
+    ) -> None:
+        self.requests += 1
+        self._active += 1
+        self.max_concurrent = max(self.max_concurrent, self._active)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            if method != "POST":
+                status = 404
+            elif self.requests <= self.fail_first:
+                status = 503
+            else:
+                verified = self.secret is not None and verify_signature(self.secret, headers, body)
+                self.received.append(ReceivedCallback(path, headers, body, verified))
+                self._changed.set()
+                status = self.status
+        finally:
+            self._active -= 1
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'Status')}\r\nContent-Length: 0\r\n\r\n".encode("latin-1")
+        )
+        await writer.drain()
@@ -124,7 +124,9 @@ class WorkdaySimulator(ConnectorPort):
                 event_type=action,
                 payload=parameters, # We log the inputs
                 actor=parameters.get("principal_id", "unknown"), # Assuming passed in params or context
-                token_claims=token_claims
+                token_claims=token_claims,
+                audit_level=parameters.get("audit_level"),
+                result=result,
             )
 
             # Cache result if idempotency key provided
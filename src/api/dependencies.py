@@ -13,6 +13,10 @@ from src.adapters.filesystem.policy_loader import FilePolicyLoaderAdapter
 from src.domain.ports.connector import ConnectorPort
 from src.domain.ports.flow_runner import FlowRunnerPort
 from src.adapters.filesystem.local_flow_runner import LocalFlowRunnerAdapter
+from src.adapters.filesystem.flow_store import SQLiteFlowRunnerAdapter, get_flow_store
+from src.adapters.filesystem.flow_archive import get_flow_archive
+from src.domain.services.flow_engine import FlowEngine
+from src.adapters.webhooks.callbacks import CallbackDispatcher, get_callback_dispatcher
 from src.adapters.workday.client import WorkdaySimulator
 from src.adapters.workday.config import WorkdaySimulationConfig
 from src.lib.config_validator import settings
@@ -55,7 +59,50 @@ def get_connector() -> ConnectorPort:
     # Use WorkdaySimulator with default config
     return WorkdaySimulator()
 
+# Flow Callback Dispatcher Dependency
+@lru_cache
+def get_flow_callback_dispatcher() -> CallbackDispatcher:
+    return get_callback_dispatcher(
+        Path(settings.CALLBACK_QUEUE_PATH).resolve(),
+        settings.CALLBACK_SIGNING_SECRET,
+        max_attempts=settings.CALLBACK_MAX_ATTEMPTS,
+        base_delay=settings.CALLBACK_RETRY_BASE_DELAY_SECONDS,
+        max_delay=settings.CALLBACK_RETRY_MAX_DELAY_SECONDS,
+        max_per_host=settings.CALLBACK_MAX_CONCURRENCY_PER_HOST,
+        timeout=settings.CALLBACK_TIMEOUT_SECONDS,
+        max_connections=settings.CALLBACK_MAX_CONNECTIONS,
+    )
+
 # Flow Runner Adapter Dependency
 @lru_cache
 def get_flow_runner_adapter() -> FlowRunnerPort:
-    return LocalFlowRunnerAdapter()
+    engine = FlowEngine(
+        get_connector(),
+        max_workers=settings.FLOW_MAX_WORKERS,
+        domain_concurrency=settings.FLOW_DOMAIN_CONCURRENCY,
+        domain_limits=settings.FLOW_DOMAIN_LIMITS,
+        step_timeout=settings.FLOW_STEP_TIMEOUT_SECONDS,
+        max_queue_depth=settings.FLOW_MAX_QUEUE_DEPTH,
+        principal_quota=settings.FLOW_PRINCIPAL_QUOTA,
+    )
+    # Retention for finished flows (0 disables a limit)
+    retention = {
+        "ttl_seconds": settings.FLOW_RETENTION_TTL_SECONDS or None,
+        "max_finished": settings.FLOW_RETENTION_MAX_FLOWS or None,
+        "archive": get_flow_archive(Path(settings.FLOW_ARCHIVE_PATH).resolve()) if settings.FLOW_ARCHIVE_ENABLED else None,
+        "archive_retention_seconds": settings.FLOW_ARCHIVE_RETENTION_DAYS * 86400 or None,
+    }
+    if settings.FLOW_STORE_BACKEND == "sqlite":
+        store = get_flow_store(
+            Path(settings.FLOW_STORE_PATH).resolve(),
+            flush_interval=settings.FLOW_STORE_FLUSH_INTERVAL_MS / 1000,
+        )
+        return SQLiteFlowRunnerAdapter(
+            store,
+            engine,
+            lease_seconds=settings.FLOW_STORE_LEASE_SECONDS,
+            remote_poll_interval=settings.FLOW_STORE_REMOTE_POLL_SECONDS,
+            callbacks=get_flow_callback_dispatcher(),
+            **retention,
+        )
+    return LocalFlowRunnerAdapter(engine, callbacks=get_flow_callback_dispatcher(), **retention)
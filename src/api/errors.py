@@ -0,0 +1,81 @@
+from typing import Tuple, Union
+from fastapi import HTTPException
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from src.domain.entities.error import ErrorResponse
+from src.domain.exceptions import ConnectorError
+from src.lib.config_validator import settings
+
+# Map HTTP status codes to semantic error codes
+HTTP_STATUS_ERROR_CODES = {
+    401: "UNAUTHORIZED",
+    403: "FORBIDDEN",
+    404: "NOT_FOUND",
+    424: "DEPENDENCY_FAILED",
+    429: "RATE_LIMITED",
+    500: "INTERNAL_SERVER_ERROR",
+    504: "GATEWAY_TIMEOUT"
+}
+
+# Map connector error codes to HTTP status codes
+CONNECTOR_ERROR_STATUS = {
+    "EMPLOYEE_NOT_FOUND": 404,
+    "REQUEST_NOT_FOUND": 404,
+    "STATEMENT_NOT_FOUND": 404,
+    "INSUFFICIENT_BALANCE": 400,
+    "INVALID_DATE_RANGE": 400,
+    "INVALID_APPROVER": 403,
+    "UNAUTHORIZED": 403,
+    "MFA_REQUIRED": 401,
+    "ALREADY_PROCESSED": 409,
+    "CONNECTOR_TIMEOUT": 504,
+    "CONNECTOR_UNAVAILABLE": 503,
+    "RATE_LIMITED": 429
+}
+
+def http_exception_to_error(exc: Union[HTTPException, StarletteHTTPException]) -> Tuple[int, ErrorResponse]:
+    """Build the error envelope for an HTTPException."""
+    error_code = HTTP_STATUS_ERROR_CODES.get(exc.status_code, str(exc.status_code))
+
+    # Sanitize message in production for server errors
+    is_local = settings.ENVIRONMENT == "local"
+    message = exc.detail if isinstance(exc.detail, str) else str(exc.detail)
+
+    if not is_local and exc.status_code >= 500:
+        message = "An internal server error occurred."
+
+    return exc.status_code, ErrorResponse(
+        error_code=error_code,
+        message=message,
+        details={"status_code": exc.status_code} if is_local else None
+    )
+
+def connector_error_to_error(exc: ConnectorError) -> Tuple[int, ErrorResponse]:
+    """Build the error envelope for a connector (e.g. Workday) error."""
+    status_code = CONNECTOR_ERROR_STATUS.get(exc.error_code, 500)
+    is_local = settings.ENVIRONMENT == "local"
+
+    message = exc.message
+    details = exc.details
+
+    # Sanitize in production for server-side connector errors
+    if not is_local and status_code >= 500:
+        message = "A backend connector error occurred."
+        details = None
+
+    return status_code, ErrorResponse(
+        error_code=exc.error_code,
+        message=message,
+        details=details if is_local or status_code < 500 else None,
+        retry_allowed=exc.retry_allowed
+    )
+
+def unexpected_error_to_error(exc: Exception) -> Tuple[int, ErrorResponse]:
+    """Build the error envelope for an unhandled exception without leaking internals."""
+    message = str(exc)
+    if settings.ENVIRONMENT != "local":
+        message = "An unexpected error occurred."
+
+    return 500, ErrorResponse(
+        error_code="INTERNAL_SERVER_ERROR",
+        message=message
+    )
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Dict, Optional
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.domain.entities.error import ErrorResponse
+from src.lib.config_validator import settings
+from src.lib.context import DEADLINE_HEADER, set_request_id
+
+request_logger = logging.getLogger("api.requests")
+
+SECURITY_HEADERS = (
+    ("X-Content-Type-Options", "nosniff"),
+    ("X-Frame-Options", "DENY"),
+    ("Referrer-Policy", "no-referrer"),
+    ("Permissions-Policy", "geolocation=()"),
+)
+HSTS_HEADER = ("Strict-Transport-Security", "max-age=31536000; includeSubDomains")
+
+
+def resolve_request_timeout(headers: Headers) -> float:
+    """
+    Effective timeout for a request: the server limit, shortened by the caller's
+    remaining budget when it propagates one via the deadline header.
+    """
+    timeout = settings.REQUEST_TIMEOUT_SECONDS
+    budget_ms = headers.get(DEADLINE_HEADER)
+    if budget_ms:
+        try:
+            budget = int(budget_ms) / 1000
+        except ValueError:
+            return timeout
+        if budget > 0:
+            timeout = min(timeout, budget)
+    return timeout
+
+
+class RequestContextMiddleware:
+    """
+    Pure ASGI middleware for every HTTP request, in a single pass:
+    request ID, deadline (504 if no response has started in time), security
+    headers and the `api.requests` access log.
+
+    Unlike `@app.middleware("http")` (BaseHTTPMiddleware), it adds no extra task
+    or response stream per layer; headers are added on `http.response.start`.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        headers = Headers(scope=scope)
+        request_id = headers.get("x-request-id") or str(uuid.uuid4())
+        set_request_id(request_id)
+        # Shared with request.state, where authentication stores the principal
+        state = scope.setdefault("state", {})
+
+        timeout = resolve_request_timeout(headers)
+        response: Dict[str, Any] = {"status": None, "content_length": None}
+
+        async with asyncio.timeout(timeout) as deadline:
+            # Loop time by which a response must start, for handlers that wait (long-poll)
+            state["deadline"] = deadline.when()
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    # The deadline covers producing a response, not streaming its body
+                    if not deadline.expired():
+                        deadline.reschedule(None)
+                    response_headers = MutableHeaders(scope=message)
+                    response_headers["X-Request-ID"] = request_id
+                    for name, value in SECURITY_HEADERS:
+                        response_headers[name] = value
+                    if settings.ENVIRONMENT != "local":
+                        response_headers[HSTS_HEADER[0]] = HSTS_HEADER[1]
+                    response["status"] = message["status"]
+                    response["content_length"] = response_headers.get("content-length")
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            except asyncio.CancelledError:
+                if not deadline.expired() or response["status"] is not None:
+                    raise
+            except Exception:
+                self._log(scope, headers, state, 500, None, start)
+                raise
+
+        if deadline.expired() and response["status"] is None:
+            timeout_response = JSONResponse(
+                status_code=504,
+                content=ErrorResponse(
+                    error_code="GATEWAY_TIMEOUT",
+                    message="Request timed out",
+                    details={"timeout_seconds": timeout}
+                ).model_dump(mode='json')
+            )
+            await timeout_response(scope, receive, send_wrapper)
+
+        self._log(scope, headers, state, response["status"], response["content_length"], start)
+
+    @staticmethod
+    def _log(
+        scope: Scope,
+        headers: Headers,
+        state: Dict[str, Any],
+        status_code: Optional[int],
+        content_length: Optional[str],
+        start: float,
+    ) -> None:
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        principal_data = None
+        principal = state.get("principal")
+        if principal is not None:
+            principal_data = {
+                "subject": principal.subject,
+                "principal_type": principal.principal_type.value if hasattr(principal.principal_type, "value") else str(principal.principal_type),
+                "groups": principal.groups
+            }
+
+        method, path = scope["method"], scope["path"]
+        client = scope.get("client")
+        request_logger.info(
+            f"{method} {path} {status_code}",
+            extra={
+                "extra_data": {
+                    "method": method,
+                    "path": path,
+                    "query_params": dict(QueryParams(scope.get("query_string", b""))),
+                    "status_code": status_code,
+                    "latency_ms": round(latency_ms, 2),
+                    "client_ip": client[0] if client else None,
+                    "user_agent": headers.get("user-agent"),
+                    "content_length": content_length,
+                    "principal": principal_data,
+                }
+            }
+        )
@@ -1,7 +1,18 @@
+import asyncio
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Request, Header
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from src.domain.services.action_service import ActionService
-from src.domain.entities.action import ActionRequest, ActionResponse
+from src.domain.entities.action import (
+    ActionRequest,
+    ActionResponse,
+    BatchActionItem,
+    BatchActionRequest,
+    BatchActionResponse,
+    BatchActionResult,
+)
+from src.domain.exceptions import ConnectorError
+from src.api.errors import http_exception_to_error, connector_error_to_error, unexpected_error_to_error
 from src.domain.services.policy_engine import PolicyEngine
 from src.domain.ports.connector import ConnectorPort
 from src.api.dependencies import get_current_principal, get_policy_engine, get_connector
@@ -35,8 +46,58 @@ def get_action_service(
 ) -> ActionService:
     return ActionService(policy_engine, connector)
 
-from fastapi import APIRouter, Depends, Request, Header
-# ... (imports)
+@router.post(
+    "/batch",
+    response_model=BatchActionResponse,
+    responses={
+        401: {"model": ErrorResponse},
+        422: {"model": ErrorResponse}
+    }
+)
+async def execute_batch(
+    request: BatchActionRequest,
+    req: Request,
+    service: ActionService = Depends(get_action_service),
+    principal: VerifiedPrincipal = Depends(get_current_principal),
+    x_acting_through: Optional[str] = Header(None, alias="X-Acting-Through")
+):
+    """
+    Execute several actions for one principal in a single round trip.
+    Each item is authorized and executed independently; failures are reported
+    per item with the status code and error envelope of the equivalent single call.
+    """
+    environment = settings.ENVIRONMENT
+    request_ip = req.client.host if req.client else None
+
+    async def run(item: BatchActionItem) -> BatchActionResult:
+        try:
+            response = await service.execute_action(
+                domain=item.domain,
+                action=item.action,
+                parameters=item.parameters,
+                principal_id=principal.subject,
+                principal_groups=principal.groups,
+                principal_type=principal.principal_type.value,
+                environment=environment,
+                mfa_verified=principal.mfa_verified,
+                token_issued_at=principal.issued_at,
+                token_expires_at=principal.expires_at,
+                request_ip=request_ip,
+                token_claims=principal.raw_claims,
+                acting_through=x_acting_through
+            )
+            return BatchActionResult(status_code=200, body=response.model_dump(mode='json'))
+        except (HTTPException, StarletteHTTPException) as e:
+            status_code, error = http_exception_to_error(e)
+        except ConnectorError as e:
+            status_code, error = connector_error_to_error(e)
+        except Exception as e:
+            status_code, error = unexpected_error_to_error(e)
+        return BatchActionResult(status_code=status_code, body=error.model_dump(mode='json'))
+
+    results = await asyncio.gather(*(run(item) for item in request.requests))
+    return BatchActionResponse(results=list(results))
+
 @router.post(
     "/{domain}/{action}",
     response_model=ActionResponse,
@@ -1,9 +1,13 @@
-import json
-import os
+import asyncio
+from datetime import datetime, timezone
 from pathlib import Path
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from src.api.dependencies import get_current_principal
 from src.adapters.auth import VerifiedPrincipal
+from src.adapters.filesystem.audit_index import decode_cursor, get_audit_index
+from src.adapters.filesystem.audit_reader import tail_events
+from src.lib.config_validator import settings
 
 router = APIRouter(prefix="/audit", tags=["audit"])
 
@@ -12,9 +16,13 @@ DEFAULT_LOG_PATH = Path("logs/audit.jsonl")
 
 @router.get("/recent")
 async def get_recent_audit_logs(
-    limit: int = 20, principal: VerifiedPrincipal = Depends(get_current_principal)
+    limit: int = Query(20, ge=1, le=1000),
+    before: Optional[int] = Query(None, ge=0, description="Cursor from a previous page's next_before"),
+    event_type: Optional[str] = None,
+    actor: Optional[str] = None,
+    principal: VerifiedPrincipal = Depends(get_current_principal),
 ):
-    """View recent audit events (admin only)"""
+    """View recent audit events (admin only), newest page first"""
     if not principal.has_group("hr-platform-admins"):
         raise HTTPException(status_code=403, detail="Admin access required")
 
@@ -22,22 +30,82 @@ async def get_recent_audit_logs(
         return {
             "count": 0,
             "events": [],
+            "next_before": None,
             "note": "Log file not found",
         }
 
-    # Read last N lines from audit.jsonl
-    logs = []
+    # Seek backwards from the end of the file; only the blocks needed are read
     try:
-        with open(DEFAULT_LOG_PATH, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-            for line in lines[-limit:]:
-                if line.strip():
-                    logs.append(json.loads(line))
+        logs, next_before = await asyncio.to_thread(
+            tail_events, DEFAULT_LOG_PATH, limit, before, event_type, actor
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading logs: {str(e)}")
 
     return {
         "count": len(logs),
         "events": logs,
+        "next_before": next_before,
+        "note": "PII automatically redacted in logs",
+    }
+
+
+def _epoch(value: Optional[datetime]) -> Optional[float]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+@router.get("/search")
+async def search_audit_logs(
+    actor: Optional[str] = None,
+    event_type: Optional[str] = None,
+    employee_id: Optional[str] = None,
+    token_id: Optional[str] = None,
+    start: Optional[datetime] = Query(None, description="Inclusive lower bound (naive values are UTC)"),
+    end: Optional[datetime] = Query(None, description="Inclusive upper bound (naive values are UTC)"),
+    limit: int = Query(50, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    principal: VerifiedPrincipal = Depends(get_current_principal),
+):
+    """Search indexed audit events across the active log and rotated segments (admin only)"""
+    if not principal.has_group("hr-platform-admins"):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    if not settings.AUDIT_INDEX_ENABLED:
+        raise HTTPException(status_code=404, detail="Audit index is disabled")
+
+    if cursor is not None:
+        try:
+            decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    index = get_audit_index(Path(settings.AUDIT_INDEX_PATH).resolve())
+
+    def run_search():
+        # First search after startup indexes whatever was logged before the index existed
+        index.ensure_built(Path(settings.AUDIT_LOG_PATH).resolve())
+        return index.search(
+            actor=actor,
+            event_type=event_type,
+            employee_id=employee_id,
+            token_id=token_id,
+            start=_epoch(start),
+            end=_epoch(end),
+            limit=limit,
+            cursor=cursor,
+        )
+
+    try:
+        events, next_cursor = await asyncio.to_thread(run_search)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching logs: {str(e)}")
+
+    return {
+        "count": len(events),
+        "events": events,
+        "next_cursor": next_cursor,
         "note": "PII automatically redacted in logs",
     }
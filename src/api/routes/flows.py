@@ -1,6 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+import asyncio
+import json
+import re
+from datetime import datetime, timezone
+from typing import AsyncIterator, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from src.domain.services.flow_service import FlowService
-from src.domain.entities.flow import FlowStartRequest, FlowStatusResponse
+from src.domain.entities.flow import FlowListResponse, FlowStartRequest, FlowStatusResponse
 from src.domain.services.policy_engine import PolicyEngine
 from src.domain.ports.flow_runner import FlowRunnerPort
 from src.api.dependencies import get_current_principal, get_policy_engine, get_flow_runner_adapter
@@ -10,11 +16,23 @@ from src.lib.config_validator import settings
 
 router = APIRouter(prefix="/flows", tags=["flows"])
 
+_WAIT_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)(ms|s)?$")
+# A long-poll answers this long before the request deadline, so it never ends in a 504
+_DEADLINE_MARGIN_SECONDS = 0.5
+
+def parse_wait(value: str) -> float:
+    """Parse a long-poll duration: `30s`, `500ms` or plain seconds."""
+    match = _WAIT_PATTERN.match(value.strip())
+    if match is None:
+        raise HTTPException(status_code=400, detail="Invalid wait duration (use e.g. 30s or 500ms)")
+    amount = float(match.group(1))
+    return amount / 1000 if match.group(2) == "ms" else amount
+
 def get_flow_service(
     policy_engine: PolicyEngine = Depends(get_policy_engine),
     adapter: FlowRunnerPort = Depends(get_flow_runner_adapter)
 ) -> FlowService:
-    return FlowService(policy_engine, adapter)
+    return FlowService(policy_engine, adapter, callback_allowed_hosts=settings.CALLBACK_ALLOWED_HOSTS)
 
 @router.post(
     "/{domain}/{flow}",
@@ -48,7 +66,8 @@ async def start_flow(
             mfa_verified=principal.mfa_verified,
             token_issued_at=principal.issued_at,
             token_expires_at=principal.expires_at,
-            request_ip=request_ip
+            request_ip=request_ip,
+            callback_url=str(request.callback_url) if request.callback_url else None,
         )
         return {"flow_id": flow_id, "status": "RUNNING"}
     except HTTPException:
@@ -56,14 +75,90 @@ async def start_flow(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("", response_model=FlowListResponse, responses={400: {"model": ErrorResponse}})
+async def list_flows(
+    status: Optional[Literal["RUNNING", "COMPLETED", "FAILED"]] = None,
+    since: Optional[datetime] = Query(None, description="Only flows started at or after this time (naive values are UTC)"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    service: FlowService = Depends(get_flow_service),
+    principal: VerifiedPrincipal = Depends(get_current_principal)
+):
+    """List the flows the caller started, newest first"""
+    if since is not None:
+        since = since if since.tzinfo is not None else since.replace(tzinfo=timezone.utc)
+    return await service.list_flows(
+        principal_id=principal.subject,
+        status=status,
+        # Same format as the stored start_time, so the bound compares as a string
+        since=since.astimezone(timezone.utc).isoformat(timespec="microseconds") if since else None,
+        limit=limit,
+        cursor=cursor,
+    )
+
 @router.get("/{flow_id}", response_model=FlowStatusResponse)
 async def get_flow_status(
     flow_id: str,
+    req: Request,
+    wait: Optional[str] = Query(None, description="Long-poll: respond once the status changes, or after this long (e.g. 30s)"),
     service: FlowService = Depends(get_flow_service),
     principal: VerifiedPrincipal = Depends(get_current_principal)
 ):
-    return await service.get_status(
+    if wait is None:
+        return await service.get_status(
+            flow_id=flow_id,
+            principal_id=principal.subject,
+            principal_groups=principal.groups,
+        )
+
+    timeout = min(parse_wait(wait), settings.FLOW_LONG_POLL_MAX_SECONDS)
+    deadline = getattr(req.state, "deadline", None)
+    if deadline is not None:
+        timeout = min(timeout, deadline - asyncio.get_running_loop().time() - _DEADLINE_MARGIN_SECONDS)
+    return await service.wait_for_status(
         flow_id=flow_id,
         principal_id=principal.subject,
         principal_groups=principal.groups,
+        wait=max(timeout, 0.0),
+    )
+
+@router.get(
+    "/{flow_id}/events",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"text/event-stream": {}}, "description": "`status` events until the flow finishes"},
+        403: {"model": ErrorResponse},
+    }
+)
+async def stream_flow_events(
+    flow_id: str,
+    service: FlowService = Depends(get_flow_service),
+    principal: VerifiedPrincipal = Depends(get_current_principal)
+):
+    """Server-sent events: the flow's status now and on every change; the stream closes once it finishes."""
+    statuses = service.watch_status(
+        flow_id=flow_id,
+        principal_id=principal.subject,
+        principal_groups=principal.groups,
+        keepalive=settings.FLOW_EVENTS_KEEPALIVE_SECONDS,
+    )
+    # Read the first status before responding, so a denied or unknown flow is still a 403
+    first = await anext(statuses)
+
+    async def events() -> AsyncIterator[str]:
+        status = first
+        while True:
+            if status is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: status\ndata: {json.dumps(status.model_dump(mode='json'))}\n\n"
+            try:
+                status = await anext(statuses)
+            except StopAsyncIteration:
+                return
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
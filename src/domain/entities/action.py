@@ -55,3 +55,32 @@ class ActionResponse(BaseModel):
         description="The actual result payload of the action"
     )
     meta: ProvenanceWrapper = Field(description="Execution metadata and audit trail")
+
+
+class BatchActionItem(BaseModel):
+    domain: str = Field(description="Capability domain (e.g. workday.hcm)")
+    action: str = Field(description="Action name within the domain")
+    parameters: Dict[str, Any] = Field(
+        default_factory=dict, description="Key-value pairs of parameters for the action"
+    )
+
+
+class BatchActionRequest(BaseModel):
+    requests: List[BatchActionItem] = Field(
+        min_length=1,
+        max_length=50,
+        description="Actions to execute for the same principal in one round trip",
+    )
+
+
+class BatchActionResult(BaseModel):
+    status_code: int = Field(description="HTTP status the action would have returned on its own")
+    body: Dict[str, Any] = Field(
+        description="ActionResponse on success, ErrorResponse otherwise"
+    )
+
+
+class BatchActionResponse(BaseModel):
+    results: List[BatchActionResult] = Field(
+        description="One result per request, in request order"
+    )
@@ -22,6 +22,8 @@ class CapabilityEntry(BaseModel):
     tags: List[str] = Field(default=[], description="Classification tags")
     description: Optional[str] = Field(None, description="Detailed description")
     deprecated: bool = Field(default=False, description="Whether capability is deprecated")
+    steps: List[str] = Field(default=[], description="Flow only: action capability IDs executed in order")
+    priority: int = Field(default=0, description="Flow only: scheduling priority; queued flows with a higher priority start first")
 
 class CapabilityRegistryMetadata(BaseModel):
     last_updated: str
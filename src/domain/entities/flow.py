@@ -1,4 +1,4 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from pydantic import BaseModel, HttpUrl, Field
 
@@ -8,8 +8,14 @@ class FlowStartRequest(BaseModel):
 
 class FlowStatusResponse(BaseModel):
     flow_id: str = Field(description="Unique identifier for the long-running process")
+    capability: Optional[str] = Field(default=None, description="Flow capability ID (e.g., hr.onboarding)")
     status: str = Field(description="Current state of the flow (e.g., RUNNING, COMPLETED, FAILED)")
     start_time: Optional[datetime] = Field(default=None, description="When the flow was initially triggered")
     current_step: Optional[str] = Field(default=None, description="The name of the currently active workflow step")
     result: Optional[Dict[str, Any]] = Field(default=None, description="Final output data if the flow is COMPLETED")
     error: Optional[str] = Field(default=None, description="Error message if the flow FAILED")
+
+class FlowListResponse(BaseModel):
+    flows: List[FlowStatusResponse] = Field(description="The caller's flows, newest first")
+    count: int = Field(description="Number of flows in this page")
+    next_cursor: Optional[str] = Field(default=None, description="Pass as `cursor` to fetch the next page; absent on the last page")
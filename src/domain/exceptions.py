@@ -6,3 +6,12 @@ class ConnectorError(Exception):
         self.error_code = error_code
         self.details = details
         self.retry_allowed = retry_allowed
+
+
+class FlowAdmissionError(Exception):
+    """Raised when the flow scheduler refuses a new flow (queue full or principal over quota)."""
+    def __init__(self, message: str, retry_after: int, reason: str):
+        super().__init__(message)
+        self.message = message
+        self.retry_after = retry_after
+        self.reason = reason
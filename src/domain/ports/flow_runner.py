@@ -1,5 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 class FlowRunnerPort(ABC):
     @abstractmethod
@@ -9,11 +10,47 @@ class FlowRunnerPort(ABC):
         flow: str,
         params: Dict[str, Any],
         principal_id: str,
+        context: Optional[Dict[str, Any]] = None,
+        callback_url: Optional[str] = None,
     ) -> str:
-        """Starts a flow execution and returns the Execution ID."""
+        """
+        Starts a flow execution and returns the Execution ID.
+
+        `context` carries the starting principal's type, groups, MFA state and
+        audit level, which the flow's steps pass on to the connector.
+        `callback_url` is notified once the flow completes or fails.
+        """
         pass
 
     @abstractmethod
     async def get_flow_status(self, flow_id: str) -> Optional[Dict[str, Any]]:
         """Returns the raw status dictionary of the flow execution."""
         pass
+
+    async def list_flows(
+        self,
+        principal_id: str,
+        status: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One page of the flows started by `principal_id`, newest first, with the
+        cursor for the next page (None on the last). `since` is an ISO-8601 UTC
+        lower bound on start_time. Raises ValueError for a malformed cursor.
+        """
+        raise NotImplementedError("This flow runner cannot list flows")
+
+    def change_version(self, flow_id: str) -> int:
+        """Change counter for a flow; pass it to `wait_for_change` after reading the status."""
+        return 0
+
+    async def wait_for_change(self, flow_id: str, version: int, timeout: float) -> bool:
+        """
+        Wait until the flow may have changed since `version` was read, or `timeout`
+        seconds pass (returns False). Runners without change notifications just
+        wait out the timeout, so callers re-read the status on either outcome.
+        """
+        await asyncio.sleep(timeout)
+        return False
@@ -137,7 +137,8 @@ class ActionService:
                 "principal_type": principal_type,
                 "mfa_verified": mfa_verified,
                 "idempotency_key": idempotency_key,
-                "token_claims": token_claims # Pass token metadata to connector for logging
+                "token_claims": token_claims, # Pass token metadata to connector for logging
+                "audit_level": evaluation.audit_level, # Policy-driven audit capture (BASIC/VERBOSE)
             }
 
             # For MVP, we route everything to the single injected connector
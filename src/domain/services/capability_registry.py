@@ -43,6 +43,13 @@ class CapabilityRegistryService:
             if cap.id in self._capability_map:
                 raise ValueError(f"Duplicate capability IDs found in registry: {cap.id}")
             self._capability_map[cap.id] = cap
+
+        # Flow steps must be registered actions
+        for cap in self._registry.capabilities:
+            for step in cap.steps:
+                step_entry = self._capability_map.get(step)
+                if step_entry is None or step_entry.type != CapabilityType.ACTION:
+                    raise ValueError(f"Flow {cap.id} has step {step} which is not a registered action")
             
         logger.info(f"Capability registry loaded with {len(self._capability_map)} entries from {self.index_path}")
 
@@ -0,0 +1,216 @@
+import asyncio
+import itertools
+import logging
+import math
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+from src.domain.entities.capability import CapabilityType
+from src.domain.exceptions import FlowAdmissionError
+from src.domain.ports.connector import ConnectorPort
+from src.domain.services.capability_registry import CapabilityRegistryService, get_capability_registry
+
+logger = logging.getLogger(__name__)
+
+# Receives (flow_id, changed fields) whenever a flow makes progress
+FlowUpdate = Callable[[str, Dict[str, Any]], None]
+
+
+class FlowEngine:
+    """
+    Executes flows as asyncio tasks on the API's event loop.
+
+    A flow is the ordered list of action capabilities in its registry entry
+    (`steps`), each executed through the connector with the flow parameters and
+    the starting principal's context. At most `max_workers` flows run at once;
+    the rest wait in a priority queue (registry `priority`, then arrival order).
+    Steps against the same capability domain (e.g. `workday.hcm`) share a
+    concurrency limit, and every step has a timeout.
+
+    Admission control (`admit`): a new flow is refused with a Retry-After hint
+    once `max_queue_depth` flows are waiting, or when its principal already has
+    `principal_quota` flows queued or running (0 disables either limit).
+    """
+
+    def __init__(
+        self,
+        connector: ConnectorPort,
+        registry: Optional[CapabilityRegistryService] = None,
+        max_workers: int = 32,
+        domain_concurrency: int = 8,
+        domain_limits: Optional[Dict[str, int]] = None,
+        step_timeout: float = 30.0,
+        max_queue_depth: int = 0,
+        principal_quota: int = 0,
+    ):
+        self.connector = connector
+        self.registry = registry or get_capability_registry()
+        self.max_workers = max_workers
+        self.domain_concurrency = domain_concurrency
+        self.domain_limits = domain_limits or {}
+        self.step_timeout = step_timeout
+        self.max_queue_depth = max_queue_depth
+        self.principal_quota = principal_quota
+
+        # Flows queued or running per principal (admission quota)
+        self._principal_load: Dict[str, int] = {}
+        # Moving average of flow run time, for Retry-After estimates
+        self._avg_run_seconds = 1.0
+        self._sequence = itertools.count()
+
+        # Loop-bound state, created on first submit (and again if the loop changes)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: List[asyncio.Task] = []
+        self._domain_slots: Dict[str, asyncio.Semaphore] = {}
+
+    def steps_for(self, domain: str, flow: str) -> Optional[List[str]]:
+        """Step capability IDs for a flow, or None if it is not a registered flow."""
+        entry = self.registry.get(f"{domain}.{flow}")
+        if entry is None or entry.type != CapabilityType.FLOW:
+            return None
+        return list(entry.steps)
+
+    def priority_for(self, domain: str, flow: str) -> int:
+        entry = self.registry.get(f"{domain}.{flow}")
+        return entry.priority if entry is not None else 0
+
+    def admit(self, principal_id: str) -> None:
+        """
+        Reserve a slot for a new flow of `principal_id`, or raise
+        `FlowAdmissionError`. Pass `admitted=True` to the matching `submit`, or
+        `release` the slot if the flow is never submitted.
+        """
+        self._ensure_workers()
+        if self.max_queue_depth and self.pending >= self.max_queue_depth:
+            retry_after = self._avg_run_seconds * (self.pending + 1) / self.max_workers
+            raise FlowAdmissionError("Flow queue is full", _retry_after(retry_after), "queue_full")
+        if self.principal_quota and self._principal_load.get(principal_id, 0) >= self.principal_quota:
+            raise FlowAdmissionError(
+                f"Too many active flows for {principal_id}", _retry_after(self._avg_run_seconds), "principal_quota"
+            )
+        self._principal_load[principal_id] = self._principal_load.get(principal_id, 0) + 1
+
+    def release(self, principal_id: str) -> None:
+        load = self._principal_load.get(principal_id, 0) - 1
+        if load > 0:
+            self._principal_load[principal_id] = load
+        else:
+            self._principal_load.pop(principal_id, None)
+
+    async def submit(
+        self, flow_id: str, execution: Dict[str, Any], update: FlowUpdate, admitted: bool = False
+    ) -> None:
+        """
+        Queue a flow; `update` is called with each status change.
+
+        `execution` holds domain, flow, params, principal_id, context and, when
+        resuming, `completed_steps` (step ID -> result) to skip. Flows that did
+        not go through `admit` (e.g. recovered ones) still count toward quotas.
+        """
+        self._ensure_workers()
+        if not admitted:
+            self._principal_load[execution["principal_id"]] = self._principal_load.get(execution["principal_id"], 0) + 1
+        priority = self.priority_for(execution["domain"], execution["flow"])
+        await self._queue.put((-priority, next(self._sequence), flow_id, execution, update))
+
+    @property
+    def pending(self) -> int:
+        """Flows waiting for a worker."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def shutdown(self) -> None:
+        """Cancel the workers; flows still running are abandoned."""
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._loop = None
+
+    # --- Workers ---
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.PriorityQueue()
+        self._domain_slots = {}
+        # Flows of a previous loop are gone with it
+        self._principal_load = {}
+        self._workers = [
+            loop.create_task(self._worker(), name=f"flow-worker-{i}") for i in range(self.max_workers)
+        ]
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, flow_id, execution, update = await self._queue.get()
+            started = time.monotonic()
+            try:
+                await self._run(flow_id, execution, update)
+            except Exception as e:
+                logger.error(f"Flow {flow_id} crashed: {str(e)}")
+                update(flow_id, {"status": "FAILED", "error": "Internal flow engine error", "end_time": _now()})
+            finally:
+                self._avg_run_seconds += 0.2 * (time.monotonic() - started - self._avg_run_seconds)
+                self.release(execution["principal_id"])
+                self._queue.task_done()
+
+    async def _run(self, flow_id: str, execution: Dict[str, Any], update: FlowUpdate) -> None:
+        capability = f"{execution['domain']}.{execution['flow']}"
+        steps = self.steps_for(execution["domain"], execution["flow"])
+        if not steps:
+            update(flow_id, {"status": "FAILED", "error": f"No steps defined for flow {capability}", "end_time": _now()})
+            return
+
+        # Steps see the flow parameters plus the starting principal, for adapter-level enforcement
+        parameters = {
+            **execution.get("params", {}),
+            **execution.get("context", {}),
+            "principal_id": execution["principal_id"],
+            "flow_id": flow_id,
+        }
+
+        # A resumed flow skips the steps its journal already records as completed
+        results: Dict[str, Any] = dict(execution.get("completed_steps") or {})
+        for step in steps:
+            if step in results:
+                continue
+            update(flow_id, {"current_step": step})
+            try:
+                results[step] = await self._run_step(step, parameters)
+            except asyncio.TimeoutError:
+                error = f"Step {step} timed out after {self.step_timeout}s"
+            except Exception as e:
+                error = f"Step {step} failed: {str(e)}"
+            else:
+                update(flow_id, {"result": {"steps": dict(results)}})
+                continue
+
+            logger.warning(f"Flow {capability} ({flow_id}) failed: {error}")
+            update(flow_id, {"status": "FAILED", "error": error, "end_time": _now()})
+            return
+
+        update(flow_id, {"status": "COMPLETED", "current_step": None, "end_time": _now()})
+
+    async def _run_step(self, step: str, parameters: Dict[str, Any]) -> Any:
+        domain, action = step.rsplit(".", 1)
+        async with self._domain_slot(domain):
+            # The timeout starts once the domain slot is held
+            return await asyncio.wait_for(self.connector.execute(action, parameters), timeout=self.step_timeout)
+
+    def _domain_slot(self, domain: str) -> asyncio.Semaphore:
+        slot = self._domain_slots.get(domain)
+        if slot is None:
+            slot = asyncio.Semaphore(self.domain_limits.get(domain, self.domain_concurrency))
+            self._domain_slots[domain] = slot
+        return slot
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _retry_after(seconds: float) -> int:
+    """Whole seconds for a Retry-After header, between 1 and 60."""
+    return max(1, min(60, math.ceil(seconds)))
@@ -0,0 +1,50 @@
+import asyncio
+from collections import OrderedDict
+from typing import Dict, List
+
+
+class FlowNotifier:
+    """
+    In-process change notifications for flows, used by flow runners so status
+    watchers (long-poll, SSE) wake on progress instead of polling.
+
+    Each flow has a change counter; a watcher reads `version()`, then the flow
+    status, then `wait()`s on that version, so a change in between is never
+    missed. Counters are kept for the most recent `max_flows` flows; an evicted
+    counter only causes a spurious wake-up.
+    """
+
+    def __init__(self, max_flows: int = 10000):
+        self.max_flows = max_flows
+        self._versions: "OrderedDict[str, int]" = OrderedDict()
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+
+    def version(self, flow_id: str) -> int:
+        return self._versions.get(flow_id, 0)
+
+    def notify(self, flow_id: str) -> None:
+        """Record a change and wake every watcher of the flow. Call on the event loop."""
+        self._versions[flow_id] = self._versions.pop(flow_id, 0) + 1
+        if len(self._versions) > self.max_flows:
+            self._versions.popitem(last=False)
+        for waiter in self._waiters.pop(flow_id, []):
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def wait(self, flow_id: str, version: int, timeout: float) -> bool:
+        """Wait until the flow changes after `version`; False if `timeout` elapsed first."""
+        if self.version(flow_id) != version:
+            return True
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(flow_id, []).append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            waiters = self._waiters.get(flow_id)
+            if waiters is not None and waiter in waiters:
+                waiters.remove(waiter)
+                if not waiters:
+                    del self._waiters[flow_id]
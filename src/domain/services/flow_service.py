@@ -1,17 +1,29 @@
-from typing import Dict, Any, List, Optional
+import asyncio
+from urllib.parse import urlsplit
+from typing import AsyncIterator, Dict, Any, List, Optional
 from fastapi import HTTPException
+from src.domain.exceptions import FlowAdmissionError
 from src.domain.ports.flow_runner import FlowRunnerPort
 from src.domain.services.policy_engine import PolicyEngine
-from src.domain.entities.flow import FlowStatusResponse
+from src.domain.entities.flow import FlowListResponse, FlowStatusResponse
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+TERMINAL_STATUSES = {"COMPLETED", "FAILED"}
+
 class FlowService:
-    def __init__(self, policy_engine: PolicyEngine, adapter: FlowRunnerPort):
+    def __init__(
+        self,
+        policy_engine: PolicyEngine,
+        adapter: FlowRunnerPort,
+        callback_allowed_hosts: Optional[List[str]] = None,
+    ):
         self.policy_engine = policy_engine
         self.adapter = adapter
+        # Hosts a callback_url may target; empty or None allows any
+        self.callback_allowed_hosts = {host.lower() for host in callback_allowed_hosts or []}
 
     async def start_flow(
         self,
@@ -26,7 +38,8 @@ class FlowService:
         mfa_verified: bool = False,
         token_issued_at: Optional[int] = None,
         token_expires_at: Optional[int] = None,
-        request_ip: Optional[str] = None
+        request_ip: Optional[str] = None,
+        callback_url: Optional[str] = None,
     ) -> str:
         capability = f"{domain}.{flow}"
 
@@ -47,8 +60,26 @@ class FlowService:
             logger.warning(f"Access denied to flow {capability} for principal {principal_id}")
             raise HTTPException(status_code=403, detail=f"Access denied to flow: {capability}")
 
-        # 2. Start Flow via Adapter
-        return await self.adapter.start_flow(domain, flow, params, principal_id)
+        if callback_url is not None and self.callback_allowed_hosts:
+            host = (urlsplit(callback_url).hostname or "").lower()
+            if host not in self.callback_allowed_hosts:
+                logger.warning(f"Rejected callback host {host} for flow {capability} from principal {principal_id}")
+                raise HTTPException(status_code=400, detail=f"callback_url host is not allowed: {host}")
+
+        # 2. Start Flow via Adapter (steps run with the starting principal's context)
+        context = {
+            "principal_type": principal_type,
+            "principal_groups": principal_groups,
+            "mfa_verified": mfa_verified,
+            "audit_level": evaluation.audit_level,
+        }
+        try:
+            return await self.adapter.start_flow(
+                domain, flow, params, principal_id, context=context, callback_url=callback_url
+            )
+        except FlowAdmissionError as e:
+            logger.warning(f"Flow {capability} for principal {principal_id} not admitted ({e.reason})")
+            raise HTTPException(status_code=429, detail=e.message, headers={"Retry-After": str(e.retry_after)})
 
     async def get_status(
         self,
@@ -74,12 +105,91 @@ class FlowService:
             logger.warning(f"Access denied to flow {flow_id} (owned by {owner_id}) for principal {principal_id}")
             raise HTTPException(status_code=403, detail="Flow access denied")
         
-        # Convert raw dict to Pydantic model
-        return FlowStatusResponse(
-            flow_id=raw_status["flow_id"],
-            status=raw_status["status"],
-            start_time=raw_status.get("start_time"),
-            current_step=raw_status.get("current_step"),
-            result=raw_status.get("result"),
-            error=raw_status.get("error")
-        )
+        return _to_response(raw_status)
+
+    async def list_flows(
+        self,
+        principal_id: str,
+        status: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> FlowListResponse:
+        """The caller's own flows, newest first (admins too: this is not a search over all flows)."""
+        try:
+            records, next_cursor = await self.adapter.list_flows(
+                principal_id, status=status, since=since, limit=limit, cursor=cursor
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        flows = [_to_response(record) for record in records]
+        return FlowListResponse(flows=flows, count=len(flows), next_cursor=next_cursor)
+
+    async def wait_for_status(
+        self,
+        flow_id: str,
+        principal_id: str,
+        principal_groups: List[str],
+        wait: float,
+    ) -> FlowStatusResponse:
+        """
+        Long-poll: return as soon as the flow's status differs from the one seen
+        on entry (or is already terminal), else the unchanged status after `wait`.
+        """
+        current: Optional[FlowStatusResponse] = None
+        try:
+            async with asyncio.timeout(wait):
+                async for status in self.watch_status(flow_id, principal_id, principal_groups, keepalive=wait):
+                    if status is None:
+                        continue
+                    if current is not None or status.status in TERMINAL_STATUSES:
+                        return status
+                    current = status
+        except TimeoutError:
+            pass
+        return current or await self.get_status(flow_id, principal_id, principal_groups)
+
+    async def watch_status(
+        self,
+        flow_id: str,
+        principal_id: str,
+        principal_groups: List[str],
+        keepalive: float = 15.0,
+    ) -> AsyncIterator[Optional[FlowStatusResponse]]:
+        """
+        Yield the flow's status now and after every change, ending with its
+        terminal state. Yields None after `keepalive` seconds without a change.
+
+        Woken by the runner's change notifications; access is checked on every read.
+        """
+        loop = asyncio.get_running_loop()
+        last: Optional[FlowStatusResponse] = None
+        last_yield = loop.time()
+        while True:
+            version = self.adapter.change_version(flow_id)
+            status = await self.get_status(flow_id, principal_id, principal_groups)
+            if status != last:
+                yield status
+                last, last_yield = status, loop.time()
+                if status.status in TERMINAL_STATUSES:
+                    return
+            idle = keepalive - (loop.time() - last_yield)
+            if idle <= 0:
+                yield None
+                last_yield = loop.time()
+                continue
+            await self.adapter.wait_for_change(flow_id, version, idle)
+
+
+def _to_response(raw_status: Dict[str, Any]) -> FlowStatusResponse:
+    """Convert a runner's raw flow record to the API model."""
+    domain, flow = raw_status.get("domain"), raw_status.get("flow")
+    return FlowStatusResponse(
+        flow_id=raw_status["flow_id"],
+        capability=f"{domain}.{flow}" if domain and flow else None,
+        status=raw_status["status"],
+        start_time=raw_status.get("start_time"),
+        current_step=raw_status.get("current_step"),
+        result=raw_status.get("result"),
+        error=raw_status.get("error")
+    )
@@ -1,7 +1,7 @@
 from pydantic import Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, List, Literal, Optional
 import os
 
 if TYPE_CHECKING:
@@ -17,8 +17,54 @@ class AppSettings(BaseSettings):
     POLICY_PATH: str = Field(default="config/policy-workday.yaml", description="Path to the policy YAML file")
     CAPABILITY_REGISTRY_PATH: str = Field(default="config/capabilities/index.yaml", description="Path to the capability registry")
     AUDIT_LOG_PATH: str = Field(default="logs/audit.jsonl", description="Path to the audit log file")
+    AUDIT_SINK_BACKEND: Literal["jsonl", "rotating", "socket"] = Field(default="rotating", description="Audit destination: plain JSONL file, rotating JSONL file, or a local socket collector")
+    AUDIT_SINK_SOCKET_ADDRESS: Optional[str] = Field(default=None, description="Collector address for the socket audit backend (unix:///path or tcp://host:port)")
+    AUDIT_LOG_BUFFERED: bool = Field(default=True, description="Write audit events from a background thread instead of the request path")
+    AUDIT_LOG_FLUSH_INTERVAL_MS: int = Field(default=200, description="Maximum time buffered audit events wait before being written")
+    AUDIT_LOG_BATCH_SIZE: int = Field(default=256, description="Maximum audit events written per batch")
+    AUDIT_LOG_FSYNC: bool = Field(default=False, description="fsync the audit file after every batch (durability over throughput)")
+    AUDIT_LOG_QUEUE_SIZE: int = Field(default=10000, description="Buffered audit events allowed before writers apply back-pressure")
+    AUDIT_LOG_ROTATE_MAX_BYTES: int = Field(default=100 * 1024 * 1024, description="Rotate the audit file once it reaches this size (0 disables)")
+    AUDIT_LOG_ROTATE_INTERVAL_SECONDS: int = Field(default=86400, description="Rotate the audit file after this many seconds (0 disables)")
+    AUDIT_LOG_COMPRESSION: Literal["gzip", "zstd", "none"] = Field(default="gzip", description="Compression for closed audit segments (zstd needs the 'zstandard' package)")
+    AUDIT_LOG_RETENTION_DAYS: int = Field(default=0, description="Delete closed audit segments older than this many days (0 keeps them)")
+    AUDIT_LOG_RETENTION_SEGMENTS: int = Field(default=0, description="Keep at most this many closed audit segments (0 keeps them)")
+    AUDIT_LOG_HASH_CHAIN: bool = Field(default=True, description="Chain audit records with prev_hash so tampering is detectable (scripts/verify-audit)")
+    AUDIT_LOG_CHECKPOINT_INTERVAL: int = Field(default=10000, description="Records between chain checkpoints in segment manifests (parallel verification)")
+    AUDIT_INDEX_ENABLED: bool = Field(default=True, description="Maintain a SQLite index of audit events for /audit/search")
+    AUDIT_INDEX_PATH: str = Field(default="logs/audit-index.sqlite3", description="Path to the audit search index")
+    LOG_QUEUE_SIZE: int = Field(default=10000, description="Log records buffered for the logging thread before overflow handling")
+    LOG_QUEUE_OVERFLOW: Literal["drop", "sample"] = Field(default="sample", description="When the log queue backs up: drop new records, or sample sub-WARNING records past 80% full")
+    REQUEST_LOG_SAMPLE_RATE: float = Field(default=1.0, ge=0.0, le=1.0, description="Fraction of successful api.requests access logs kept (failures are always logged)")
     MOCK_OKTA_TEST_SECRET: str = Field(default="mock-okta-secret", description="Secret key for Mock Okta test endpoints")
     REQUEST_TIMEOUT_SECONDS: int = Field(default=30, description="Request timeout in seconds")
+    FLOW_MAX_WORKERS: int = Field(default=32, ge=1, description="Flows executed concurrently; further starts wait in the queue")
+    FLOW_DOMAIN_CONCURRENCY: int = Field(default=8, ge=1, description="Concurrent flow steps per capability domain (e.g. workday.hcm)")
+    FLOW_DOMAIN_LIMITS: Dict[str, int] = Field(default_factory=dict, description="Per-domain overrides of FLOW_DOMAIN_CONCURRENCY, e.g. {\"workday.payroll\": 2}")
+    FLOW_STORE_BACKEND: Literal["memory", "sqlite"] = Field(default="sqlite", description="Flow execution storage: in-process dict, or SQLite shared by all workers")
+    FLOW_STORE_PATH: str = Field(default="data/flows.sqlite3", description="SQLite flow store (WAL mode) when FLOW_STORE_BACKEND is sqlite")
+    FLOW_STORE_FLUSH_INTERVAL_MS: int = Field(default=50, ge=1, description="Max delay before queued flow state changes are committed")
+    FLOW_STORE_LEASE_SECONDS: float = Field(default=30.0, gt=0, description="Heartbeat age after which another worker resumes a worker's RUNNING flows")
+    FLOW_STORE_REMOTE_POLL_SECONDS: float = Field(default=1.0, gt=0, description="How often status watchers re-read flows that run on another worker")
+    FLOW_LONG_POLL_MAX_SECONDS: float = Field(default=30.0, ge=0, description="Upper bound for GET /flows/{id}?wait= (also capped by the request deadline)")
+    FLOW_EVENTS_KEEPALIVE_SECONDS: float = Field(default=15.0, gt=0, description="Idle interval between SSE keep-alive comments on /flows/{id}/events")
+    FLOW_STEP_TIMEOUT_SECONDS: float = Field(default=30.0, gt=0, description="Timeout for a single flow step")
+    FLOW_MAX_QUEUE_DEPTH: int = Field(default=1000, ge=0, description="Queued flows beyond which new starts get 429 with Retry-After (0 is unlimited)")
+    FLOW_PRINCIPAL_QUOTA: int = Field(default=50, ge=0, description="Flows one principal may have queued or running at once (0 is unlimited)")
+    FLOW_RETENTION_TTL_SECONDS: float = Field(default=3600.0, ge=0, description="Finished flows stay in the flow store this long before archiving (0 keeps them)")
+    FLOW_RETENTION_MAX_FLOWS: int = Field(default=10000, ge=0, description="Finished flows kept in the flow store; older ones are archived first (0 is unlimited)")
+    FLOW_ARCHIVE_ENABLED: bool = Field(default=True, description="Move finished flows to the compressed archive instead of deleting them")
+    FLOW_ARCHIVE_PATH: str = Field(default="data/flow-archive.sqlite3", description="Compressed archive of finished flows, still readable via GET /flows/{id}")
+    FLOW_ARCHIVE_RETENTION_DAYS: int = Field(default=0, ge=0, description="Delete archived flows after this many days (0 keeps them)")
+    CALLBACK_QUEUE_PATH: str = Field(default="data/callbacks.sqlite3", description="SQLite queue of pending flow callback deliveries")
+    CALLBACK_SIGNING_SECRET: str = Field(default="local-callback-secret", description="HMAC-SHA256 key for X-Callback-Signature (set per deployment)")
+    CALLBACK_ALLOWED_HOSTS: List[str] = Field(default_factory=list, description="Hosts a flow callback_url may target (empty allows any)")
+    CALLBACK_MAX_ATTEMPTS: int = Field(default=8, ge=1, description="Delivery attempts before a callback is marked dead")
+    CALLBACK_RETRY_BASE_DELAY_SECONDS: float = Field(default=1.0, gt=0, description="Base delay for exponential callback retry backoff (full jitter)")
+    CALLBACK_RETRY_MAX_DELAY_SECONDS: float = Field(default=300.0, gt=0, description="Cap on a single callback retry delay")
+    CALLBACK_MAX_CONCURRENCY_PER_HOST: int = Field(default=4, ge=1, description="Concurrent callback deliveries to one host")
+    CALLBACK_MAX_CONNECTIONS: int = Field(default=100, ge=1, description="Pooled connections (and in-flight deliveries) for callbacks")
+    CALLBACK_TIMEOUT_SECONDS: float = Field(default=10.0, gt=0, description="Timeout for one callback delivery")
 
     @field_validator("POLICY_PATH", "CAPABILITY_REGISTRY_PATH")
     @classmethod
@@ -1,6 +1,10 @@
 from contextvars import ContextVar
 import uuid
 
+# Header carrying the caller's remaining time budget in milliseconds.
+# Sent by the MCP backend client and honored by the API's timeout middleware.
+DEADLINE_HEADER = "X-Request-Timeout-Ms"
+
 # Context variable to store the request ID for the current task/request
 request_id_ctx: ContextVar[str] = ContextVar("request_id", default="")
 
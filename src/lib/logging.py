@@ -1,56 +1,47 @@
+import atexit
 import logging
+import logging.handlers
 import json
+import queue
 import sys
-import re
+import threading
 from datetime import datetime, timezone
-from typing import Any, Pattern, List, Tuple
+from typing import Any, Callable, Optional
 from src.lib.context import get_request_id
+from src.lib.redaction import RedactionEngine
 
 class StructuredFormatter(logging.Formatter):
     """
     JSON formatter for structured logging with PII masking.
     """
     
-    # Pre-compile regex patterns for PII masking
-    PATTERNS: List[Tuple[Pattern, str]] = [
-        # Email
-        (re.compile(r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+'), '[EMAIL]'),
-        # SSN (Simple)
-        (re.compile(r'\b\d{3}-\d{2}-\d{4}\b'), '[SSN]'),
-        # Phone (US-ish)
-        (re.compile(r'\b(?:\+?1[-. ]?)?\(?\d{3}\)?[-. ]?\d{3}[-. ]?\d{4}\b'), '[PHONE]'),
-    ]
+    # Single compiled pass over email, SSN and phone patterns
+    ENGINE = RedactionEngine(
+        replacements={"email": "[EMAIL]", "ssn": "[SSN]", "phone": "[PHONE]"},
+    )
 
     def _mask_pii(self, text: str) -> str:
         if not isinstance(text, str):
             return text
-        for pattern, replacement in self.PATTERNS:
-            text = pattern.sub(replacement, text)
-        return text
+        return self.ENGINE.redact_text(text)
 
     def _mask_object(self, obj: Any) -> Any:
-        if isinstance(obj, dict):
-            return {k: self._mask_object(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._mask_object(i) for i in obj]
-        elif isinstance(obj, str):
-            return self._mask_pii(obj)
-        return obj
+        return self.ENGINE.redact(obj)
 
     def format(self, record: logging.LogRecord) -> str:
         # Mask the main message
         message = self._mask_pii(record.getMessage())
 
-        # Basic log object
+        # Basic log object (record time, not format time: formatting may run later on the listener thread)
         log_obj: dict[str, Any] = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": message,
         }
 
-        # Add request_id from context if available
-        request_id = get_request_id()
+        # Add request_id captured at emit time, or from context if available
+        request_id = getattr(record, "request_id", None) or get_request_id()
         if request_id:
             log_obj["request_id"] = request_id
 
@@ -74,24 +65,136 @@ class PIIMaskingFormatter(StructuredFormatter):
     """
     pass
 
-def setup_logging(level: int = logging.INFO):
+class SamplingFilter(logging.Filter):
+    """
+    Keeps roughly `rate` (0..1) of the records below WARNING on a logger.
+
+    WARNING and above always pass, as does anything `keep_if` accepts. Sampling is
+    deterministic (every 1/rate-th record), so volume is predictable under load.
+    """
+
+    def __init__(self, rate: float, keep_if: Optional[Callable[[logging.LogRecord], bool]] = None):
+        super().__init__()
+        self.rate = max(0.0, min(1.0, rate))
+        self.keep_if = keep_if
+        self._credit = 0.0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1.0 or record.levelno >= logging.WARNING:
+            return True
+        if self.keep_if is not None and self.keep_if(record):
+            return True
+        with self._lock:
+            self._credit += self.rate
+            if self._credit >= 1.0:
+                self._credit -= 1.0
+                return True
+        return False
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to a `QueueListener` thread, where formatting and PII masking run.
+
+    The emitting thread only resolves the message and captures the request id.
+    When the queue is full records are dropped instead of blocking the caller.
+    With the "sample" policy, records below WARNING are also thinned to
+    `sample_rate` once the queue is past `high_water` of its capacity.
+    """
+
+    def __init__(
+        self,
+        log_queue: "queue.Queue[logging.LogRecord]",
+        overflow: str = "sample",
+        high_water: float = 0.8,
+        sample_rate: float = 0.1,
+    ):
+        super().__init__(log_queue)
+        if overflow not in ("drop", "sample"):
+            raise ValueError(f"Unknown log queue overflow policy: {overflow!r}")
+        self.overflow = overflow
+        self.high_water_mark = int(log_queue.maxsize * high_water) if log_queue.maxsize > 0 else 0
+        self.sampler = SamplingFilter(sample_rate)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same-process queue: no pickling, so keep exc_info for the real formatter.
+        # Only freeze the message (args may be mutated later) and the request context.
+        record.msg = record.getMessage()
+        record.args = None
+        if not hasattr(record, "request_id"):
+            record.request_id = get_request_id()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if (
+            self.overflow == "sample"
+            and self.high_water_mark
+            and self.queue.qsize() >= self.high_water_mark
+            and not self.sampler.filter(record)
+        ):
+            self.dropped += 1
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+atexit.register(_stop_listener)
+
+def _keep_failed_requests(record: logging.LogRecord) -> bool:
+    extra = getattr(record, "extra_data", None)
+    return isinstance(extra, dict) and (extra.get("status_code") or 0) >= 400
+
+def setup_logging(
+    level: int = logging.INFO,
+    queue_size: int = 10000,
+    overflow: str = "sample",
+    request_sample_rate: float = 1.0,
+):
     """
     Configures the root logger to use structured JSON logging.
+
+    Records go through a bounded queue to a listener thread that formats, masks
+    and writes them, so emitting a log line never blocks on stdout or JSON work.
+    `request_sample_rate` thins successful `api.requests` access logs.
     """
+    global _listener
+    _stop_listener()
+
     handler = logging.StreamHandler(sys.stdout)
     handler.setFormatter(StructuredFormatter())
-    
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=queue_size)
+    queue_handler = BoundedQueueHandler(log_queue, overflow=overflow)
+    _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+
     root_logger = logging.getLogger()
     
     # Remove existing handlers to avoid duplicate logs
     for h in root_logger.handlers[:]:
         root_logger.removeHandler(h)
         
-    root_logger.addHandler(handler)
+    root_logger.addHandler(queue_handler)
     root_logger.setLevel(level)
 
-    # Specific configuration for API request logger if needed
-    logging.getLogger("api.requests").propagate = True
+    # High-volume access log: sample successes, always keep failures
+    request_logger = logging.getLogger("api.requests")
+    request_logger.propagate = True
+    for f in request_logger.filters[:]:
+        if isinstance(f, SamplingFilter):
+            request_logger.removeFilter(f)
+    if request_sample_rate < 1.0:
+        request_logger.addFilter(SamplingFilter(request_sample_rate, keep_if=_keep_failed_requests))
 
 def log_provenance(action: str, resource: str, effect: str, reason: str = None, **metadata):
     """
@@ -0,0 +1,121 @@
+import re
+from typing import Any, Dict, Iterable, Mapping, Optional, Pattern
+
+# Canonical PII patterns shared by the audit logger, structured logging and the MCP server.
+# Order matters: at the same position, earlier alternatives win (SSN before phone).
+PII_PATTERNS: Dict[str, str] = {
+    # Not preceded by a backslash, so JSON escapes like \n stay intact in redact_json
+    "email": r"(?<!\\)[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+",
+    "ssn": r"(?<!\w)\d{3}-?\d{2}-?\d{4}(?!\w)",
+    "phone": r"(?<!\w)(?:\+?1[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}(?!\w)",
+    # Salary amounts embedded in JSON text (escaped quotes allowed for nested JSON strings)
+    "salary": r'\\?"amount\\?"\s*:\s*\d+(?:\.\d+)?',
+}
+
+# Every pattern above needs a digit or an '@'; strings without either are skipped outright
+_MAYBE_PII: Pattern = re.compile(r"[\d@]")
+
+# A JSON string literal, and a JSON scalar value
+_JSON_STRING = r'"(?:[^"\\]|\\.)*"'
+_JSON_SCALAR = _JSON_STRING + r"|-?\d[\d.eE+-]*|true|false|null"
+
+# Bound on memoized key decisions (payload keys may be caller-controlled)
+_KEY_CACHE_MAX = 4096
+
+
+class RedactionEngine:
+    """
+    Single-pass PII redaction.
+
+    All selected patterns are compiled into one alternation regex with a named group
+    per PII type, so each string is scanned once. Values under sensitive keys are
+    replaced wholesale. Keys match exactly (case-insensitive) against `sensitive_keys`
+    or by substring against `sensitive_key_substrings`.
+    """
+
+    def __init__(
+        self,
+        replacements: Mapping[str, str],
+        sensitive_keys: Iterable[str] = (),
+        sensitive_key_substrings: Iterable[str] = (),
+        key_mask: str = "[REDACTED]",
+    ):
+        unknown = set(replacements) - set(PII_PATTERNS)
+        if unknown:
+            raise ValueError(f"Unknown PII pattern(s): {sorted(unknown)}")
+
+        self.replacements: Dict[str, str] = dict(replacements)
+        self.sensitive_keys = frozenset(k.lower() for k in sensitive_keys)
+        self.sensitive_key_substrings = tuple(s.lower() for s in sensitive_key_substrings)
+        self.key_mask = key_mask
+        self._key_cache: Dict[str, bool] = {}
+
+        names = [name for name in PII_PATTERNS if name in self.replacements]
+        self._pattern: Optional[Pattern] = (
+            re.compile("|".join(f"(?P<{name}>{PII_PATTERNS[name]})" for name in names))
+            if names else None
+        )
+
+        # JSON mode: a sensitive "key": scalar pair, or any string literal
+        key_alternatives = [re.escape(k) for k in sorted(self.sensitive_keys)]
+        if self.sensitive_key_substrings:
+            subs = "|".join(re.escape(s) for s in self.sensitive_key_substrings)
+            key_alternatives.append(rf'[^"\\]*(?:{subs})[^"\\]*')
+        json_alternatives = []
+        if key_alternatives:
+            json_alternatives.append(
+                rf'"(?P<key>(?i:{"|".join(key_alternatives)}))"(?P<sep>\s*:\s*)(?:{_JSON_SCALAR})'
+            )
+        json_alternatives.append(f"(?P<string>{_JSON_STRING})")
+        self._json_pattern: Pattern = re.compile("|".join(json_alternatives))
+
+    def _replace(self, match: "re.Match[str]") -> str:
+        return self.replacements[match.lastgroup]
+
+    def is_sensitive_key(self, key: Any) -> bool:
+        if not isinstance(key, str):
+            return False
+        cached = self._key_cache.get(key)
+        if cached is not None:
+            return cached
+        lowered = key.lower()
+        result = lowered in self.sensitive_keys or any(
+            s in lowered for s in self.sensitive_key_substrings
+        )
+        if len(self._key_cache) < _KEY_CACHE_MAX:
+            self._key_cache[key] = result
+        return result
+
+    def redact_text(self, text: str) -> str:
+        """Mask PII patterns in a single string."""
+        if self._pattern is None or not _MAYBE_PII.search(text):
+            return text
+        return self._pattern.sub(self._replace, text)
+
+    def redact(self, data: Any) -> Any:
+        """Recursively redact dicts, lists/tuples and strings. Returns new containers."""
+        if isinstance(data, str):
+            return self.redact_text(data)
+        if isinstance(data, dict):
+            return {
+                k: self.key_mask if self.is_sensitive_key(k) else self.redact(v)
+                for k, v in data.items()
+            }
+        if isinstance(data, (list, tuple)):
+            return [self.redact(item) for item in data]
+        return data
+
+    def redact_json(self, text: str) -> str:
+        """
+        Redact an already-serialized JSON document in one pass.
+
+        Scalar values under sensitive keys are masked and PII patterns are masked inside
+        string literals; structure and all other values are left untouched. Object or
+        array values under a sensitive key are not masked wholesale in this mode.
+        """
+        def replace(match: "re.Match[str]") -> str:
+            if match.group("string") is not None:
+                return self.redact_text(match.group(0))
+            return f'"{match.group("key")}"{match.group("sep")}"{self.key_mask}"'
+
+        return self._json_pattern.sub(replace, text)
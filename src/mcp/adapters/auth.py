@@ -1,11 +1,15 @@
-from typing import Optional, List, Any, Dict, Tuple
-from pydantic import BaseModel
+from typing import Optional, List, Any, Dict, Tuple, NamedTuple, FrozenSet, Mapping
+from types import MappingProxyType
+from pydantic import BaseModel, ConfigDict
 import jwt
+import asyncio
+import hashlib
 import logging
 import time
 import httpx
 import threading
-from cachetools import TTLCache
+from functools import partial
+from cachetools import TLRUCache
 from src.mcp.lib.config import settings
 from src.adapters.auth import (
     create_token_verifier,
@@ -16,11 +20,44 @@ from src.adapters.auth import (
 
 logger = logging.getLogger(__name__)
 
-# Token Cache: Key = user_token_signature, Value = mcp_token
-# maxsize=5000, ttl=300 seconds (5 minutes)
-_mcp_token_cache: TTLCache = TTLCache(maxsize=5000, ttl=300)
+class CachedMCPToken(NamedTuple):
+    token: str
+    expires_at: float  # Unix timestamp after which the entry must not be served
+
+
+def _mcp_token_ttu(_key: str, value: CachedMCPToken, _now: float) -> float:
+    return value.expires_at
+
+
+# Token Cache: Key = user_token_signature, Value = CachedMCPToken
+# maxsize=5000, each entry lives until its exchanged token's `exp` (minus skew)
+_mcp_token_cache: TLRUCache = TLRUCache(maxsize=5000, ttu=_mcp_token_ttu, timer=time.time)
 _cache_lock = threading.Lock()
 
+# In-flight exchanges keyed like the cache, so concurrent misses share one exchange
+_inflight_exchanges: Dict[str, "asyncio.Future[CachedMCPToken]"] = {}
+
+# Long-lived pooled client for the token endpoint
+_exchange_client: Optional[httpx.AsyncClient] = None
+
+# Token exchange counters (see get_token_exchange_metrics)
+_exchange_metrics: Dict[str, int] = {
+    "cache_hits": 0,
+    "refresh_ahead_hits": 0,
+    "blocking_exchanges": 0,
+    "coalesced_waits": 0,
+    "background_refreshes": 0,
+    "background_refresh_failures": 0,
+}
+
+def get_token_exchange_metrics() -> Dict[str, int]:
+    """Snapshot of token exchange counters (refresh-ahead hits vs blocking exchanges)."""
+    return dict(_exchange_metrics)
+
+def reset_token_exchange_metrics() -> None:
+    for key in _exchange_metrics:
+        _exchange_metrics[key] = 0
+
 # Global verifier instance
 _verifier: Optional[TokenVerifier] = None
 
@@ -41,22 +78,51 @@ def get_verifier() -> TokenVerifier:
     return _verifier
 
 class PrincipalContext(BaseModel):
+    # Frozen: verified instances are shared across tool calls via _principal_cache
+    model_config = ConfigDict(frozen=True)
+
     subject: str
     principal_type: str
     groups: List[str] = []
     mfa_verified: bool = False
     raw_token: str
 
+class _CachedPrincipal(NamedTuple):
+    principal: PrincipalContext
+    expires_at: float
+
+
+def _principal_ttu(_key: str, value: _CachedPrincipal, now: float) -> float:
+    # Bounded by PRINCIPAL_CACHE_MAX_TTL_SECONDS so revocations are honored promptly
+    return min(value.expires_at, now + settings.PRINCIPAL_CACHE_MAX_TTL_SECONDS)
+
+
+# Verified principal cache: Key = sha256(token), Value = _CachedPrincipal
+_principal_cache: TLRUCache = TLRUCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE, ttu=_principal_ttu, timer=time.time
+)
+_principal_cache_lock = threading.Lock()
+
+def _principal_cache_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
 def extract_principal(token: str) -> Optional[PrincipalContext]:
     """
     Extract and verify principal from JWT token.
     Enforces signature verification and standard claims validation.
+    Successful verifications are cached by token hash until the token's `exp`.
     """
+    cache_key = _principal_cache_key(token)
+    with _principal_cache_lock:
+        cached = _principal_cache.get(cache_key)
+    if cached is not None:
+        return cached.principal
+
     try:
         verifier = get_verifier()
         principal = verifier.verify(token)
         
-        return PrincipalContext(
+        context = PrincipalContext(
             subject=principal.subject,
             principal_type=principal.principal_type.value,
             groups=principal.groups,
@@ -70,6 +136,11 @@ def extract_principal(token: str) -> Optional[PrincipalContext]:
         logger.error(f"Failed to process token: {str(e)}")
         return None
 
+    if principal.expires_at and principal.expires_at > time.time():
+        with _principal_cache_lock:
+            _principal_cache[cache_key] = _CachedPrincipal(context, float(principal.expires_at))
+    return context
+
 def get_token_from_context(ctx: Any) -> Optional[str]:
     """
     Robustly extract bearer token from MCP context metadata.
@@ -99,9 +170,120 @@ def get_token_from_context(ctx: Any) -> Optional[str]:
         logger.debug(f"Token extraction failed: {str(e)}")
         return None
 
+def get_exchange_client() -> httpx.AsyncClient:
+    """Lazy initialization of the pooled token exchange client."""
+    global _exchange_client
+    if _exchange_client is None or _exchange_client.is_closed:
+        _exchange_client = httpx.AsyncClient(
+            timeout=settings.TOKEN_EXCHANGE_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.TOKEN_EXCHANGE_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.TOKEN_EXCHANGE_MAX_CONNECTIONS,
+            ),
+        )
+    return _exchange_client
+
+async def close_exchange_client() -> None:
+    """Close the pooled token exchange client (server shutdown)."""
+    global _exchange_client
+    if _exchange_client is not None:
+        await _exchange_client.aclose()
+        _exchange_client = None
+
+def _token_cache_key(user_token: str) -> str:
+    # We use the token signature (last part) as key to save memory/log-safety
+    token_parts = user_token.split(".")
+    return token_parts[-1] if len(token_parts) == 3 else user_token
+
+def _resolve_expiry(mcp_token: str, response_data: Dict[str, Any]) -> float:
+    """
+    Determine when a freshly exchanged token stops being cacheable.
+    Prefers the token's own `exp` claim, then `expires_in`, then the configured default.
+    """
+    now = time.time()
+    expires_at: Optional[float] = None
+    try:
+        # Signature is verified by the Capability API; we only need the lifetime here.
+        claims = jwt.decode(mcp_token, options={"verify_signature": False})
+        if "exp" in claims:
+            expires_at = float(claims["exp"])
+    except jwt.PyJWTError:
+        pass
+
+    if expires_at is None and "expires_in" in response_data:
+        expires_at = now + float(response_data["expires_in"])
+    if expires_at is None:
+        expires_at = now + settings.TOKEN_EXCHANGE_DEFAULT_TTL_SECONDS
+
+    return expires_at - settings.TOKEN_EXPIRY_SKEW_SECONDS
+
+async def _exchange_token(cache_key: str, user_token: str) -> CachedMCPToken:
+    """Perform the RFC 8693 exchange and cache the result."""
+    logger.info("Exchanging user token for MCP scope")
+    token_endpoint = f"{settings.OKTA_ISSUER}/v1/token"
+
+    client = get_exchange_client()
+    response = await client.post(
+        token_endpoint,
+        data={
+            "grant_type": "urn:ietf:params:oauth:grant-type:token-exchange",
+            "subject_token": user_token,
+            "subject_token_type": "urn:ietf:params:oauth:token-type:access_token",
+            "requested_token_type": "urn:ietf:params:oauth:token-type:access_token",
+            "scope": "mcp:use",
+            "audience": settings.CAPABILITY_API_AUDIENCE
+        }
+    )
+    response.raise_for_status()
+    data = response.json()
+
+    mcp_token = data["access_token"]
+    entry = CachedMCPToken(token=mcp_token, expires_at=_resolve_expiry(mcp_token, data))
+
+    if entry.expires_at > time.time():
+        with _cache_lock:
+            _mcp_token_cache[cache_key] = entry
+    else:
+        logger.warning("Exchanged MCP token expires within the skew window; not caching")
+
+    return entry
+
+def _clear_inflight_exchange(cache_key: str, future: "asyncio.Future[CachedMCPToken]") -> None:
+    if _inflight_exchanges.get(cache_key) is future:
+        del _inflight_exchanges[cache_key]
+
+def _start_exchange(cache_key: str, user_token: str) -> "asyncio.Future[CachedMCPToken]":
+    """Return the in-flight exchange for this key, starting one if needed."""
+    pending = _inflight_exchanges.get(cache_key)
+    if pending is None:
+        pending = asyncio.ensure_future(_exchange_token(cache_key, user_token))
+        _inflight_exchanges[cache_key] = pending
+        pending.add_done_callback(partial(_clear_inflight_exchange, cache_key))
+    return pending
+
+def _on_background_refresh_done(future: "asyncio.Future[CachedMCPToken]") -> None:
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        # The current entry is still served until it expires; the next miss retries
+        _exchange_metrics["background_refresh_failures"] += 1
+        logger.warning(f"Background MCP token refresh failed: {str(error)}")
+
+def _schedule_refresh(cache_key: str, user_token: str) -> None:
+    if cache_key in _inflight_exchanges:
+        return
+    _exchange_metrics["background_refreshes"] += 1
+    logger.debug("Refreshing MCP token ahead of expiry")
+    _start_exchange(cache_key, user_token).add_done_callback(_on_background_refresh_done)
+
 async def get_mcp_token(user_token: str) -> str:
     """
     Exchange user token for MCP-scoped token with caching.
+
+    Concurrent calls for the same user token share a single in-flight exchange.
+    Cached tokens within `TOKEN_REFRESH_AHEAD_SECONDS` of expiry are returned
+    immediately while a replacement is exchanged in the background.
     
     Args:
         user_token: The full user token.
@@ -113,63 +295,68 @@ async def get_mcp_token(user_token: str) -> str:
         Exception: If exchange fails.
     """
     # 1. Check Cache
-    # We use the token signature (last part) as key to save memory/log-safety
-    token_parts = user_token.split(".")
-    cache_key = token_parts[-1] if len(token_parts) == 3 else user_token
-    
-    with _cache_lock:
-        if cache_key in _mcp_token_cache:
-            logger.debug("Returning cached MCP token")
-            return _mcp_token_cache[cache_key]
+    cache_key = _token_cache_key(user_token)
 
-    # 2. Perform Exchange
-    logger.info("Exchanging user token for MCP scope")
-    token_endpoint = f"{settings.OKTA_ISSUER}/v1/token"
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            token_endpoint,
-            data={
-                "grant_type": "urn:ietf:params:oauth:grant-type:token-exchange",
-                "subject_token": user_token,
-                "subject_token_type": "urn:ietf:params:oauth:token-type:access_token",
-                "requested_token_type": "urn:ietf:params:oauth:token-type:access_token",
-                "scope": "mcp:use",
-                "audience": settings.CAPABILITY_API_AUDIENCE
-            }
-        )
-        response.raise_for_status()
-        data = response.json()
-        
-    mcp_token = data["access_token"]
-    
-    # 3. Cache Result
     with _cache_lock:
-        _mcp_token_cache[cache_key] = mcp_token
-    
-    return mcp_token
+        cached = _mcp_token_cache.get(cache_key)
+    if cached is not None:
+        if cached.expires_at - time.time() <= settings.TOKEN_REFRESH_AHEAD_SECONDS:
+            _exchange_metrics["refresh_ahead_hits"] += 1
+            _schedule_refresh(cache_key, user_token)
+        else:
+            _exchange_metrics["cache_hits"] += 1
+        logger.debug("Returning cached MCP token")
+        return cached.token
 
-def is_tool_allowed(principal: PrincipalContext, tool_name: str) -> bool:
-    """
-    Enforce RBAC mapping (FR-004).
-    Resolves role from groups for HUMAN types.
-    """
-    # 1. Resolve Effective Role
+    # 2. Join or start the exchange for this user token
+    if cache_key in _inflight_exchanges:
+        _exchange_metrics["coalesced_waits"] += 1
+        logger.debug("Joining in-flight MCP token exchange")
+    else:
+        _exchange_metrics["blocking_exchanges"] += 1
+    pending = _start_exchange(cache_key, user_token)
+
+    # Shield so that one cancelled tool call does not abort the shared exchange
+    entry = await asyncio.shield(pending)
+    return entry.token
+
+_BASE_TOOLS = frozenset({
+    "get_employee", "get_manager_chain", "get_org_chart", "update_contact_info", "get_pto_balance",
+})
+_EMPLOYEE_TOOLS = _BASE_TOOLS | {
+    "request_time_off", "cancel_time_off", "list_pay_statements",
+}
+_ADMIN_TOOLS = _EMPLOYEE_TOOLS | {
+    "approve_time_off", "list_direct_reports", "get_compensation", "get_pay_statement",
+}
+
+# RBAC table (FR-004): effective role -> allowed tool names
+TOOL_PERMISSIONS: Mapping[str, FrozenSet[str]] = MappingProxyType({
+    "AI_AGENT": _BASE_TOOLS,
+    "EMPLOYEE": _EMPLOYEE_TOOLS,
+    "ADMIN": _ADMIN_TOOLS,
+})
+
+def resolve_role(principal: PrincipalContext) -> str:
+    """Resolve the effective RBAC role from groups for HUMAN types."""
     role = principal.principal_type
     if role == "HUMAN":
         if "hr-platform-admins" in principal.groups:
             role = "ADMIN"
         elif "employees" in principal.groups:
             role = "EMPLOYEE"
+    return role
+
+def is_tool_allowed(principal: PrincipalContext, tool_name: str) -> bool:
+    """
+    Enforce RBAC mapping (FR-004).
+    Resolves role from groups for HUMAN types.
+    """
+    # 1. Resolve Effective Role
+    role = resolve_role(principal)
     
     # 2. Check Permissions
-    allowed_tools = {
-        "AI_AGENT": ["get_employee", "get_manager_chain", "get_org_chart", "update_contact_info", "get_pto_balance"],
-        "EMPLOYEE": ["get_employee", "get_manager_chain", "get_org_chart", "update_contact_info", "get_pto_balance", "request_time_off", "cancel_time_off", "list_pay_statements"],
-        "ADMIN": ["get_employee", "get_manager_chain", "get_org_chart", "update_contact_info", "get_pto_balance", "request_time_off", "cancel_time_off", "list_pay_statements", "approve_time_off", "list_direct_reports", "get_compensation", "get_pay_statement"]
-    }
-    
-    is_allowed = tool_name in allowed_tools.get(role, [])
+    is_allowed = tool_name in TOOL_PERMISSIONS.get(role, frozenset())
     
     if not is_allowed:
         logger.warning(f"Access Denied: principal={principal.subject}, type={principal.principal_type}, groups={principal.groups}, role={role}, tool={tool_name}")
@@ -1,36 +1,283 @@
 import httpx
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Set
+from src.lib.context import DEADLINE_HEADER
 from src.mcp.lib.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Gateway-style statuses that are safe to retry for idempotent reads
+RETRYABLE_STATUS_CODES = frozenset({502, 503, 504})
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+@dataclass
+class _BatchEntry:
+    domain: str
+    action: str
+    parameters: Dict[str, Any]
+    future: "asyncio.Future[Dict[str, Any]]"
+
+@dataclass
+class _PendingBatch:
+    token: str
+    deadline: float
+    entries: List[_BatchEntry] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+
 class CapabilityAPIClient:
-    def __init__(self, base_url: str = settings.CAPABILITY_API_BASE_URL):
+    def __init__(
+        self,
+        base_url: str = settings.CAPABILITY_API_BASE_URL,
+        http2: bool = settings.BACKEND_HTTP2,
+        max_connections: int = settings.BACKEND_MAX_CONNECTIONS,
+        max_keepalive_connections: int = settings.BACKEND_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = settings.BACKEND_KEEPALIVE_EXPIRY_SECONDS,
+        read_retries: int = settings.BACKEND_READ_RETRIES,
+        batch_window_ms: float = settings.BACKEND_BATCH_WINDOW_MS,
+        batch_max_size: int = settings.BACKEND_BATCH_MAX_SIZE,
+    ):
         self.base_url = base_url.rstrip("/")
-        self.client = httpx.AsyncClient(timeout=30.0)
-
-    async def call_action(self, domain: str, action: str, parameters: Dict[str, Any], token: str) -> Dict[str, Any]:
-        url = f"{self.base_url}/actions/{domain}/{action}"
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-            "X-Acting-Through": "mcp-server"
+        self.read_retries = read_retries
+        self.batch_window = batch_window_ms / 1000
+        self.batch_max_size = batch_max_size
+
+        # Open batches keyed by bearer token: one token == one session/principal
+        self._pending_batches: Dict[str, _PendingBatch] = {}
+        self._dispatch_tasks: Set[asyncio.Task] = set()
+
+        if http2 and not _http2_available():
+            logger.warning("BACKEND_HTTP2 requested but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+
+        self.client = httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(
+                settings.BACKEND_TIMEOUT_SECONDS,
+                connect=settings.BACKEND_CONNECT_TIMEOUT_SECONDS,
+            ),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+
+    def _retry_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        ceiling = min(
+            settings.BACKEND_RETRY_MAX_DELAY_SECONDS,
+            settings.BACKEND_RETRY_BASE_DELAY_SECONDS * (2 ** attempt),
+        )
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def _is_retryable(e: Exception) -> bool:
+        if isinstance(e, httpx.HTTPStatusError):
+            return e.response.status_code in RETRYABLE_STATUS_CODES
+        return isinstance(e, httpx.TransportError)
+
+    async def call_action(
+        self,
+        domain: str,
+        action: str,
+        parameters: Dict[str, Any],
+        token: str,
+        idempotent: bool = False,
+        deadline: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Execute a Capability API action.
+
+        Args:
+            idempotent: Read-only actions may be retried on transport errors and 502/503/504,
+                and concurrent ones for the same token are coalesced into one batch request.
+            deadline: `time.monotonic()` value by which the call must finish. The remaining
+                budget is sent as `X-Request-Timeout-Ms` and bounds every attempt.
+        """
+        if deadline is None:
+            deadline = time.monotonic() + settings.BACKEND_TIMEOUT_SECONDS
+
+        # Writes are never batched, so a retried batch can never replay a write
+        if idempotent and self.batch_window > 0:
+            return await self._enqueue(domain, action, parameters, token, deadline)
+
+        return await self._post(
+            f"/actions/{domain}/{action}",
+            {"parameters": parameters},
+            token,
+            idempotent,
+            deadline,
+            label=f"{domain}.{action}",
+        )
+
+    async def _post(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        token: str,
+        idempotent: bool,
+        deadline: float,
+        label: str,
+    ) -> Dict[str, Any]:
+        url = f"{self.base_url}{path}"
+        max_attempts = 1 + (self.read_retries if idempotent else 0)
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise httpx.TimeoutException(f"Deadline exceeded before calling {label}")
+
+            headers = {
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+                "X-Acting-Through": "mcp-server",
+                DEADLINE_HEADER: str(int(remaining * 1000)),
+            }
+
+            try:
+                response = await self.client.post(
+                    url,
+                    headers=headers,
+                    json=payload,
+                    timeout=httpx.Timeout(remaining, connect=min(remaining, settings.BACKEND_CONNECT_TIMEOUT_SECONDS)),
+                )
+                response.raise_for_status()
+                return response.json()
+            except Exception as e:
+                attempt += 1
+                if attempt < max_attempts and self._is_retryable(e):
+                    delay = self._retry_delay(attempt - 1)
+                    if time.monotonic() + delay < deadline:
+                        logger.warning(f"Retrying {label} (attempt {attempt + 1}/{max_attempts}) after: {str(e)}")
+                        await asyncio.sleep(delay)
+                        continue
+
+                if isinstance(e, httpx.HTTPStatusError):
+                    logger.error(f"Backend error: {e.response.status_code} - {e.response.text}")
+                else:
+                    logger.error(f"Connection error: {str(e)}")
+                raise
+
+    # --- Batching ---
+
+    async def _enqueue(
+        self,
+        domain: str,
+        action: str,
+        parameters: Dict[str, Any],
+        token: str,
+        deadline: float,
+    ) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        batch = self._pending_batches.get(token)
+        if batch is None:
+            batch = _PendingBatch(token=token, deadline=deadline)
+            batch.timer = loop.call_later(self.batch_window, self._flush, token)
+            self._pending_batches[token] = batch
+
+        entry = _BatchEntry(domain, action, parameters, loop.create_future())
+        batch.entries.append(entry)
+        batch.deadline = min(batch.deadline, deadline)
+
+        if len(batch.entries) >= self.batch_max_size:
+            self._flush(token)
+
+        return await entry.future
+
+    def _flush(self, token: str) -> None:
+        batch = self._pending_batches.pop(token, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+
+        task = asyncio.ensure_future(self._dispatch(batch))
+        self._dispatch_tasks.add(task)
+        task.add_done_callback(self._dispatch_tasks.discard)
+
+    async def _dispatch(self, batch: _PendingBatch) -> None:
+        entries = [e for e in batch.entries if not e.future.done()]
+        if not entries:
+            return
+
+        if len(entries) == 1:
+            entry = entries[0]
+            try:
+                result = await self._post(
+                    f"/actions/{entry.domain}/{entry.action}",
+                    {"parameters": entry.parameters},
+                    batch.token,
+                    True,
+                    batch.deadline,
+                    label=f"{entry.domain}.{entry.action}",
+                )
+            except Exception as e:
+                _resolve(entry.future, error=e)
+            else:
+                _resolve(entry.future, result=result)
+            return
+
+        payload = {
+            "requests": [
+                {"domain": e.domain, "action": e.action, "parameters": e.parameters}
+                for e in entries
+            ]
         }
-        payload = {"parameters": parameters}
-        
+        logger.debug(f"Dispatching batch of {len(entries)} actions")
         try:
-            response = await self.client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Backend error: {e.response.status_code} - {e.response.text}")
-            raise
+            data = await self._post("/actions/batch", payload, batch.token, True, batch.deadline, label="batch")
         except Exception as e:
-            logger.error(f"Connection error: {str(e)}")
-            raise
+            # Whole-batch failures (auth, transport) apply to every caller
+            for entry in entries:
+                _resolve(entry.future, error=e)
+            return
+
+        for entry, item in zip(entries, data.get("results", [])):
+            status_code = item.get("status_code", 500)
+            body = item.get("body", {})
+            if 200 <= status_code < 300:
+                _resolve(entry.future, result=body)
+            else:
+                _resolve(entry.future, error=self._item_error(entry, status_code, body))
+
+        for entry in entries[len(data.get("results", [])):]:
+            _resolve(entry.future, error=RuntimeError("Batch response missing result"))
+
+    def _item_error(self, entry: _BatchEntry, status_code: int, body: Dict[str, Any]) -> httpx.HTTPStatusError:
+        """Rebuild the error a single call would have raised, so error mapping is unchanged."""
+        request = httpx.Request("POST", f"{self.base_url}/actions/{entry.domain}/{entry.action}")
+        response = httpx.Response(status_code, json=body, request=request)
+        return httpx.HTTPStatusError(
+            f"Backend error {status_code} for {entry.domain}.{entry.action}",
+            request=request,
+            response=response,
+        )
 
     async def close(self):
+        for token in list(self._pending_batches):
+            self._flush(token)
+        if self._dispatch_tasks:
+            await asyncio.gather(*self._dispatch_tasks, return_exceptions=True)
         await self.client.aclose()
 
+def _resolve(future: "asyncio.Future[Dict[str, Any]]", result: Any = None, error: Optional[Exception] = None) -> None:
+    # The awaiting tool call may have been cancelled in the meantime
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
 backend_client = CapabilityAPIClient()
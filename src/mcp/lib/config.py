@@ -7,6 +7,25 @@ class MCPServerSettings(BaseSettings):
     CAPABILITY_API_BASE_URL: str = "http://localhost:8000"
     LOG_LEVEL: str = "INFO"
     AUDIT_LOG_PATH: str = "logs/mcp-audit.jsonl"
+    # Audit sink: "jsonl", "rotating" or "socket" (unix:///path or tcp://host:port collector)
+    AUDIT_SINK_BACKEND: str = "rotating"
+    AUDIT_SINK_SOCKET_ADDRESS: Optional[str] = None
+    # Audit events are written from a background thread in batches
+    AUDIT_LOG_BUFFERED: bool = True
+    AUDIT_LOG_FLUSH_INTERVAL_MS: int = 200
+    AUDIT_LOG_BATCH_SIZE: int = 256
+    AUDIT_LOG_FSYNC: bool = False
+    AUDIT_LOG_QUEUE_SIZE: int = 10000
+    # Audit file rotation (0 disables a trigger); closed segments are compressed
+    # ("gzip", "zstd" or "none") and pruned by age/count (0 keeps them)
+    AUDIT_LOG_ROTATE_MAX_BYTES: int = 100 * 1024 * 1024
+    AUDIT_LOG_ROTATE_INTERVAL_SECONDS: int = 86400
+    AUDIT_LOG_COMPRESSION: str = "gzip"
+    AUDIT_LOG_RETENTION_DAYS: int = 0
+    AUDIT_LOG_RETENTION_SEGMENTS: int = 0
+    # Tamper evidence: prev_hash chain, with checkpoints every N records in segment manifests
+    AUDIT_LOG_HASH_CHAIN: bool = True
+    AUDIT_LOG_CHECKPOINT_INTERVAL: int = 10000
     
     # Optional: for direct testing or specific overrides
     ENVIRONMENT: str = "local"
@@ -15,4 +34,35 @@ class MCPServerSettings(BaseSettings):
     OKTA_ISSUER: str = "http://localhost:9000/oauth2/default"
     CAPABILITY_API_AUDIENCE: str = "api://hr-ai-platform"
 
+    # Backend (Capability API) client settings
+    BACKEND_TIMEOUT_SECONDS: float = 30.0  # Default per-call deadline
+    BACKEND_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    BACKEND_MAX_CONNECTIONS: int = 100
+    BACKEND_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    BACKEND_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    # Requires the optional `h2` package; falls back to HTTP/1.1 when missing
+    BACKEND_HTTP2: bool = False
+    # Retries for idempotent (read-only) actions only
+    BACKEND_READ_RETRIES: int = 2
+    BACKEND_RETRY_BASE_DELAY_SECONDS: float = 0.1
+    BACKEND_RETRY_MAX_DELAY_SECONDS: float = 1.0
+    # Concurrent read-only calls with the same token inside this window share one
+    # POST /actions/batch round trip (0 disables batching)
+    BACKEND_BATCH_WINDOW_MS: float = 2.0
+    BACKEND_BATCH_MAX_SIZE: int = 20
+
+    # Token exchange settings
+    TOKEN_EXCHANGE_TIMEOUT_SECONDS: float = 10.0
+    TOKEN_EXCHANGE_MAX_CONNECTIONS: int = 20
+    # Fallback TTL when the exchanged token carries neither `exp` nor `expires_in`
+    TOKEN_EXCHANGE_DEFAULT_TTL_SECONDS: int = 300
+    # Evict cached MCP tokens this many seconds before their real `exp`
+    TOKEN_EXPIRY_SKEW_SECONDS: int = 15
+    # Serve cached tokens this close to expiry while refreshing them in the background
+    TOKEN_REFRESH_AHEAD_SECONDS: int = 60
+
+    # Verified principal cache (keyed by token hash, bounded by token `exp`)
+    PRINCIPAL_CACHE_MAX_SIZE: int = 5000
+    PRINCIPAL_CACHE_MAX_TTL_SECONDS: int = 60
+
 settings = MCPServerSettings()
\ No newline at end of file
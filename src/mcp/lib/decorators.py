@@ -2,14 +2,16 @@ from functools import wraps
 from typing import Any, Dict, Optional, Callable
 import asyncio
 import logging
+import time
 from src.mcp.adapters.backend import backend_client
 from src.mcp.adapters.auth import authenticate_and_authorize, get_mcp_token
 from src.mcp.lib.errors import map_backend_error
 from src.mcp.lib.logging import audit_logger
+from src.mcp.lib.config import settings
 
 logger = logging.getLogger(__name__)
 
-def mcp_tool(domain: str, action: str, tool_name: Optional[str] = None, require_mfa: bool = False):
+def mcp_tool(domain: str, action: str, tool_name: Optional[str] = None, require_mfa: bool = False, read_only: bool = False):
     """
     Decorator that handles MCP tool boilerplate:
     1. Authentication & Authorization (RBAC)
@@ -18,6 +20,8 @@ def mcp_tool(domain: str, action: str, tool_name: Optional[str] = None, require_
     4. Backend Capability API Call
     5. Audit Logging
     6. Error Mapping
+
+    `read_only` marks the backend action as idempotent so transient failures are retried.
     """
     def decorator(func: Callable):
         # Default to function name if tool_name is not provided
@@ -25,6 +29,9 @@ def mcp_tool(domain: str, action: str, tool_name: Optional[str] = None, require_
         
         @wraps(func)
         async def wrapper(ctx: Any, *args, **kwargs) -> str:
+            # The whole tool call (auth, exchange, backend) shares one deadline
+            deadline = time.monotonic() + settings.BACKEND_TIMEOUT_SECONDS
+
             # 1. Auth & Authz
             # authenticate_and_authorize returns (token, principal, error)
             user_token, principal, error = await authenticate_and_authorize(ctx, effective_tool_name)
@@ -58,7 +65,9 @@ def mcp_tool(domain: str, action: str, tool_name: Optional[str] = None, require_
                     domain=domain,
                     action=action,
                     parameters=parameters,
-                    token=mcp_token
+                    token=mcp_token,
+                    idempotent=read_only,
+                    deadline=deadline,
                 )
 
                 # 6. Audit Success
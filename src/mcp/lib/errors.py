@@ -33,6 +33,9 @@ def map_backend_error(e: Exception) -> str:
             
         return f"ERROR ({error_code}): {message}"
     
+    if isinstance(e, httpx.TimeoutException):
+        return "TIMEOUT: The HR backend did not respond in time. Please try again."
+
     if isinstance(e, httpx.ConnectError):
         return "SERVICE_UNAVAILABLE: Could not connect to the HR backend. Please check if the Capability API is running."
 
@@ -1,7 +1,9 @@
 import logging
-import re
-import json
-from typing import Any
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+from src.adapters.filesystem.audit_writer import get_audit_sink, sink_options_from_settings
+from src.lib.redaction import RedactionEngine
 from src.mcp.lib.config import settings
 import os
 
@@ -10,12 +12,12 @@ class PIIMaskingFilter(logging.Filter):
     Filter to mask PII in log records.
     """
     MASK = "***"
-    # Basic patterns for email, phone, and potential SSN/Tax IDs
-    PATTERNS = [
-        (re.compile(r'[\w\.-]+@[\w\.-]+\.\w+'), MASK), # Email
-        (re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'), MASK), # Phone
-        (re.compile(r'\b\d{3}-\d{2}-\d{4}\b'), MASK), # SSN
-    ]
+    # Email, phone and SSN patterns, plus sensitive field names (substring match)
+    ENGINE = RedactionEngine(
+        replacements={"email": MASK, "ssn": MASK, "phone": MASK},
+        sensitive_key_substrings=["email", "phone", "ssn", "salary", "compensation", "address"],
+        key_mask=MASK,
+    )
 
     def filter(self, record: logging.LogRecord) -> bool:
         if isinstance(record.msg, str):
@@ -32,25 +34,10 @@ class PIIMaskingFilter(logging.Filter):
         return True
 
     def _mask_text(self, text: str) -> str:
-        for pattern, mask in self.PATTERNS:
-            text = pattern.sub(mask, text)
-        return text
+        return self.ENGINE.redact_text(text)
 
     def _mask_dict(self, data: dict) -> dict:
-        masked = {}
-        for k, v in data.items():
-            # Sensitive field names
-            if any(sensitive in k.lower() for sensitive in ["email", "phone", "ssn", "salary", "compensation", "address"]):
-                masked[k] = self.MASK
-            elif isinstance(v, dict):
-                masked[k] = self._mask_dict(v)
-            elif isinstance(v, list):
-                masked[k] = [self._mask_dict(i) if isinstance(i, dict) else i for i in v]
-            elif isinstance(v, str):
-                masked[k] = self._mask_text(v)
-            else:
-                masked[k] = v
-        return masked
+        return self.ENGINE.redact(data)
 
 def setup_logging():
     log_level = getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
@@ -75,22 +62,21 @@ class JSONLAuditLogger:
     def __init__(self, path: str = settings.AUDIT_LOG_PATH):
         self.path = path
         self.masker = PIIMaskingFilter()
+        # Same sink implementation (batching, back-pressure, backends) as the API audit log
+        self.sink = get_audit_sink(Path(path).resolve(), **sink_options_from_settings(settings))
 
     def log(self, event_type: str, payload: dict, principal_id: str, status: str = "success"):
-        # Ensure dir exists
-        log_dir = os.path.dirname(self.path)
-        if log_dir:
-            os.makedirs(log_dir, exist_ok=True)
-            
         entry = {
-            "timestamp": logging.Formatter().formatTime(logging.LogRecord("", 0, "", 0, "", None, None), "%Y-%m-%dT%H:%M:%SZ"),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
             "event_type": event_type,
             "principal_id": principal_id,
             "status": status,
             "payload": self.masker._mask_dict(payload)
         }
-        
-        with open(self.path, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+
+        self.sink.write(entry)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        return self.sink.flush(timeout)
 
 audit_logger = JSONLAuditLogger()
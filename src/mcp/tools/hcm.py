@@ -4,17 +4,17 @@ from src.mcp.lib.decorators import mcp_tool
 
 logger = logging.getLogger(__name__)
 
-@mcp_tool(domain="workday.hcm", action="get_employee")
+@mcp_tool(domain="workday.hcm", action="get_employee", read_only=True)
 def get_employee(employee_id: str) -> dict:
     """Look up employee profile with role-based filtering (Passthrough to Capability API)."""
     return {"employee_id": employee_id}
 
-@mcp_tool(domain="workday.hcm", action="get_manager_chain")
+@mcp_tool(domain="workday.hcm", action="get_manager_chain", read_only=True)
 def get_manager_chain(employee_id: str) -> dict:
     """Get the reporting line for an employee."""
     return {"employee_id": employee_id}
 
-@mcp_tool(domain="workday.hcm", action="get_org_chart")
+@mcp_tool(domain="workday.hcm", action="get_org_chart", read_only=True)
 def get_org_chart(root_id: str, depth: int = 2) -> dict:
     """View the organizational structure starting from a root employee."""
     return {"root_id": root_id, "depth": depth}
@@ -24,7 +24,7 @@ def update_contact_info(employee_id: str, updates: dict) -> dict:
     """Update employee contact information (Personal Email, Phone). Enabled for AGENTS (No MFA)."""
     return {"employee_id": employee_id, "updates": updates}
 
-@mcp_tool(domain="workday.hcm", action="list_direct_reports")
+@mcp_tool(domain="workday.hcm", action="list_direct_reports", read_only=True)
 def list_direct_reports(manager_id: str) -> dict:
     """View all direct reports for a given manager."""
     return {"manager_id": manager_id}
\ No newline at end of file
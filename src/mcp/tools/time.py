@@ -5,7 +5,7 @@ from src.mcp.lib.decorators import mcp_tool
 
 logger = logging.getLogger(__name__)
 
-@mcp_tool(domain="workday.time", action="get_balance", tool_name="get_pto_balance")
+@mcp_tool(domain="workday.time", action="get_balance", tool_name="get_pto_balance", read_only=True)
 def get_pto_balance(employee_id: str) -> dict:
     """Check vacation and sick leave balances."""
     return {"employee_id": employee_id}
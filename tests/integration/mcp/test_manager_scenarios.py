@@ -24,7 +24,7 @@ async def test_manager_approve_flow(mock_mcp_token, issue_token):
     # Patch the singleton once
     with patch("src.mcp.adapters.backend.backend_client.call_action") as mock_call:
         
-        async def side_effect(domain, action, parameters, token):
+        async def side_effect(domain, action, parameters, token, **kwargs):
             if action == "list_direct_reports":
                 return {"data": {"direct_reports": [{"employee_id": "EMP001"}]}}
             elif action == "approve":
@@ -7,7 +7,8 @@ from src.mcp.lib.config import settings
 
 @pytest.fixture
 def mock_httpx_client():
-    with patch("httpx.AsyncClient") as mock:
+    mock = AsyncMock()
+    with patch("src.mcp.adapters.auth.get_exchange_client", return_value=mock):
         yield mock
 
 @pytest.fixture
@@ -23,9 +24,8 @@ async def test_get_mcp_token_exchanges_and_caches(mock_httpx_client):
     mock_response.json.return_value = {"access_token": "exchanged_mcp_token"}
     mock_response.raise_for_status.return_value = None
     
-    mock_client_instance = AsyncMock()
+    mock_client_instance = mock_httpx_client
     mock_client_instance.post.return_value = mock_response
-    mock_httpx_client.return_value.__aenter__.return_value = mock_client_instance
     
     user_token = "valid_user_token"
     
@@ -54,4 +54,43 @@ async def test_action_execution_unauthorized():
             json={"parameters": {"employee_id": "123"}}
         )
     
-    assert response.status_code == 401
\ No newline at end of file
+    assert response.status_code == 401
+@pytest.mark.asyncio
+async def test_batch_execution_returns_per_item_results(mock_policy_engine, machine_token):
+    mock_policy_engine.evaluate.return_value = PolicyEvaluationResult(allowed=True)
+
+    transport = ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {machine_token}"}
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post(
+            "/actions/batch",
+            json={"requests": [
+                {"domain": "workday.hcm", "action": "get_employee", "parameters": {"employee_id": "EMP001"}},
+                {"domain": "workday.hcm", "action": "get_employee", "parameters": {"employee_id": "EMP999"}},
+                {"domain": "workday.hcm", "action": "no_such_action", "parameters": {}},
+            ]},
+            headers=headers
+        )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == 3
+    assert results[0]["status_code"] == 200
+    assert results[0]["body"]["data"]["employee_id"] == "EMP001"
+    assert "provenance" in results[0]["body"]["meta"]
+    # Failures are isolated per item and carry the regular error envelope
+    assert results[1]["status_code"] >= 400
+    assert "error_code" in results[1]["body"]
+    assert results[2]["status_code"] == 400
+    assert "Unknown capability" in results[2]["body"]["message"]
+
+@pytest.mark.asyncio
+async def test_batch_execution_requires_auth():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post(
+            "/actions/batch",
+            json={"requests": [{"domain": "workday.hcm", "action": "get_employee", "parameters": {}}]}
+        )
+
+    assert response.status_code == 401
@@ -18,6 +18,7 @@ async def test_audit_log_contains_provenance_fields(tmp_path):
     }
     
     logger.log_event("test_action", {"foo": "bar"}, actor="test-actor", token_claims=token_claims)
+    logger.flush()
     
     # Read back
     with open(log_file, "r") as f:
@@ -38,3 +38,68 @@ async def test_get_recent_audit_logs_forbidden(user_token):
         )
 
     assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_get_recent_audit_logs_paginates_and_filters(admin_token):
+    log_file = Path("logs") / "audit.jsonl"
+    log_file.parent.mkdir(exist_ok=True)
+    with open(log_file, "w") as f:
+        for i in range(10):
+            f.write(json.dumps({"seq": i, "event_type": "page_test", "actor": "alice" if i % 2 else "bob"}) + "\n")
+
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        first = (await ac.get("/audit/recent?limit=2&actor=alice&event_type=page_test", headers=headers)).json()
+        second = (await ac.get(
+            f"/audit/recent?limit=2&actor=alice&event_type=page_test&before={first['next_before']}",
+            headers=headers,
+        )).json()
+
+    assert [e["seq"] for e in first["events"]] == [7, 9]
+    assert [e["seq"] for e in second["events"]] == [3, 5]
+
+@pytest.mark.asyncio
+async def test_search_audit_logs_by_actor_and_employee(tmp_path, monkeypatch, admin_token):
+    from src.lib.config_validator import settings
+
+    log_file = tmp_path / "audit.jsonl"
+    with open(log_file, "w") as f:
+        for i in range(6):
+            f.write(json.dumps({
+                "timestamp": f"2026-01-01T00:00:0{i}+00:00",
+                "event_type": "get_employee",
+                "actor": "alice" if i % 2 else "bob",
+                "payload": {"employee_id": "EMP001" if i < 4 else "EMP002"},
+                "seq": i,
+            }) + "\n")
+    monkeypatch.setattr(settings, "AUDIT_LOG_PATH", str(log_file))
+    monkeypatch.setattr(settings, "AUDIT_INDEX_PATH", str(tmp_path / "audit-index.sqlite3"))
+
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(
+            "/audit/search?actor=alice&employee_id=EMP001&start=2026-01-01T00:00:00Z&limit=1",
+            headers=headers,
+        )
+        first = response.json()
+        second = (await ac.get(
+            f"/audit/search?actor=alice&employee_id=EMP001&limit=1&cursor={first['next_cursor']}",
+            headers=headers,
+        )).json()
+        bad_cursor = await ac.get("/audit/search?cursor=nope", headers=headers)
+
+    assert response.status_code == 200
+    assert [e["seq"] for e in first["events"]] == [3]
+    assert [e["seq"] for e in second["events"]] == [1]
+    assert second["next_cursor"] is None
+    assert bad_cursor.status_code == 400
+
+@pytest.mark.asyncio
+async def test_search_audit_logs_forbidden(user_token):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/audit/search", headers={"Authorization": f"Bearer {user_token}"})
+
+    assert response.status_code == 403
@@ -1,7 +1,14 @@
+import asyncio
+import json
+import time
 import pytest
 from httpx import AsyncClient, ASGITransport
 from src.main import app
 from src.domain.services.policy_engine import PolicyEvaluationResult
+from src.adapters.filesystem.local_flow_runner import LocalFlowRunnerAdapter
+from src.api.dependencies import get_flow_runner_adapter
+from src.domain.ports.connector import ConnectorPort
+from src.domain.services.flow_engine import FlowEngine
 
 @pytest.mark.asyncio
 async def test_start_flow_success(mock_policy_engine, admin_token):
@@ -42,3 +49,120 @@ async def test_start_flow_forbidden(mock_policy_engine, machine_token):
     
     # Should be 403 Forbidden
     assert response.status_code == 403
+
+@pytest.fixture
+def flow_runner():
+    runner = LocalFlowRunnerAdapter()
+    app.dependency_overrides[get_flow_runner_adapter] = lambda: runner
+    yield runner
+    del app.dependency_overrides[get_flow_runner_adapter]
+
+async def _progress_later(runner, flow_id):
+    await asyncio.sleep(0.05)
+    runner._update(flow_id, {"current_step": "workday.hcm.get_employee"})
+    await asyncio.sleep(0.05)
+    runner._update(flow_id, {"status": "COMPLETED", "current_step": None, "result": {"steps": {}}})
+
+@pytest.mark.asyncio
+async def test_long_poll_returns_on_change(flow_runner, user_token):
+    flow_id = await flow_runner.start_flow("hr", "onboarding", {}, "user@local.test")
+    headers = {"Authorization": f"Bearer {user_token}"}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        progress = asyncio.create_task(_progress_later(flow_runner, flow_id))
+        start = time.perf_counter()
+        response = await ac.get(f"/flows/{flow_id}?wait=10s", headers=headers)
+        elapsed = time.perf_counter() - start
+        await progress
+
+        assert response.status_code == 200
+        assert response.json()["current_step"] == "workday.hcm.get_employee"
+        assert elapsed < 2
+
+        # Terminal flows answer immediately; unchanged flows answer after the wait
+        done = await ac.get(f"/flows/{flow_id}?wait=10s", headers=headers)
+        assert done.json()["status"] == "COMPLETED"
+
+        idle_id = await flow_runner.start_flow("hr", "onboarding", {}, "user@local.test")
+        idle = await ac.get(f"/flows/{idle_id}?wait=100ms", headers=headers)
+        assert idle.json()["status"] == "RUNNING"
+
+        bad = await ac.get(f"/flows/{idle_id}?wait=soon", headers=headers)
+        assert bad.status_code == 400
+
+@pytest.mark.asyncio
+async def test_event_stream_follows_flow_until_finished(flow_runner, user_token, admin_token):
+    flow_id = await flow_runner.start_flow("hr", "onboarding", {}, "admin@local.test")
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        denied = await ac.get(f"/flows/{flow_id}/events", headers={"Authorization": f"Bearer {user_token}"})
+        assert denied.status_code == 403
+
+        progress = asyncio.create_task(_progress_later(flow_runner, flow_id))
+        response = await ac.get(f"/flows/{flow_id}/events", headers={"Authorization": f"Bearer {admin_token}"})
+        await progress
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+    assert [(e["status"], e["current_step"]) for e in events] == [
+        ("RUNNING", "init"),
+        ("RUNNING", "workday.hcm.get_employee"),
+        ("COMPLETED", None),
+    ]
+
+class StalledConnector(ConnectorPort):
+    async def execute(self, action, parameters):
+        await asyncio.Event().wait()
+
+@pytest.mark.asyncio
+async def test_start_flow_returns_429_with_retry_after_when_saturated(mock_policy_engine, user_token):
+    engine = FlowEngine(StalledConnector(), max_workers=1, max_queue_depth=1)
+    app.dependency_overrides[get_flow_runner_adapter] = lambda: LocalFlowRunnerAdapter(engine)
+    headers = {"Authorization": f"Bearer {user_token}"}
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            running = await ac.post("/flows/hr/onboarding", json={"parameters": {}}, headers=headers)
+            await asyncio.sleep(0.01)
+            queued = await ac.post("/flows/hr/onboarding", json={"parameters": {}}, headers=headers)
+            rejected = await ac.post("/flows/hr/onboarding", json={"parameters": {}}, headers=headers)
+    finally:
+        del app.dependency_overrides[get_flow_runner_adapter]
+        await engine.shutdown()
+
+    assert (running.status_code, queued.status_code) == (202, 202)
+    assert rejected.status_code == 429
+    assert int(rejected.headers["Retry-After"]) >= 1
+    assert rejected.json()["error_code"] == "RATE_LIMITED"
+
+@pytest.mark.asyncio
+async def test_list_flows_pages_through_own_flows_only(flow_runner, user_token, admin_token):
+    mine = [await flow_runner.start_flow("hr", "onboarding", {}, "user@local.test") for _ in range(5)]
+    await flow_runner.start_flow("hr", "onboarding", {}, "admin@local.test")
+    flow_runner._update(mine[0], {"status": "COMPLETED", "current_step": None})
+    headers = {"Authorization": f"Bearer {user_token}"}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        pages, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            body = (await ac.get("/flows", params=params, headers=headers)).json()
+            pages.append([flow["flow_id"] for flow in body["flows"]])
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+
+        completed = (await ac.get("/flows", params={"status": "COMPLETED"}, headers=headers)).json()
+        future = (await ac.get("/flows", params={"since": "2999-01-01T00:00:00"}, headers=headers)).json()
+        bad = await ac.get("/flows", params={"cursor": "garbage"}, headers=headers)
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert sorted(sum(pages, [])) == sorted(mine)
+    assert [flow["flow_id"] for flow in completed["flows"]] == [mine[0]]
+    assert completed["flows"][0]["capability"] == "hr.onboarding"
+    assert future["count"] == 0
+    assert bad.status_code == 400
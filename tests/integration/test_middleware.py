@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import AsyncClient, ASGITransport
+from src.api.middleware import RequestContextMiddleware
+from src.main import app
+from src.lib.config_validator import settings
+
+def _bare_app():
+    bare = FastAPI()
+    bare.add_middleware(RequestContextMiddleware)
+    return bare
+
+@pytest.mark.asyncio
+async def test_security_headers_and_request_id_are_added():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/health", headers={"X-Request-ID": "req-123"})
+
+    assert response.headers["X-Request-ID"] == "req-123"
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert response.headers["Referrer-Policy"] == "no-referrer"
+
+@pytest.mark.asyncio
+async def test_access_log_includes_status_and_principal(caplog, admin_token):
+    transport = ASGITransport(app=app)
+    with caplog.at_level(logging.INFO, logger="api.requests"):
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            await ac.get("/audit/recent?limit=1", headers={"Authorization": f"Bearer {admin_token}"})
+
+    records = [r for r in caplog.records if r.name == "api.requests"]
+    assert records
+    data = records[-1].extra_data
+    assert data["path"] == "/audit/recent"
+    assert data["query_params"] == {"limit": "1"}
+    assert data["status_code"] == 200
+    assert data["principal"]["subject"]
+
+@pytest.mark.asyncio
+async def test_unhandled_error_is_logged_as_500(caplog):
+    bare = _bare_app()
+
+    @bare.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    transport = ASGITransport(app=bare, raise_app_exceptions=False)
+    with caplog.at_level(logging.INFO, logger="api.requests"):
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get("/boom")
+
+    assert response.status_code == 500
+    assert [r.extra_data["status_code"] for r in caplog.records if r.name == "api.requests"] == [500]
+
+@pytest.mark.asyncio
+async def test_deadline_does_not_cut_off_a_started_stream(monkeypatch):
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT_SECONDS", 0.1)
+    bare = _bare_app()
+
+    @bare.get("/stream")
+    async def stream():
+        async def body():
+            yield b"first,"
+            await asyncio.sleep(0.2)
+            yield b"second"
+        return StreamingResponse(body())
+
+    transport = ASGITransport(app=bare)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/stream")
+
+    assert response.status_code == 200
+    assert response.text == "first,second"
+    assert "X-Request-ID" in response.headers
@@ -98,7 +98,7 @@ async def test_2_1_machine_triggers_onboarding(async_client, machine_token):
     """Test 2.1: Machine Workflow Triggers Onboarding."""
     response = await async_client.post(
         "/flows/hr/onboarding",
-        json={"parameters": {"employee_name": "Jane Doe"}},
+        json={"parameters": {"employee_name": "Jane Doe", "employee_id": "EMP001"}},
         headers={"Authorization": f"Bearer {machine_token}"}
     )
     
@@ -111,7 +111,8 @@ async def test_2_1_machine_triggers_onboarding(async_client, machine_token):
         headers={"Authorization": f"Bearer {machine_token}"}
     )
     assert status_resp.status_code == 200
-    assert status_resp.json()["status"] == "RUNNING"
+    # The flow executes in the background; depending on timing it may already be done
+    assert status_resp.json()["status"] in ("RUNNING", "COMPLETED")
 
 @pytest.mark.asyncio
 async def test_2_2_ai_agent_denied_flow(async_client, agent_token):
@@ -44,3 +44,36 @@ async def test_request_within_timeout(monkeypatch):
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
     assert "X-Request-ID" in response.headers
+
+@pytest.mark.asyncio
+async def test_request_honors_caller_deadline(monkeypatch):
+    # Server allows 1s, but the caller only has 100ms left
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT_SECONDS", 1.0)
+
+    @app.get("/test-deadline-route")
+    async def deadline_route():
+        await asyncio.sleep(0.5)
+        return {"status": "ok"}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/test-deadline-route", headers={"X-Request-Timeout-Ms": "100"})
+
+    assert response.status_code == 504
+    assert response.json()["details"]["timeout_seconds"] == 0.1
+
+@pytest.mark.asyncio
+async def test_caller_deadline_cannot_extend_server_timeout(monkeypatch):
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT_SECONDS", 0.1)
+
+    @app.get("/test-long-deadline-route")
+    async def long_deadline_route():
+        await asyncio.sleep(0.5)
+        return {"status": "ok"}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/test-long-deadline-route", headers={"X-Request-Timeout-Ms": "60000"})
+
+    assert response.status_code == 504
+    assert response.json()["details"]["timeout_seconds"] == 0.1
@@ -5,7 +5,7 @@ from src.api.dependencies import provider, get_flow_runner_adapter
 from src.domain.ports.flow_runner import FlowRunnerPort
 
 class MockFlowRunner(FlowRunnerPort):
-    async def start_flow(self, domain, flow, params, principal_id):
+    async def start_flow(self, domain, flow, params, principal_id, context=None, callback_url=None):
         return "flow-123"
     async def get_flow_status(self, flow_id):
         if flow_id == "existing-flow":
@@ -32,4 +32,5 @@ def test_logger_allows_temp_dir(tmp_path):
     assert logger.log_path == log_file.resolve()
     
     logger.log_event("test", {"foo": "bar"})
+    logger.flush()
     assert log_file.exists()
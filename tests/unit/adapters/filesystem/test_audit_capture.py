@@ -0,0 +1,48 @@
+import json
+import pytest
+from src.adapters.filesystem.logger import JSONLLogger
+
+PARAMS = {
+    "employee_id": "EMP001",
+    "reason": "Call me at 555-123-4567",
+    "principal_id": "user@local.test",
+    "principal_groups": ["employees"],
+    "token_claims": {"jti": "tok-1", "scope": ["openid"]},
+}
+
+@pytest.fixture
+def audit(tmp_path):
+    return JSONLLogger(log_path=str(tmp_path / "audit.jsonl"))
+
+def _last_entry(audit):
+    audit.flush()
+    with open(audit.log_path, "r", encoding="utf-8") as f:
+        return json.loads(f.readlines()[-1])
+
+def test_basic_level_logs_compact_identifiers_only(audit):
+    audit.log_event("get_employee", PARAMS, actor="user@local.test", audit_level="BASIC", result={"name": "Jane"})
+    entry = _last_entry(audit)
+
+    assert entry["audit_level"] == "BASIC"
+    assert entry["payload"] == {"employee_id": "EMP001"}
+    assert "response_digest" not in entry
+
+def test_verbose_level_logs_redacted_payload_and_response_digest(audit):
+    audit.log_event("get_employee", PARAMS, actor="user@local.test", audit_level="VERBOSE", result={"name": "Jane"})
+    entry = _last_entry(audit)
+
+    assert entry["audit_level"] == "VERBOSE"
+    assert entry["payload"]["reason"] == "Call me at [REDACTED_PHONE]"
+    assert entry["payload"]["principal_groups"] == ["employees"]
+    assert entry["response_digest"].startswith("sha256:")
+
+    # Digest is stable for equal results regardless of key order
+    audit.log_event("get_employee", PARAMS, audit_level="VERBOSE", result={"name": "Jane"})
+    assert _last_entry(audit)["response_digest"] == entry["response_digest"]
+
+def test_unspecified_level_keeps_full_redacted_payload(audit):
+    audit.log_event("get_employee", PARAMS)
+    entry = _last_entry(audit)
+
+    assert "audit_level" not in entry
+    assert entry["payload"]["token_claims"] == {"jti": "tok-1", "scope": ["openid"]}
@@ -0,0 +1,72 @@
+import json
+import pytest
+from src.adapters.filesystem.audit_index import AuditIndex
+from src.adapters.filesystem.audit_backends import RotationPolicy
+from src.adapters.filesystem.audit_writer import AuditFileWriter
+
+def _event(i, actor="alice", employee_id="EMP001", event_type="get_employee"):
+    return {
+        "timestamp": f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}+00:00",
+        "event_type": event_type,
+        "actor": actor,
+        "token_id": f"jti-{i}",
+        "payload": {"employee_id": employee_id},
+        "seq": i,
+    }
+
+@pytest.fixture
+def index(tmp_path):
+    idx = AuditIndex(tmp_path / "index.sqlite3")
+    yield idx
+    idx.close()
+
+def test_writer_feeds_index_incrementally(tmp_path, index):
+    writer = AuditFileWriter(tmp_path / "audit.jsonl", buffered=False)
+    writer.add_listener(index.add_events)
+    writer.add_listener(index.add_events)  # registering twice is a no-op
+
+    writer.write(_event(1))
+    writer.write(_event(2, actor="bob"))
+    writer.close()
+
+    events, cursor = index.search(actor="alice")
+    assert [e["seq"] for e in events] == [1]
+    assert cursor is None
+
+def test_search_filters_by_actor_employee_and_time_range(index):
+    events = [_event(i, actor="alice" if i % 2 else "bob", employee_id=f"EMP{i % 3:03d}") for i in range(30)]
+    index.add_events(events, [json.dumps(e) for e in events])
+
+    start = 1767225600 + 5   # 2026-01-01T00:00:05Z
+    end = 1767225600 + 20
+    found, _ = index.search(actor="alice", employee_id="EMP001", start=start, end=end)
+
+    assert [e["seq"] for e in found] == [19, 13, 7]
+
+def test_search_paginates_newest_first(index):
+    events = [_event(i) for i in range(7)]
+    index.add_events(events, [json.dumps(e) for e in events])
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = index.search(limit=3, cursor=cursor)
+        pages.append([e["seq"] for e in page])
+        if cursor is None:
+            break
+
+    assert pages == [[6, 5, 4], [3, 2, 1], [0]]
+
+def test_rebuild_indexes_rotated_segments_without_duplicates(tmp_path, index):
+    log_path = tmp_path / "audit.jsonl"
+    writer = AuditFileWriter(log_path, buffered=False, rotation=RotationPolicy(max_bytes=300))
+    writer.add_listener(index.add_events)
+    for i in range(10):
+        writer.write(_event(i))
+    writer.close()
+
+    assert not index.is_built(log_path)
+    assert index.rebuild(log_path) == 10
+    assert index.is_built(log_path)
+
+    events, _ = index.search(limit=100)
+    assert sorted(e["seq"] for e in events) == list(range(10))
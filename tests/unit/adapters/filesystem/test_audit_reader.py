@@ -0,0 +1,47 @@
+import json
+import pytest
+from src.adapters.filesystem.audit_reader import iter_lines_reverse, tail_events
+
+@pytest.fixture
+def audit_file(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(50):
+            event = {"seq": i, "event_type": "read" if i % 2 else "write", "actor": f"user{i % 3}"}
+            f.write(json.dumps(event) + "\n")
+    return path
+
+@pytest.mark.parametrize("block_size", [7, 64, 65536])
+def test_reverse_lines_match_file_regardless_of_block_size(audit_file, block_size):
+    lines = [line for _, line in iter_lines_reverse(audit_file, block_size=block_size)]
+    expected = audit_file.read_bytes().splitlines()
+
+    assert lines == list(reversed(expected))
+
+def test_reverse_offsets_point_at_line_starts(audit_file):
+    data = audit_file.read_bytes()
+    for offset, line in iter_lines_reverse(audit_file, block_size=13):
+        assert data[offset:offset + len(line)] == line
+
+def test_tail_paginates_with_before_cursor(audit_file):
+    first, cursor = tail_events(audit_file, limit=20)
+    second, cursor = tail_events(audit_file, limit=20, before=cursor)
+    third, cursor = tail_events(audit_file, limit=20, before=cursor)
+
+    assert [e["seq"] for e in first] == list(range(30, 50))
+    assert [e["seq"] for e in second] == list(range(10, 30))
+    assert [e["seq"] for e in third] == list(range(0, 10))
+    assert cursor is None
+
+def test_tail_filters_by_event_type_and_actor(audit_file):
+    events, _ = tail_events(audit_file, limit=5, event_type="read", actor="user1")
+
+    assert [e["seq"] for e in events] == [1, 7, 13, 19, 25, 31, 37, 43, 49][-5:]
+    assert all(e["event_type"] == "read" and e["actor"] == "user1" for e in events)
+
+def test_tail_skips_partial_trailing_line(audit_file):
+    with open(audit_file, "a", encoding="utf-8") as f:
+        f.write('{"seq": 50, "event_ty')
+
+    events, _ = tail_events(audit_file, limit=1)
+    assert events[0]["seq"] == 49
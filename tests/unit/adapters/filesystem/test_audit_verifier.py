@@ -0,0 +1,143 @@
+import json
+import subprocess
+import pytest
+from src.adapters.filesystem.audit_backends import GENESIS_HASH, RotationPolicy, list_segments, read_manifest
+from src.adapters.filesystem.audit_verifier import plan_units, verify_audit_log
+from src.adapters.filesystem.audit_writer import AuditFileWriter
+
+def _writer(path, compression=None, checkpoint_interval=10):
+    rotation = RotationPolicy(max_bytes=10**9, compression=compression)
+    return AuditFileWriter(
+        path, buffered=False, rotation=rotation, hash_chain=True, checkpoint_interval=checkpoint_interval
+    )
+
+def _write_segments(path, segments=3, per_segment=25, compression=None):
+    w = _writer(path, compression=compression)
+    seq = 0
+    for _ in range(segments):
+        for _ in range(per_segment):
+            w.write({"seq": seq, "event_type": "test"})
+            seq += 1
+        w.rotate()
+    w.write({"seq": seq, "event_type": "test"})
+    w.close()
+    return seq + 1
+
+def test_records_carry_prev_hash_from_genesis(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    w = AuditFileWriter(path, buffered=False, hash_chain=True)
+    w.write({"seq": 0})
+    w.write({"seq": 1})
+    w.close()
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert records[0]["prev_hash"] == GENESIS_HASH
+    assert records[1]["prev_hash"] != GENESIS_HASH
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_intact_chain_across_segments_verifies(tmp_path, compression):
+    path = tmp_path / "audit.jsonl"
+    total = _write_segments(path, compression=compression)
+
+    report = verify_audit_log(path, workers=2)
+
+    assert report.ok, report.errors
+    assert report.records == total
+    assert report.anchored
+    assert len(report.files) == 4
+
+def test_chain_resumes_after_restart(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    _write_segments(path, segments=1)
+
+    # A new writer (process restart) continues the existing chain
+    w = _writer(path)
+    w.write({"seq": "after-restart"})
+    w.rotate()
+    w.write({"seq": "after-rotation"})
+    w.close()
+
+    assert verify_audit_log(path, workers=1).ok
+
+def test_tampered_record_is_detected(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    _write_segments(path, segments=2)
+    segment = list_segments(path)[0]
+
+    lines = segment.read_text().splitlines()
+    record = json.loads(lines[12])
+    record["actor"] = "mallory"
+    lines[12] = json.dumps(record)
+    segment.write_text("\n".join(lines) + "\n")
+
+    report = verify_audit_log(path, workers=1)
+
+    assert not report.ok
+    assert any(f"{segment.name} record 13" in e for e in report.errors)
+
+def test_deleted_record_is_detected(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    _write_segments(path, segments=2)
+    segment = list_segments(path)[1]
+
+    lines = segment.read_text().splitlines()
+    del lines[0]
+    segment.write_text("\n".join(lines) + "\n")
+
+    report = verify_audit_log(path, workers=1)
+
+    assert not report.ok
+    assert any("manifest says" in e for e in report.errors)
+
+def test_checkpoints_split_segments_into_chunks(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    _write_segments(path, segments=1, per_segment=35)
+    segment = list_segments(path)[0]
+
+    manifest = read_manifest(segment)
+    assert [c["record"] for c in manifest["checkpoints"]] == [0, 10, 20, 30]
+    assert manifest["first_prev_hash"] == GENESIS_HASH
+
+    plan = plan_units(path)
+    assert len(plan[0][2]) == 4
+    assert len(plan_units(path, chunk_records=20)[0][2]) == 2
+
+    report = verify_audit_log(path, workers=2)
+    assert report.ok, report.errors
+    assert report.files[0]["chunks"] == 4
+
+def test_unchained_records_are_counted_not_failed(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    path.write_text(json.dumps({"seq": "legacy"}) + "\n")
+
+    w = AuditFileWriter(path, buffered=False, hash_chain=True)
+    w.write({"seq": 1})
+    w.close()
+
+    report = verify_audit_log(path, workers=1)
+    assert report.ok
+    assert report.unchained == 1
+    assert not report.anchored
+
+def test_cli_reports_tampering(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    _write_segments(path, segments=1, per_segment=5)
+
+    ok = subprocess.run(
+        ["python3", "scripts/verify-audit", str(path), "--workers", "1", "--format", "json"],
+        capture_output=True, text=True
+    )
+    assert ok.returncode == 0
+    assert json.loads(ok.stdout)["records"] == 6
+
+    segment = list_segments(path)[0]
+    seg_lines = segment.read_text().splitlines()
+    seg_lines[2] = seg_lines[2].replace('"test"', '"edited"')
+    segment.write_text("\n".join(seg_lines) + "\n")
+
+    bad = subprocess.run(
+        ["python3", "scripts/verify-audit", str(path), "--workers", "1"],
+        capture_output=True, text=True
+    )
+    assert bad.returncode == 1
+    assert "problem" in bad.stdout
@@ -0,0 +1,190 @@
+import json
+import threading
+import pytest
+from unittest.mock import patch
+from src.adapters.filesystem.audit_backends import RotationPolicy, list_segments, open_segment, read_manifest
+from src.adapters.filesystem.audit_writer import AuditFileWriter, create_audit_sink
+from src.adapters.filesystem.logger import JSONLLogger
+
+def _read_lines(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+@pytest.fixture
+def writer(tmp_path):
+    w = AuditFileWriter(tmp_path / "audit.jsonl", flush_interval=0.01, batch_size=10)
+    yield w
+    w.close()
+
+def test_buffered_writes_are_flushed_in_order(writer):
+    for i in range(25):
+        writer.write({"seq": i})
+
+    assert writer.flush(timeout=5)
+    assert [e["seq"] for e in _read_lines(writer.path)] == list(range(25))
+
+def test_write_does_not_touch_disk_on_caller_thread(writer):
+    callers = set()
+    original = writer._write_batch
+
+    def spy(batch):
+        callers.add(threading.current_thread().name)
+        original(batch)
+
+    with patch.object(writer, "_write_batch", side_effect=spy):
+        writer.write({"seq": 1})
+        writer.flush(timeout=5)
+
+    assert threading.current_thread().name not in callers
+    assert all(name.startswith("audit-writer:") for name in callers)
+
+def test_close_drains_queue(tmp_path):
+    w = AuditFileWriter(tmp_path / "audit.jsonl", flush_interval=10)
+    for i in range(5):
+        w.write({"seq": i})
+    w.close()
+
+    assert len(_read_lines(w.path)) == 5
+
+def test_fsync_mode_syncs_each_batch(tmp_path):
+    w = AuditFileWriter(tmp_path / "audit.jsonl", flush_interval=0.01, fsync=True)
+    with patch("src.adapters.filesystem.audit_backends.os.fsync") as mock_fsync:
+        w.write({"seq": 1})
+        w.flush(timeout=5)
+    w.close()
+
+    assert mock_fsync.called
+
+def test_unbuffered_mode_writes_synchronously(tmp_path):
+    w = AuditFileWriter(tmp_path / "audit.jsonl", buffered=False)
+    w.write({"seq": 1})
+
+    assert _read_lines(w.path) == [{"seq": 1}]
+    assert w._thread is None
+    w.close()
+
+def test_loggers_share_one_writer_per_file(tmp_path):
+    path = tmp_path / "shared.jsonl"
+    first = JSONLLogger(log_path=str(path))
+    second = JSONLLogger(log_path=str(path))
+
+    assert first._sink is second._sink
+
+    first.log_event("a", {})
+    second.log_event("b", {})
+    first.flush()
+
+    assert [e["event_type"] for e in _read_lines(path)] == ["a", "b"]
+
+def _rotating_writer(path, **policy):
+    return AuditFileWriter(path, buffered=False, rotation=RotationPolicy(**policy))
+
+def _read_segment(segment):
+    with open_segment(segment) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def test_size_rotation_closes_compressed_segments_with_manifest(tmp_path):
+    w = _rotating_writer(tmp_path / "audit.jsonl", max_bytes=200)
+    for i in range(20):
+        w.write({"timestamp": f"2026-01-01T00:00:{i:02d}+00:00", "seq": i})
+    w.close()
+
+    segments = list_segments(w.path)
+    assert len(segments) > 1
+    assert all(s.name.endswith(".jsonl.gz") for s in segments)
+
+    events = [e for s in segments for e in _read_segment(s)] + _read_lines(w.path)
+    assert [e["seq"] for e in events] == list(range(20))
+
+    manifest = read_manifest(segments[0])
+    first_events = _read_segment(segments[0])
+    assert manifest["segment"] == segments[0].name
+    assert manifest["compression"] == "gzip"
+    assert manifest["event_count"] == len(first_events)
+    assert manifest["first_timestamp"] == first_events[0]["timestamp"]
+    assert manifest["last_timestamp"] == first_events[-1]["timestamp"]
+
+def test_time_rotation_starts_new_segment(tmp_path):
+    w = _rotating_writer(tmp_path / "audit.jsonl", interval_seconds=60, compression=None)
+    with patch("src.adapters.filesystem.audit_backends.time.time", return_value=1_000_000.0):
+        w.write({"seq": 1})
+    with patch("src.adapters.filesystem.audit_backends.time.time", return_value=1_000_061.0):
+        w.write({"seq": 2})
+    w.close()
+
+    segments = list_segments(w.path)
+    assert [s.name for s in segments] == ["audit.19700112T134640000000Z.jsonl"]
+    assert _read_segment(segments[0]) == [{"seq": 1}]
+    assert _read_lines(w.path) == [{"seq": 2}]
+
+def test_retention_keeps_newest_segments(tmp_path):
+    w = _rotating_writer(tmp_path / "audit.jsonl", max_bytes=1, retention_segments=2)
+    for i in range(6):
+        w.write({"seq": i})
+    w.close()
+
+    segments = list_segments(w.path)
+    assert len(segments) == 2
+    assert [_read_segment(s)[0]["seq"] for s in segments] == [3, 4]
+    assert len(list(tmp_path.glob("*.manifest.json"))) == 2
+
+def test_rotation_resumes_existing_active_file(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    path.write_text('{"timestamp": "2026-01-01T00:00:00+00:00", "seq": 0}\n')
+
+    w = _rotating_writer(path, max_bytes=10_000, compression=None)
+    w.write({"timestamp": "2026-01-01T00:00:01+00:00", "seq": 1})
+    segment = w.rotate()
+    w.close()
+
+    manifest = read_manifest(segment)
+    assert manifest["event_count"] == 2
+    assert manifest["first_timestamp"] == "2026-01-01T00:00:00+00:00"
+    assert segment.name == "audit.20260101T000000000000Z.jsonl"
+
+def test_socket_backend_streams_batches_to_collector(tmp_path):
+    import socket
+
+    address = tmp_path / "collector.sock"
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(address))
+    server.listen(1)
+    received = []
+
+    def collect():
+        conn, _ = server.accept()
+        with conn:
+            buffer = b""
+            while chunk := conn.recv(4096):
+                buffer += chunk
+        received.extend(json.loads(line) for line in buffer.splitlines())
+
+    collector = threading.Thread(target=collect)
+    collector.start()
+
+    sink = create_audit_sink(tmp_path / "audit.jsonl", backend="socket", socket_address=f"unix://{address}")
+    for i in range(5):
+        sink.write({"seq": i})
+    sink.close()
+    collector.join(timeout=5)
+    server.close()
+
+    assert [e["seq"] for e in received] == list(range(5))
+    assert not (tmp_path / "audit.jsonl").exists()
+
+def test_create_audit_sink_validates_backend(tmp_path):
+    with pytest.raises(ValueError, match="Unknown audit backend"):
+        create_audit_sink(tmp_path / "audit.jsonl", backend="kafka")
+    with pytest.raises(ValueError, match="socket address"):
+        create_audit_sink(tmp_path / "audit.jsonl", backend="socket")
+
+def test_jsonl_backend_never_rotates(tmp_path):
+    sink = create_audit_sink(
+        tmp_path / "audit.jsonl", backend="jsonl", buffered=False, rotation=RotationPolicy(max_bytes=1)
+    )
+    for i in range(3):
+        sink.write({"seq": i})
+    sink.close()
+
+    assert list_segments(tmp_path / "audit.jsonl") == []
+    assert len(_read_lines(tmp_path / "audit.jsonl")) == 3
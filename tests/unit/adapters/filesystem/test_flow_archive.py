@@ -0,0 +1,105 @@
+import asyncio
+import pytest
+from src.adapters.filesystem.flow_archive import FlowArchive
+from src.adapters.filesystem.flow_store import FlowStore, SQLiteFlowRunnerAdapter
+from src.adapters.filesystem.local_flow_runner import LocalFlowRunnerAdapter
+
+@pytest.fixture
+def archive(tmp_path):
+    a = FlowArchive(tmp_path / "archive.sqlite3")
+    yield a
+    a.close()
+
+async def _run_to_completion(runner, count, principal="user"):
+    """Start flows (no engine) and finish them through the runner's update callback."""
+    flow_ids = []
+    for i in range(count):
+        flow_id = await runner.start_flow("hr", "lookup", {"n": i}, principal)
+        runner._update(flow_id, {"status": "COMPLETED", "current_step": None, "result": {"n": i}})
+        flow_ids.append(flow_id)
+    return flow_ids
+
+async def _drain_spills(runner):
+    while runner._spilling:
+        await asyncio.sleep(0.01)
+
+@pytest.mark.asyncio
+async def test_memory_stays_bounded_and_archived_flows_stay_readable(archive):
+    runner = LocalFlowRunnerAdapter(max_finished=5, archive=archive)
+    flow_ids = await _run_to_completion(runner, 50)
+    running = await runner.start_flow("hr", "lookup", {}, "user")
+    await _drain_spills(runner)
+
+    assert len(runner._executions) == 6
+    assert archive.count() == 45
+    assert running in runner._executions
+    status = await runner.get_flow_status(flow_ids[0])
+    assert (status["status"], status["result"]) == ("COMPLETED", {"n": 0})
+
+@pytest.mark.asyncio
+async def test_ttl_evicts_finished_flows_and_never_running_ones(archive):
+    runner = LocalFlowRunnerAdapter(ttl_seconds=0.05, archive=archive)
+    [finished] = await _run_to_completion(runner, 1)
+    running = await runner.start_flow("hr", "lookup", {}, "user")
+    await asyncio.sleep(0.1)
+
+    # Eviction runs as flows start and finish
+    await runner.start_flow("hr", "lookup", {}, "user")
+    await _drain_spills(runner)
+    assert finished not in runner._executions
+    assert running in runner._executions
+    assert (await runner.get_flow_status(finished))["status"] == "COMPLETED"
+
+@pytest.mark.asyncio
+async def test_evicted_flows_without_archive_are_dropped():
+    runner = LocalFlowRunnerAdapter(max_finished=1)
+    first, second = await _run_to_completion(runner, 2)
+
+    assert await runner.get_flow_status(first) is None
+    assert (await runner.get_flow_status(second))["status"] == "COMPLETED"
+
+@pytest.mark.asyncio
+async def test_sqlite_store_moves_finished_flows_to_archive(tmp_path, archive):
+    store = FlowStore(tmp_path / "flows.sqlite3", flush_interval=0.01)
+    runner = SQLiteFlowRunnerAdapter(store, max_finished=2, archive=archive)
+    flow_ids = await _run_to_completion(runner, 5)
+    running = await runner.start_flow("hr", "lookup", {}, "user")
+    store.flush(timeout=5)
+
+    assert await runner.archive_finished() == 3
+    assert set(store.get_many(flow_ids + [running])) == {*flow_ids[3:], running}
+    assert store.journal(flow_ids[0]) == []
+
+    status = await runner.get_flow_status(flow_ids[0])
+    assert (status["status"], status["principal_id"]) == ("COMPLETED", "user")
+    assert [entry["event"] for entry in status["journal"]] == ["started", "completed"]
+    assert await runner.archive_finished() == 0
+    store.close()
+
+def test_archive_prune_drops_old_records(archive):
+    archive.put_many([{"flow_id": "f1", "status": "COMPLETED"}])
+    assert archive.prune(3600) == 0
+    assert archive.prune(0) == 1
+    assert archive.get_many(["f1"]) == {}
+
+@pytest.mark.asyncio
+async def test_listing_spans_the_store_and_the_archive(tmp_path, archive):
+    store = FlowStore(tmp_path / "flows.sqlite3", flush_interval=0.01)
+    runner = SQLiteFlowRunnerAdapter(store, max_finished=2, archive=archive)
+    finished = await _run_to_completion(runner, 4, principal="agent")
+    running = await runner.start_flow("hr", "lookup", {}, "agent")
+    await runner.start_flow("hr", "lookup", {}, "someone-else")
+    store.flush(timeout=5)
+    await runner.archive_finished()
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = await runner.list_flows("agent", limit=2, cursor=cursor)
+        seen += [record["flow_id"] for record in page]
+        if cursor is None:
+            break
+    assert seen == [running, *reversed(finished)]
+
+    completed, _ = await runner.list_flows("agent", status="COMPLETED", limit=10)
+    assert [record["flow_id"] for record in completed] == list(reversed(finished))
+    store.close()
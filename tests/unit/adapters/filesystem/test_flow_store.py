@@ -0,0 +1,136 @@
+import asyncio
+import pytest
+import yaml
+from unittest.mock import patch
+from src.adapters.filesystem.flow_store import FlowStore, SQLiteFlowRunnerAdapter
+from src.domain.ports.connector import ConnectorPort
+from src.domain.services.capability_registry import CapabilityRegistryService
+from src.domain.services.flow_engine import FlowEngine
+
+@pytest.fixture
+def registry(tmp_path):
+    actions = ["workday.hcm.get_employee", "workday.time.get_balance"]
+    data = {
+        "version": "1.0",
+        "metadata": {"last_updated": "2026-01-31", "owner": "test", "description": "test"},
+        "capabilities": [
+            *[{"id": a, "name": a, "domain": a.rsplit(".", 1)[0], "type": "action", "sensitivity": "low"} for a in actions],
+            {"id": "hr.onboarding", "name": "Onboarding", "domain": "hr", "type": "flow", "sensitivity": "high", "steps": actions},
+        ],
+    }
+    path = tmp_path / "index.yaml"
+    path.write_text(yaml.dump(data))
+    return CapabilityRegistryService(str(path))
+
+@pytest.fixture
+def store(tmp_path):
+    s = FlowStore(tmp_path / "flows.sqlite3", flush_interval=0.01)
+    yield s
+    s.close()
+
+class GatedConnector(ConnectorPort):
+    """Completes steps immediately, except `hold` which waits until released."""
+    def __init__(self, hold=None):
+        self.hold = hold
+        self.release = asyncio.Event()
+        self.calls = []
+
+    async def execute(self, action, parameters):
+        self.calls.append(action)
+        if action == self.hold:
+            await self.release.wait()
+        return {"action": action}
+
+async def _wait_for_status(runner, flow_id, status, timeout=5):
+    async def poll():
+        while (await runner.get_flow_status(flow_id) or {}).get("status") != status:
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+@pytest.mark.asyncio
+async def test_flow_state_is_shared_across_workers_and_journaled(store, registry):
+    worker_a = SQLiteFlowRunnerAdapter(store, FlowEngine(GatedConnector(), registry))
+    flow_id = await worker_a.start_flow("hr", "onboarding", {"employee_id": "EMP001"}, "svc", context={"principal_type": "MACHINE"})
+    await _wait_for_status(worker_a, flow_id, "COMPLETED")
+    store.flush(timeout=5)
+
+    # A second worker process (no engine) reads the same flow from the store
+    worker_b = SQLiteFlowRunnerAdapter(store)
+    status = await worker_b.get_flow_status(flow_id)
+    assert status["status"] == "COMPLETED"
+    assert status["principal_id"] == "svc"
+    assert list(status["result"]["steps"]) == ["workday.hcm.get_employee", "workday.time.get_balance"]
+
+    events = [(e["event"], e["step"]) for e in store.journal(flow_id)]
+    assert events == [
+        ("started", None),
+        ("step_started", "workday.hcm.get_employee"),
+        ("step_completed", "workday.hcm.get_employee"),
+        ("step_started", "workday.time.get_balance"),
+        ("step_completed", "workday.time.get_balance"),
+        ("completed", None),
+    ]
+    assert await worker_b.get_flow_status("missing") is None
+
+@pytest.mark.asyncio
+async def test_running_flow_resumes_from_last_completed_step_after_crash(store, registry):
+    crashed = GatedConnector(hold="get_balance")
+    worker_a = SQLiteFlowRunnerAdapter(store, FlowEngine(crashed, registry), lease_seconds=0.1)
+    flow_id = await worker_a.start_flow("hr", "onboarding", {}, "svc")
+    await asyncio.wait_for(_until(lambda: crashed.calls == ["get_employee", "get_balance"]), 5)
+    store.flush(timeout=5)
+
+    # Worker A dies mid-step: no more heartbeats, its flow stays RUNNING in the store
+    worker_a._maintenance.cancel()
+    await worker_a.engine.shutdown()
+    await asyncio.sleep(0.2)
+
+    survivor = GatedConnector()
+    worker_b = SQLiteFlowRunnerAdapter(store, FlowEngine(survivor, registry), lease_seconds=0.1)
+    assert await worker_b.recover() == 1
+    await _wait_for_status(worker_b, flow_id, "COMPLETED")
+
+    # Only the unfinished step ran again
+    assert survivor.calls == ["get_balance"]
+    status = await worker_b.get_flow_status(flow_id)
+    assert list(status["result"]["steps"]) == ["workday.hcm.get_employee", "workday.time.get_balance"]
+    # Live workers' flows are not claimed
+    assert await worker_b.recover() == 0
+
+@pytest.mark.asyncio
+async def test_concurrent_status_reads_share_one_query(store, registry):
+    worker_a = SQLiteFlowRunnerAdapter(store, FlowEngine(GatedConnector(), registry))
+    flow_ids = [await worker_a.start_flow("hr", "onboarding", {}, "svc") for _ in range(3)]
+    for flow_id in flow_ids:
+        await _wait_for_status(worker_a, flow_id, "COMPLETED")
+    store.flush(timeout=5)
+
+    reader = SQLiteFlowRunnerAdapter(store)
+    with patch.object(store, "get_many", wraps=store.get_many) as spy:
+        statuses = await asyncio.gather(*[reader.get_flow_status(f) for f in flow_ids + flow_ids])
+
+    assert spy.call_count == 1
+    assert [s["flow_id"] for s in statuses] == flow_ids + flow_ids
+
+async def _until(predicate):
+    while not predicate():
+        await asyncio.sleep(0.01)
+
+@pytest.mark.asyncio
+async def test_watchers_wake_on_local_changes_and_poll_remote_flows(store, registry):
+    connector = GatedConnector(hold="get_balance")
+    worker_a = SQLiteFlowRunnerAdapter(store, FlowEngine(connector, registry))
+    flow_id = await worker_a.start_flow("hr", "onboarding", {}, "svc")
+    await asyncio.wait_for(_until(lambda: connector.calls == ["get_employee", "get_balance"]), 5)
+
+    # Local flow: woken by the engine's update, not the timeout
+    version = worker_a.change_version(flow_id)
+    waiter = asyncio.create_task(worker_a.wait_for_change(flow_id, version, timeout=5))
+    await asyncio.sleep(0)
+    connector.release.set()
+    assert await asyncio.wait_for(waiter, 1) is True
+
+    # Another worker has no notifications for it and re-reads after its poll interval
+    worker_b = SQLiteFlowRunnerAdapter(store, remote_poll_interval=0.05)
+    assert await asyncio.wait_for(worker_b.wait_for_change(flow_id, 0, timeout=5), 1) is True
+    assert await worker_b.wait_for_change(flow_id, 0, timeout=0.01) is False
@@ -0,0 +1,119 @@
+import asyncio
+import time
+import pytest
+import yaml
+from src.adapters.filesystem.local_flow_runner import LocalFlowRunnerAdapter
+from src.adapters.webhooks.callbacks import (
+    CallbackDispatcher, CallbackQueue, SIGNATURE_HEADER, TIMESTAMP_HEADER, sign_payload, verify_signature,
+)
+from src.adapters.webhooks.receiver import CallbackReceiver
+from src.domain.ports.connector import ConnectorPort
+from src.domain.services.capability_registry import CapabilityRegistryService
+from src.domain.services.flow_engine import FlowEngine
+
+SECRET = "test-secret"
+
+@pytest.fixture
+def queue(tmp_path):
+    q = CallbackQueue(tmp_path / "callbacks.sqlite3")
+    yield q
+    q.close()
+
+async def _until(predicate, timeout=5):
+    async def poll():
+        while not predicate():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+def test_signature_round_trip():
+    body = b'{"flow_id":"f1"}'
+    timestamp = str(int(time.time()))
+    headers = {TIMESTAMP_HEADER: timestamp, SIGNATURE_HEADER: sign_payload(SECRET, timestamp, body)}
+
+    assert verify_signature(SECRET, headers, body)
+    assert not verify_signature("other-secret", headers, body)
+    assert not verify_signature(SECRET, headers, b'{"flow_id":"f2"}')
+    stale = str(int(time.time()) - 3600)
+    assert not verify_signature(SECRET, {TIMESTAMP_HEADER: stale, SIGNATURE_HEADER: sign_payload(SECRET, stale, body)}, body)
+
+@pytest.mark.asyncio
+async def test_signed_delivery_is_retried_until_accepted(queue):
+    dispatcher = CallbackDispatcher(queue, SECRET, base_delay=0.01, max_delay=0.05, poll_interval=0.05)
+    async with CallbackReceiver(SECRET, fail_first=2) as receiver:
+        delivery_id = await dispatcher.enqueue("flow-1", receiver.url, {"flow_id": "flow-1", "status": "COMPLETED"})
+        [callback] = await receiver.wait_for(1)
+        await _until(lambda: queue.get(delivery_id)["status"] == "delivered")
+
+    await dispatcher.close()
+    assert callback.verified
+    assert callback.payload == {"flow_id": "flow-1", "status": "COMPLETED"}
+    assert callback.headers["x-callback-id"] == delivery_id
+    assert receiver.requests == 3
+    assert queue.get(delivery_id)["attempts"] == 3
+
+@pytest.mark.asyncio
+async def test_delivery_is_abandoned_after_max_attempts_or_client_error(queue):
+    dispatcher = CallbackDispatcher(queue, SECRET, max_attempts=3, base_delay=0.01, max_delay=0.02, poll_interval=0.05)
+    async with CallbackReceiver(SECRET, fail_first=100) as failing, CallbackReceiver(SECRET, status=400) as rejecting:
+        retried = await dispatcher.enqueue("flow-1", failing.url, {"n": 1})
+        rejected = await dispatcher.enqueue("flow-2", rejecting.url, {"n": 2})
+        await _until(lambda: queue.get(retried)["status"] == "dead" and queue.get(rejected)["status"] == "dead")
+
+    await dispatcher.close()
+    assert (failing.requests, queue.get(retried)["last_error"]) == (3, "HTTP 503")
+    assert (rejecting.requests, queue.get(rejected)["attempts"]) == (1, 1)
+
+@pytest.mark.asyncio
+async def test_per_host_concurrency_cap(queue):
+    dispatcher = CallbackDispatcher(queue, SECRET, max_per_host=2, poll_interval=0.05)
+    async with CallbackReceiver(SECRET, delay=0.05) as receiver:
+        for i in range(8):
+            await dispatcher.enqueue(f"flow-{i}", receiver.url, {"n": i})
+        await receiver.wait_for(8)
+
+    await dispatcher.close()
+    assert receiver.max_concurrent == 2
+
+@pytest.mark.asyncio
+async def test_pending_deliveries_survive_a_restart(queue):
+    async with CallbackReceiver(SECRET) as receiver:
+        # Queued by a worker that stopped before delivering
+        delivery_id = queue.put("flow-1", receiver.url, b'{"flow_id":"flow-1"}')
+
+        dispatcher = CallbackDispatcher(queue, SECRET, poll_interval=0.05)
+        dispatcher.start()
+        await receiver.wait_for(1)
+        await _until(lambda: queue.get(delivery_id)["status"] == "delivered")
+
+    await dispatcher.close()
+
+class EchoConnector(ConnectorPort):
+    async def execute(self, action, parameters):
+        return {"action": action}
+
+@pytest.mark.asyncio
+async def test_finished_flow_notifies_its_callback_url(queue, tmp_path):
+    data = {
+        "version": "1.0",
+        "metadata": {"last_updated": "2026-01-31", "owner": "test", "description": "test"},
+        "capabilities": [
+            {"id": "workday.hcm.get_employee", "name": "Get", "domain": "workday.hcm", "type": "action", "sensitivity": "low"},
+            {"id": "hr.lookup", "name": "Lookup", "domain": "hr", "type": "flow", "sensitivity": "low",
+             "steps": ["workday.hcm.get_employee"]},
+        ],
+    }
+    path = tmp_path / "index.yaml"
+    path.write_text(yaml.dump(data))
+    dispatcher = CallbackDispatcher(queue, SECRET, poll_interval=0.05)
+    runner = LocalFlowRunnerAdapter(FlowEngine(EchoConnector(), CapabilityRegistryService(str(path))), callbacks=dispatcher)
+
+    async with CallbackReceiver(SECRET) as receiver:
+        flow_id = await runner.start_flow("hr", "lookup", {}, "user", callback_url=receiver.url)
+        [callback] = await receiver.wait_for(1)
+
+    await dispatcher.close()
+    await runner.engine.shutdown()
+    assert callback.verified
+    assert callback.payload["event"] == "flow.completed"
+    assert callback.payload["flow_id"] == flow_id
+    assert callback.payload["result"] == {"steps": {"workday.hcm.get_employee": {"action": "get_employee"}}}
@@ -95,3 +95,14 @@ async def test_latency_simulation():
             await simulator.execute("workday.hcm.get_employee", {})
             
             assert mock_sleep.called
+
+@pytest.mark.asyncio
+async def test_execute_passes_policy_audit_level_to_audit_log(simulator):
+    simulator.hcm_service.get_employee = AsyncMock(return_value={"employee_id": "EMP001"})
+    simulator.audit_logger = MagicMock()
+
+    await simulator.execute("workday.hcm.get_employee", {"employee_id": "EMP001", "audit_level": "VERBOSE"})
+
+    kwargs = simulator.audit_logger.log_event.call_args.kwargs
+    assert kwargs["audit_level"] == "VERBOSE"
+    assert kwargs["result"] == {"employee_id": "EMP001"}
@@ -0,0 +1,214 @@
+import asyncio
+import pytest
+import yaml
+from src.adapters.filesystem.local_flow_runner import LocalFlowRunnerAdapter
+from src.domain.ports.connector import ConnectorPort
+from src.domain.services.capability_registry import CapabilityRegistryService
+from src.domain.exceptions import FlowAdmissionError
+from src.domain.services.flow_engine import FlowEngine
+
+def _action(cap_id):
+    return {"id": cap_id, "name": cap_id, "domain": cap_id.rsplit(".", 1)[0], "type": "action", "sensitivity": "low"}
+
+@pytest.fixture
+def registry(tmp_path):
+    data = {
+        "version": "1.0",
+        "metadata": {"last_updated": "2026-01-31", "owner": "test", "description": "test"},
+        "capabilities": [
+            _action("workday.hcm.get_employee"),
+            _action("workday.time.get_balance"),
+            {
+                "id": "hr.onboarding", "name": "Onboarding", "domain": "hr", "type": "flow",
+                "sensitivity": "high", "steps": ["workday.hcm.get_employee", "workday.time.get_balance"],
+            },
+            {
+                "id": "hr.lookup", "name": "Lookup", "domain": "hr", "type": "flow",
+                "sensitivity": "low", "steps": ["workday.hcm.get_employee"],
+            },
+            {
+                "id": "hr.offboarding", "name": "Offboarding", "domain": "hr", "type": "flow",
+                "sensitivity": "high", "steps": ["workday.time.get_balance"], "priority": 10,
+            },
+        ],
+    }
+    path = tmp_path / "index.yaml"
+    path.write_text(yaml.dump(data))
+    return CapabilityRegistryService(str(path))
+
+class RecordingConnector(ConnectorPort):
+    def __init__(self, delay=0.0, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    async def execute(self, action, parameters):
+        self.calls.append((action, parameters))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if action == self.fail_on:
+                raise RuntimeError("connector exploded")
+            return {"action": action}
+        finally:
+            self.active -= 1
+
+async def _wait_done(runner, flow_ids, timeout=5):
+    async def poll():
+        while True:
+            statuses = [(await runner.get_flow_status(f))["status"] for f in flow_ids]
+            if all(s != "RUNNING" for s in statuses):
+                return
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+@pytest.mark.asyncio
+async def test_flow_runs_steps_in_order_with_principal_context(registry):
+    connector = RecordingConnector()
+    runner = LocalFlowRunnerAdapter(FlowEngine(connector, registry))
+
+    flow_id = await runner.start_flow(
+        "hr", "onboarding", {"employee_id": "EMP001"}, "svc-workflow", context={"principal_type": "MACHINE"}
+    )
+    await _wait_done(runner, [flow_id])
+
+    status = await runner.get_flow_status(flow_id)
+    assert status["status"] == "COMPLETED"
+    assert status["current_step"] is None
+    assert list(status["result"]["steps"]) == ["workday.hcm.get_employee", "workday.time.get_balance"]
+    assert [action for action, _ in connector.calls] == ["get_employee", "get_balance"]
+    params = connector.calls[0][1]
+    assert params["employee_id"] == "EMP001"
+    assert params["principal_id"] == "svc-workflow"
+    assert params["principal_type"] == "MACHINE"
+    assert params["flow_id"] == flow_id
+
+@pytest.mark.asyncio
+async def test_failing_step_fails_the_flow(registry):
+    runner = LocalFlowRunnerAdapter(FlowEngine(RecordingConnector(fail_on="get_balance"), registry))
+
+    flow_id = await runner.start_flow("hr", "onboarding", {}, "user")
+    await _wait_done(runner, [flow_id])
+
+    status = await runner.get_flow_status(flow_id)
+    assert status["status"] == "FAILED"
+    assert status["current_step"] == "workday.time.get_balance"
+    assert "connector exploded" in status["error"]
+    assert list(status["result"]["steps"]) == ["workday.hcm.get_employee"]
+
+@pytest.mark.asyncio
+async def test_step_timeout_fails_the_flow(registry):
+    runner = LocalFlowRunnerAdapter(FlowEngine(RecordingConnector(delay=1.0), registry, step_timeout=0.05))
+
+    flow_id = await runner.start_flow("hr", "lookup", {}, "user")
+    await _wait_done(runner, [flow_id])
+
+    status = await runner.get_flow_status(flow_id)
+    assert status["status"] == "FAILED"
+    assert "timed out" in status["error"]
+
+@pytest.mark.asyncio
+async def test_unknown_flow_fails(registry):
+    runner = LocalFlowRunnerAdapter(FlowEngine(RecordingConnector(), registry))
+
+    flow_id = await runner.start_flow("hr", "shutdown", {}, "user")
+    await _wait_done(runner, [flow_id])
+
+    assert "No steps defined" in (await runner.get_flow_status(flow_id))["error"]
+
+@pytest.mark.asyncio
+async def test_worker_pool_bounds_concurrent_flows(registry):
+    connector = RecordingConnector(delay=0.05)
+    engine = FlowEngine(connector, registry, max_workers=2, domain_concurrency=10)
+    runner = LocalFlowRunnerAdapter(engine)
+
+    flow_ids = [await runner.start_flow("hr", "lookup", {}, "user") for _ in range(6)]
+    assert engine.pending > 0
+    await _wait_done(runner, flow_ids)
+
+    assert connector.max_active == 2
+    assert [(await runner.get_flow_status(f))["status"] for f in flow_ids] == ["COMPLETED"] * 6
+    await engine.shutdown()
+
+@pytest.mark.asyncio
+async def test_domain_limit_caps_concurrent_steps(registry):
+    connector = RecordingConnector(delay=0.02)
+    engine = FlowEngine(connector, registry, max_workers=8, domain_limits={"workday.hcm": 1})
+    runner = LocalFlowRunnerAdapter(engine)
+
+    flow_ids = [await runner.start_flow("hr", "lookup", {}, "user") for _ in range(5)]
+    await _wait_done(runner, flow_ids)
+
+    assert connector.max_active == 1
+    await engine.shutdown()
+
+class BlockingConnector(RecordingConnector):
+    """Holds every step until `release` is set."""
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def execute(self, action, parameters):
+        self.calls.append((action, parameters))
+        await self.release.wait()
+        return {"action": action}
+
+@pytest.mark.asyncio
+async def test_higher_priority_flows_start_first(registry):
+    connector = BlockingConnector()
+    engine = FlowEngine(connector, registry, max_workers=1)
+    runner = LocalFlowRunnerAdapter(engine)
+
+    flow_ids = [await runner.start_flow("hr", "lookup", {}, "bulk-sync")]
+    await asyncio.sleep(0.01)  # picked up by the only worker
+    flow_ids += [await runner.start_flow("hr", "lookup", {}, "bulk-sync") for _ in range(2)]
+    flow_ids.append(await runner.start_flow("hr", "offboarding", {}, "hr-admin"))
+    connector.release.set()
+    await _wait_done(runner, flow_ids)
+
+    # The first lookup already held the worker; the offboarding jumped the queue
+    assert [action for action, _ in connector.calls] == ["get_employee", "get_balance", "get_employee", "get_employee"]
+    await engine.shutdown()
+
+@pytest.mark.asyncio
+async def test_admission_control_limits_queue_depth_and_principal_load(registry):
+    connector = BlockingConnector()
+    engine = FlowEngine(connector, registry, max_workers=1, max_queue_depth=2, principal_quota=2)
+    runner = LocalFlowRunnerAdapter(engine)
+
+    await runner.start_flow("hr", "lookup", {}, "agent-a")
+    await asyncio.sleep(0.01)  # picked up by the only worker
+    await runner.start_flow("hr", "lookup", {}, "agent-a")
+    with pytest.raises(FlowAdmissionError) as quota:
+        await runner.start_flow("hr", "lookup", {}, "agent-a")
+    assert quota.value.reason == "principal_quota"
+
+    await runner.start_flow("hr", "lookup", {}, "agent-b")
+    with pytest.raises(FlowAdmissionError) as full:
+        await runner.start_flow("hr", "lookup", {}, "agent-c")
+    assert full.value.reason == "queue_full"
+    assert full.value.retry_after >= 1
+
+    # Finished flows free their principal's quota
+    connector.release.set()
+    await _wait_done(runner, list(runner._executions))
+    await runner.start_flow("hr", "lookup", {}, "agent-a")
+    await engine.shutdown()
+
+def test_registry_rejects_flow_steps_that_are_not_actions(tmp_path):
+    data = {
+        "version": "1.0",
+        "metadata": {"last_updated": "2026-01-31", "owner": "test", "description": "test"},
+        "capabilities": [
+            {"id": "hr.broken", "name": "Broken", "domain": "hr", "type": "flow", "sensitivity": "low",
+             "steps": ["workday.hcm.missing"]},
+        ],
+    }
+    path = tmp_path / "index.yaml"
+    path.write_text(yaml.dump(data))
+
+    with pytest.raises(ValueError, match="not a registered action"):
+        CapabilityRegistryService(str(path))
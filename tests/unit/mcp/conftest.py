@@ -2,6 +2,7 @@ import pytest
 import jwt
 from unittest.mock import patch
 from src.adapters.auth import MockOktaProvider, MockTokenVerifier
+import src.mcp.adapters.auth as mcp_auth
 
 @pytest.fixture(autouse=True)
 def mock_mcp_auth_verifier():
@@ -13,6 +14,8 @@ def mock_mcp_auth_verifier():
     """
     provider = MockOktaProvider()
     verifier = MockTokenVerifier(provider)
+    # Principals verified by a previous test's provider must not leak into this one
+    mcp_auth._principal_cache.clear()
     
     with patch("src.mcp.adapters.auth.get_verifier", return_value=verifier):
         yield provider
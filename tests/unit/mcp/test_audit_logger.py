@@ -0,0 +1,23 @@
+import json
+from datetime import datetime, timezone
+from src.mcp.lib.logging import JSONLAuditLogger
+
+def test_mcp_audit_logger_writes_masked_utc_events(tmp_path):
+    path = tmp_path / "mcp-audit.jsonl"
+    audit = JSONLAuditLogger(path=str(path))
+
+    audit.log("get_employee", {"employee_id": "EMP001", "personal_email": "jane@test.com"}, "user@local.test")
+    assert audit.flush(timeout=5)
+
+    with open(path, "r", encoding="utf-8") as f:
+        entry = json.loads(f.readline())
+
+    assert entry["payload"] == {"employee_id": "EMP001", "personal_email": "***"}
+    assert entry["principal_id"] == "user@local.test"
+    timestamp = datetime.fromisoformat(entry["timestamp"])
+    assert timestamp.tzinfo is not None
+    assert abs((datetime.now(timezone.utc) - timestamp).total_seconds()) < 60
+
+def test_mcp_audit_loggers_share_a_sink_per_path(tmp_path):
+    path = str(tmp_path / "mcp-audit.jsonl")
+    assert JSONLAuditLogger(path=path).sink is JSONLAuditLogger(path=path).sink
@@ -0,0 +1,175 @@
+import pytest
+import asyncio
+import json
+import time
+import httpx
+from unittest.mock import patch
+from src.mcp.adapters.backend import CapabilityAPIClient
+
+def _client_with_transport(handler, read_retries=2):
+    client = CapabilityAPIClient(base_url="http://api.test", read_retries=read_retries)
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+@pytest.fixture(autouse=True)
+def no_retry_sleep():
+    with patch("src.mcp.adapters.backend.asyncio.sleep"):
+        yield
+
+@pytest.mark.asyncio
+async def test_call_action_propagates_deadline_header():
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.update(request.headers)
+        return httpx.Response(200, json={"data": {"ok": True}})
+
+    client = _client_with_transport(handler)
+    result = await client.call_action(
+        "workday.hcm", "get_employee", {"employee_id": "EMP001"}, "tok",
+        deadline=time.monotonic() + 2.0,
+    )
+
+    assert result == {"data": {"ok": True}}
+    assert seen["authorization"] == "Bearer tok"
+    assert seen["x-acting-through"] == "mcp-server"
+    assert 0 < int(seen["x-request-timeout-ms"]) <= 2000
+
+@pytest.mark.asyncio
+async def test_idempotent_read_retries_on_gateway_errors():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) < 3:
+            return httpx.Response(503, json={"error_code": "CONNECTOR_UNAVAILABLE"})
+        return httpx.Response(200, json={"data": {"ok": True}})
+
+    client = _client_with_transport(handler)
+    result = await client.call_action("workday.hcm", "get_employee", {}, "tok", idempotent=True)
+
+    assert result["data"]["ok"] is True
+    assert len(calls) == 3
+
+@pytest.mark.asyncio
+async def test_writes_are_never_retried():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503)
+
+    client = _client_with_transport(handler)
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.call_action("workday.time", "request", {}, "tok")
+
+    assert len(calls) == 1
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(404, json={"message": "not found"})
+
+    client = _client_with_transport(handler)
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.call_action("workday.hcm", "get_employee", {}, "tok", idempotent=True)
+
+    assert len(calls) == 1
+
+@pytest.mark.asyncio
+async def test_expired_deadline_fails_fast():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise AssertionError("backend must not be called")
+
+    client = _client_with_transport(handler)
+    with pytest.raises(httpx.TimeoutException):
+        await client.call_action("workday.hcm", "get_employee", {}, "tok", deadline=time.monotonic() - 1)
+
+def test_http2_falls_back_without_h2():
+    with patch("src.mcp.adapters.backend._http2_available", return_value=False):
+        client = CapabilityAPIClient(base_url="http://api.test", http2=True)
+    assert client.http2 is False
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_share_one_batch_request():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        assert request.url.path == "/actions/batch"
+        items = json.loads(request.content)["requests"]
+        results = []
+        for item in items:
+            emp_id = item["parameters"]["employee_id"]
+            if emp_id == "EMP404":
+                results.append({"status_code": 404, "body": {"error_code": "EMPLOYEE_NOT_FOUND", "message": "missing"}})
+            else:
+                results.append({"status_code": 200, "body": {"data": {"employee_id": emp_id}}})
+        return httpx.Response(200, json={"results": results})
+
+    client = _client_with_transport(handler)
+    results = await asyncio.gather(
+        client.call_action("workday.hcm", "get_employee", {"employee_id": "EMP001"}, "tok", idempotent=True),
+        client.call_action("workday.hcm", "get_employee", {"employee_id": "EMP002"}, "tok", idempotent=True),
+        client.call_action("workday.hcm", "get_employee", {"employee_id": "EMP404"}, "tok", idempotent=True),
+        return_exceptions=True,
+    )
+
+    assert len(calls) == 1
+    assert results[0]["data"]["employee_id"] == "EMP001"
+    assert results[1]["data"]["employee_id"] == "EMP002"
+    assert isinstance(results[2], httpx.HTTPStatusError)
+    assert results[2].response.status_code == 404
+    assert results[2].response.json()["error_code"] == "EMPLOYEE_NOT_FOUND"
+
+@pytest.mark.asyncio
+async def test_batches_are_not_shared_across_tokens():
+    paths = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append((request.headers["authorization"], request.url.path))
+        return httpx.Response(200, json={"data": {}})
+
+    client = _client_with_transport(handler)
+    await asyncio.gather(
+        client.call_action("workday.hcm", "get_employee", {}, "tok-a", idempotent=True),
+        client.call_action("workday.hcm", "get_employee", {}, "tok-b", idempotent=True),
+    )
+
+    assert sorted(paths) == [
+        ("Bearer tok-a", "/actions/workday.hcm/get_employee"),
+        ("Bearer tok-b", "/actions/workday.hcm/get_employee"),
+    ]
+
+@pytest.mark.asyncio
+async def test_writes_bypass_batching():
+    paths = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        return httpx.Response(200, json={"data": {}})
+
+    client = _client_with_transport(handler)
+    await asyncio.gather(
+        client.call_action("workday.time", "request", {}, "tok"),
+        client.call_action("workday.time", "cancel", {}, "tok"),
+    )
+
+    assert sorted(paths) == ["/actions/workday.time/cancel", "/actions/workday.time/request"]
+
+@pytest.mark.asyncio
+async def test_batch_transport_failure_reaches_every_caller():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("refused", request=request)
+
+    client = _client_with_transport(handler, read_retries=0)
+    results = await asyncio.gather(
+        client.call_action("workday.hcm", "get_employee", {"employee_id": "EMP001"}, "tok", idempotent=True),
+        client.call_action("workday.hcm", "get_employee", {"employee_id": "EMP002"}, "tok", idempotent=True),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, httpx.ConnectError) for r in results)
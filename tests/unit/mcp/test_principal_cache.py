@@ -0,0 +1,69 @@
+import pytest
+from unittest.mock import patch
+import src.mcp.adapters.auth as auth_adapter
+from src.mcp.adapters.auth import (
+    PrincipalContext,
+    TOOL_PERMISSIONS,
+    extract_principal,
+    is_tool_allowed,
+)
+
+def test_extract_principal_verifies_once_per_token(mock_mcp_auth_verifier, issue_token):
+    """Repeated tool calls with the same token reuse the verified principal."""
+    token = issue_token(subject="EMP001", groups=["employees"])
+    verifier = auth_adapter.get_verifier()
+
+    with patch.object(verifier, "verify", wraps=verifier.verify) as spy:
+        first = extract_principal(token)
+        second = extract_principal(token)
+
+    assert first is second
+    assert first.subject == "EMP001"
+    assert spy.call_count == 1
+
+def test_extract_principal_does_not_cache_failures(issue_token):
+    """Invalid tokens are re-verified (and rejected) every time."""
+    verifier = auth_adapter.get_verifier()
+
+    with patch.object(verifier, "verify", wraps=verifier.verify) as spy:
+        assert extract_principal("not-a-jwt") is None
+        assert extract_principal("not-a-jwt") is None
+
+    assert spy.call_count == 2
+
+def test_principal_cache_is_keyed_by_token_hash(issue_token):
+    """Raw tokens are never used as cache keys."""
+    token = issue_token(subject="EMP001", groups=["employees"])
+    extract_principal(token)
+
+    assert token not in auth_adapter._principal_cache
+    assert auth_adapter._principal_cache_key(token) in auth_adapter._principal_cache
+
+def test_cached_principal_is_immutable(issue_token):
+    principal = extract_principal(issue_token(subject="EMP001", groups=["employees"]))
+
+    with pytest.raises(Exception):
+        principal.subject = "ADM001"
+
+def test_tool_permissions_table_is_frozen():
+    assert isinstance(TOOL_PERMISSIONS["ADMIN"], frozenset)
+    with pytest.raises(TypeError):
+        TOOL_PERMISSIONS["ROOT"] = frozenset({"get_compensation"})
+
+@pytest.mark.parametrize(
+    "principal_type,groups,tool,expected",
+    [
+        ("AI_AGENT", [], "get_employee", True),
+        ("AI_AGENT", [], "request_time_off", False),
+        ("HUMAN", ["employees"], "request_time_off", True),
+        ("HUMAN", ["employees"], "get_compensation", False),
+        ("HUMAN", ["hr-platform-admins"], "get_compensation", True),
+        ("HUMAN", [], "get_employee", False),
+        ("MACHINE", [], "get_employee", False),
+    ],
+)
+def test_is_tool_allowed_matrix(principal_type, groups, tool, expected):
+    principal = PrincipalContext(
+        subject="p1", principal_type=principal_type, groups=groups, raw_token="t"
+    )
+    assert is_tool_allowed(principal, tool) is expected
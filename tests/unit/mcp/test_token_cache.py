@@ -1,6 +1,7 @@
 import pytest
 import time
 import asyncio
+import jwt
 from unittest.mock import MagicMock, AsyncMock, patch
 from cachetools import TTLCache
 import src.mcp.adapters.auth as auth_adapter
@@ -9,6 +10,17 @@ from src.mcp.adapters.auth import get_mcp_token
 @pytest.fixture(autouse=True)
 def clear_cache():
     auth_adapter._mcp_token_cache.clear()
+    auth_adapter._inflight_exchanges.clear()
+    auth_adapter.reset_token_exchange_metrics()
+
+def _mock_exchange_client(access_token="mcp_token", extra=None):
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"access_token": access_token, **(extra or {})}
+    mock_response.raise_for_status.return_value = None
+
+    mock_client = AsyncMock()
+    mock_client.post.return_value = mock_response
+    return mock_client
 
 @pytest.mark.asyncio
 async def test_mcp_token_cache_bounded():
@@ -18,19 +30,11 @@ async def test_mcp_token_cache_bounded():
     # Monkeypatch the cache with a small maxsize for testing
     test_cache = TTLCache(maxsize=10, ttl=300)
     with patch("src.mcp.adapters.auth._mcp_token_cache", test_cache):
-        with patch("httpx.AsyncClient") as mock_httpx:
-            mock_response = MagicMock()
-            mock_response.json.return_value = {"access_token": "mcp_token"}
-            mock_response.raise_for_status.return_value = None
-            
-            mock_client_instance = AsyncMock()
-            mock_client_instance.post.return_value = mock_response
-            mock_httpx.return_value.__aenter__.return_value = mock_client_instance
-
+        with patch("src.mcp.adapters.auth.get_exchange_client", return_value=_mock_exchange_client()):
             # Add 20 unique tokens
             for i in range(20):
                 await get_mcp_token(f"user_token_{i}")
-            
+
             # Cache size should be 10, not 20
             assert len(test_cache) == 10
             # Latest tokens should be there
@@ -46,21 +50,140 @@ async def test_mcp_token_cache_expiration():
     # Monkeypatch the cache with a very short TTL
     test_cache = TTLCache(maxsize=10, ttl=0.1)
     with patch("src.mcp.adapters.auth._mcp_token_cache", test_cache):
-        with patch("httpx.AsyncClient") as mock_httpx:
-            mock_response = MagicMock()
-            mock_response.json.return_value = {"access_token": "mcp_token"}
-            mock_response.raise_for_status.return_value = None
-            
-            mock_client_instance = AsyncMock()
-            mock_client_instance.post.return_value = mock_response
-            mock_httpx.return_value.__aenter__.return_value = mock_client_instance
-
+        with patch("src.mcp.adapters.auth.get_exchange_client", return_value=_mock_exchange_client()):
             await get_mcp_token("user_token_1")
             assert "user_token_1" in test_cache
-            
+
             # Wait for expiration
             await asyncio.sleep(0.2)
-            
+
             # TTLCache doesn't necessarily remove expired items until access or periodic cleanup
             # but it shouldn't return them.
-            assert "user_token_1" not in test_cache
\ No newline at end of file
+            assert "user_token_1" not in test_cache
+
+@pytest.mark.asyncio
+async def test_mcp_token_cache_follows_token_exp():
+    """
+    Verify that the cache entry lifetime follows the exchanged token's `exp` claim.
+    """
+    exp = int(time.time()) + 120
+    mcp_token = jwt.encode({"sub": "EMP001", "exp": exp}, "secret", algorithm="HS256")
+    client = _mock_exchange_client(access_token=mcp_token, extra={"expires_in": 3600})
+
+    with patch("src.mcp.adapters.auth.get_exchange_client", return_value=client):
+        assert await get_mcp_token("user_token_exp") == mcp_token
+
+    entry = auth_adapter._mcp_token_cache["user_token_exp"]
+    assert entry.expires_at == exp - auth_adapter.settings.TOKEN_EXPIRY_SKEW_SECONDS
+
+@pytest.mark.asyncio
+async def test_mcp_token_not_cached_when_already_expiring():
+    """
+    Verify that tokens expiring inside the skew window are returned but never cached.
+    """
+    mcp_token = jwt.encode({"sub": "EMP001", "exp": int(time.time()) + 1}, "secret", algorithm="HS256")
+    client = _mock_exchange_client(access_token=mcp_token)
+
+    with patch("src.mcp.adapters.auth.get_exchange_client", return_value=client):
+        assert await get_mcp_token("user_token_short") == mcp_token
+
+    assert "user_token_short" not in auth_adapter._mcp_token_cache
+
+@pytest.mark.asyncio
+async def test_concurrent_exchanges_are_coalesced():
+    """
+    Verify that a burst of calls for the same user token performs a single exchange.
+    """
+    client = _mock_exchange_client()
+    release = asyncio.Event()
+    response = client.post.return_value
+
+    async def slow_post(*args, **kwargs):
+        await release.wait()
+        return response
+
+    client.post.side_effect = slow_post
+
+    with patch("src.mcp.adapters.auth.get_exchange_client", return_value=client):
+        calls = [asyncio.create_task(get_mcp_token("burst_token")) for _ in range(10)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*calls)
+
+    assert results == ["mcp_token"] * 10
+    assert client.post.await_count == 1
+    assert auth_adapter._inflight_exchanges == {}
+
+@pytest.mark.asyncio
+async def test_failed_exchange_propagates_to_all_waiters():
+    """
+    Verify that a failed exchange is reported to every coalesced caller and not cached.
+    """
+    client = _mock_exchange_client()
+    client.post.side_effect = RuntimeError("exchange failed")
+
+    with patch("src.mcp.adapters.auth.get_exchange_client", return_value=client):
+        results = await asyncio.gather(
+            get_mcp_token("bad_token"), get_mcp_token("bad_token"), return_exceptions=True
+        )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert client.post.await_count == 1
+    assert "bad_token" not in auth_adapter._mcp_token_cache
+
+@pytest.mark.asyncio
+async def test_refresh_ahead_serves_cached_token_and_refreshes():
+    """
+    Verify that a token inside the refresh-ahead window is returned immediately
+    and replaced by a background exchange.
+    """
+    auth_adapter._mcp_token_cache["near_expiry"] = auth_adapter.CachedMCPToken(
+        token="old_mcp_token", expires_at=time.time() + 5
+    )
+    client = _mock_exchange_client(access_token="new_mcp_token")
+
+    with patch("src.mcp.adapters.auth.get_exchange_client", return_value=client):
+        assert await get_mcp_token("near_expiry") == "old_mcp_token"
+        # A second hit while the refresh is in flight does not start another one
+        assert await get_mcp_token("near_expiry") == "old_mcp_token"
+        await asyncio.gather(*auth_adapter._inflight_exchanges.values())
+        assert await get_mcp_token("near_expiry") == "new_mcp_token"
+
+    assert client.post.await_count == 1
+    metrics = auth_adapter.get_token_exchange_metrics()
+    assert metrics["refresh_ahead_hits"] == 2
+    assert metrics["background_refreshes"] == 1
+    assert metrics["cache_hits"] == 1
+    assert metrics["blocking_exchanges"] == 0
+
+@pytest.mark.asyncio
+async def test_refresh_ahead_failure_keeps_current_token():
+    """
+    Verify that a failed background refresh is counted and the cached token is still served.
+    """
+    auth_adapter._mcp_token_cache["near_expiry"] = auth_adapter.CachedMCPToken(
+        token="old_mcp_token", expires_at=time.time() + 5
+    )
+    client = _mock_exchange_client()
+    client.post.side_effect = RuntimeError("idp down")
+
+    with patch("src.mcp.adapters.auth.get_exchange_client", return_value=client):
+        assert await get_mcp_token("near_expiry") == "old_mcp_token"
+        await asyncio.gather(*auth_adapter._inflight_exchanges.values(), return_exceptions=True)
+        await asyncio.sleep(0)
+        assert await get_mcp_token("near_expiry") == "old_mcp_token"
+
+    assert auth_adapter.get_token_exchange_metrics()["background_refresh_failures"] == 1
+
+@pytest.mark.asyncio
+async def test_blocking_exchange_metrics():
+    """
+    Verify that cold misses are counted as blocking exchanges and later calls as hits.
+    """
+    with patch("src.mcp.adapters.auth.get_exchange_client", return_value=_mock_exchange_client()):
+        await get_mcp_token("cold_token")
+        await get_mcp_token("cold_token")
+
+    metrics = auth_adapter.get_token_exchange_metrics()
+    assert metrics["blocking_exchanges"] == 1
+    assert metrics["cache_hits"] == 1
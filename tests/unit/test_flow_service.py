@@ -10,7 +10,7 @@ class MockFlowAdapter(FlowRunnerPort):
     def __init__(self):
         self.flows = {}
 
-    async def start_flow(self, domain: str, flow: str, params: dict, principal_id: str) -> str:
+    async def start_flow(self, domain: str, flow: str, params: dict, principal_id: str, context: dict = None, callback_url: str = None) -> str:
         flow_id = "test-flow-123"
         self.flows[flow_id] = {
             "flow_id": flow_id,
@@ -57,6 +57,20 @@ async def test_start_flow_success(flow_service, mock_policy_engine):
     args, kwargs = mock_policy_engine.evaluate.call_args
     assert kwargs["capability"] == "hr.onboarding"
 
+@pytest.mark.asyncio
+async def test_start_flow_rejects_callback_host_outside_allowlist(mock_policy_engine):
+    mock_policy_engine.evaluate.return_value = PolicyEvaluationResult(allowed=True)
+    service = FlowService(mock_policy_engine, MockFlowAdapter(), callback_allowed_hosts=["hooks.example.com"])
+    start = dict(
+        domain="hr", flow="onboarding", params={}, principal_id="user1",
+        principal_groups=[], principal_type="HUMAN", environment="local",
+    )
+
+    assert await service.start_flow(**start, callback_url="https://hooks.example.com/flows") == "test-flow-123"
+    with pytest.raises(HTTPException) as excinfo:
+        await service.start_flow(**start, callback_url="http://169.254.169.254/latest")
+    assert excinfo.value.status_code == 400
+
 @pytest.mark.asyncio
 async def test_start_flow_denied(flow_service, mock_policy_engine):
     # Setup policy to deny
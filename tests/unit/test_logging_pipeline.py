@@ -0,0 +1,67 @@
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+from src.lib.context import set_request_id
+from src.lib.logging import BoundedQueueHandler, SamplingFilter, StructuredFormatter
+
+def _record(msg="hello %s", args=("world",), level=logging.INFO, **extra):
+    record = logging.LogRecord("test", level, "test.py", 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+class _CaptureHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self.threads = set()
+        self.setFormatter(StructuredFormatter())
+
+    def emit(self, record):
+        self.threads.add(threading.current_thread().name)
+        self.lines.append(json.loads(self.format(record)))
+
+def test_formatting_runs_on_listener_thread_with_emit_context():
+    log_queue = queue.Queue(maxsize=100)
+    handler = BoundedQueueHandler(log_queue)
+    capture = _CaptureHandler()
+    listener = logging.handlers.QueueListener(log_queue, capture)
+    listener.start()
+
+    set_request_id("req-123")
+    handler.handle(_record("mail %s", ("jane@test.com",)))
+    set_request_id(None)
+    listener.stop()
+
+    assert threading.current_thread().name not in capture.threads
+    assert capture.lines[0]["message"] == "mail [EMAIL]"
+    assert capture.lines[0]["request_id"] == "req-123"
+
+def test_drop_policy_never_blocks_when_full():
+    handler = BoundedQueueHandler(queue.Queue(maxsize=2), overflow="drop")
+    for _ in range(5):
+        handler.handle(_record())
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+def test_sample_policy_thins_info_past_high_water_but_keeps_warnings():
+    handler = BoundedQueueHandler(queue.Queue(maxsize=100), overflow="sample", high_water=0.1, sample_rate=0.5)
+    for _ in range(30):
+        handler.handle(_record())
+    for _ in range(5):
+        handler.handle(_record(level=logging.ERROR))
+
+    records = list(handler.queue.queue)
+    assert len([r for r in records if r.levelno == logging.INFO]) == 10 + 10
+    assert len([r for r in records if r.levelno == logging.ERROR]) == 5
+
+def test_sampling_filter_keeps_failures_and_samples_successes():
+    sampler = SamplingFilter(0.25, keep_if=lambda r: r.extra_data["status_code"] >= 400)
+
+    kept_ok = sum(sampler.filter(_record(extra_data={"status_code": 200})) for _ in range(100))
+    kept_errors = sum(sampler.filter(_record(extra_data={"status_code": 500})) for _ in range(10))
+
+    assert kept_ok == 25
+    assert kept_errors == 10
@@ -0,0 +1,61 @@
+import json
+import pytest
+from src.lib.redaction import RedactionEngine
+
+@pytest.fixture
+def engine():
+    return RedactionEngine(
+        replacements={"email": "[EMAIL]", "ssn": "[SSN]", "phone": "[PHONE]", "salary": "[SALARY]"},
+        sensitive_keys=["password", "base_salary"],
+        sensitive_key_substrings=["secret"],
+    )
+
+def test_redact_text_masks_each_pattern_in_one_pass(engine):
+    text = "Mail john.doe@example.com, call +1-555-012-3456 or (555) 123-4567, SSN 123-45-6789"
+    redacted = engine.redact_text(text)
+
+    assert redacted == "Mail [EMAIL], call [PHONE] or [PHONE], SSN [SSN]"
+
+def test_redact_text_skips_strings_without_candidates(engine):
+    text = "nothing sensitive here"
+    assert engine.redact_text(text) is text
+
+def test_identifiers_are_not_masked(engine):
+    assert engine.redact_text("EMP001") == "EMP001"
+    assert engine.redact_text("req-2f6c1e7a-5d1b-4b1c-9a5e-0123456789ab") == "req-2f6c1e7a-5d1b-4b1c-9a5e-0123456789ab"
+
+def test_redact_masks_sensitive_keys_and_recurses(engine):
+    data = {
+        "Password": "hunter2",
+        "client_secret_ref": {"nested": "value"},
+        "employee": {"email": "jane@test.com", "base_salary": 120000},
+        "notes": ["call 555-123-4567", 42],
+    }
+    redacted = engine.redact(data)
+
+    assert redacted == {
+        "Password": "[REDACTED]",
+        "client_secret_ref": "[REDACTED]",
+        "employee": {"email": "[EMAIL]", "base_salary": "[REDACTED]"},
+        "notes": ["call [PHONE]", 42],
+    }
+    # Input is not mutated
+    assert data["Password"] == "hunter2"
+
+def test_redact_json_matches_structured_redaction(engine):
+    payload = {
+        "password": "hunter2",
+        "contact": "line one\nreach me at jane@test.com",
+        "compensation": json.dumps({"amount": 120000, "currency": "USD"}),
+        "id": 123,
+    }
+    redacted = json.loads(engine.redact_json(json.dumps(payload)))
+
+    assert redacted["password"] == "[REDACTED]"
+    assert redacted["contact"] == "line one\nreach me at [EMAIL]"
+    assert "120000" not in redacted["compensation"]
+    assert redacted["id"] == 123
+
+def test_unknown_pattern_name_is_rejected():
+    with pytest.raises(ValueError, match="Unknown PII pattern"):
+        RedactionEngine(replacements={"passport": "[X]"})